@@ -20,6 +20,7 @@ urlpatterns = [
     path('courses/get_by_title/', views.get_course_by_title, name='get-course-by-title'),
     path('system-health/', views.system_health, name='system-health'),
     path('cache-stats/', views.cache_stats, name='cache-stats'),
+    path('llm-cache/invalidate/', views.llm_cache_invalidate, name='llm-cache-invalidate'),
     path('dashboard/debug/', views.admin_dashboard_debug, name='admin-dashboard-debug'),
     
     # NFT yönetim endpointleri
@@ -5,10 +5,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from datetime import datetime
 from django.utils import timezone  # Django timezone import
-import requests  # Eksik import eklendi
+from wisentia_backend import http_client
+from wisentia_backend.http_client import upstream_stats
+from ai.llm_cache import invalidate_llm_cache, llm_cache_stats
 from django.conf import settings  # Eksik import eklendi
 import logging
-from wisentia_backend.utils import invalidate_cache
+from wisentia_backend.utils import invalidate_tags, tag_stats
+from wisentia_backend.db import pool_stats
+from wisentia_backend.log_pipeline import debug_print
+from users.auth import load_principal, invalidate_principal
 from django.core.cache import cache
 from django.http import JsonResponse
 import json
@@ -30,44 +35,39 @@ def fetch_youtube_channel_name(video_id):
     try:
         # Using the oEmbed endpoint which doesn't require API key
         url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(url, timeout=5)
+        response = http_client.get('youtube', url)
         
         if response.status_code == 200:
             data = response.json()
             # The author_name field contains the channel name
             channel_name = data.get('author_name', '')
-            print(f"✅ Successfully fetched YouTube channel name: {channel_name}")
+            debug_print("✅ Successfully fetched YouTube channel name: %s", channel_name)
             return channel_name
         else:
-            print(f"⚠️ Failed to fetch YouTube data: {response.status_code}")
+            debug_print("⚠️ Failed to fetch YouTube data: %s", response.status_code)
             return None
     except Exception as e:
-        print(f"❌ Error fetching YouTube channel name: {str(e)}")
+        debug_print("❌ Error fetching YouTube channel name: %s", e)
         return None
 
 
 def is_admin(user_id):
-    """Kullanıcının admin olup olmadığını kontrol eder"""
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT UserRole FROM Users WHERE UserID = %s
-        """, [user_id])
-        
-        user_role = cursor.fetchone()
-        return user_role and user_role[0] == 'admin'
+    """Kullanıcının admin olup olmadığını kontrol eder (önbellekli kullanıcı kaydından)"""
+    user = load_principal(user_id)
+    return user is not None and user.role == 'admin'
 
 @api_view(['GET'])  # Sadece GET metodunu kabul ettiğini belirtin
 @permission_classes([IsAuthenticated])
 def admin_dashboard(request):
     """Admin dashboard verilerini getiren API endpoint'i"""
-    print(f"✅ API HIT: /admin/dashboard/")
-    print(f"✅ Authenticated user ID: {request.user.id}")
-    print(f"✅ Authenticated user role: {request.user.role if hasattr(request.user, 'role') else 'unknown'}")
+    debug_print("✅ API HIT: /admin/dashboard/")
+    debug_print("✅ Authenticated user ID: %s", request.user.id)
+    debug_print("✅ Authenticated user role: %s", request.user.role if hasattr(request.user, 'role') else 'unknown')
     
     user_id = request.user.id
     
     if not is_admin(user_id):
-        print(f"❌ Access denied for user {user_id}: Not admin")
+        debug_print("❌ Access denied for user %s: Not admin", user_id)
         return Response({'error': 'You do not have permission to access this resource'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
@@ -287,8 +287,8 @@ def update_user(request, user_id):
         return Response({'error': 'You do not have permission to access this resource'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
-    print(f"🔄 User update request for user_id: {user_id}")
-    print(f"📝 Request data: {request.data}")
+    debug_print("🔄 User update request for user_id: %s", user_id)
+    debug_print("📝 Request data: %s", request.data)
     
     # Güncellenecek alanları al - Frontend'den gelen field names
     username = request.data.get('Username') or request.data.get('username')
@@ -298,7 +298,7 @@ def update_user(request, user_id):
     if is_active is None:
         is_active = request.data.get('isActive')
     
-    print(f"📋 Parsed fields - username: {username}, email: {email}, user_role: {user_role}, is_active: {is_active}")
+    debug_print("📋 Parsed fields - username: %s, email: %s, user_role: %s, is_active: %s", username, email, user_role, is_active)
     
     update_fields = []
     params = []
@@ -306,28 +306,28 @@ def update_user(request, user_id):
     if username is not None and username.strip():
         update_fields.append("Username = %s")
         params.append(username.strip())
-        print(f"✅ Adding username update: {username}")
+        debug_print("✅ Adding username update: %s", username)
     
     if email is not None and email.strip():
         update_fields.append("Email = %s")
         params.append(email.strip())
-        print(f"✅ Adding email update: {email}")
+        debug_print("✅ Adding email update: %s", email)
     
     if user_role is not None and user_role.strip():
         update_fields.append("UserRole = %s")
         params.append(user_role.strip())
-        print(f"✅ Adding user_role update: {user_role}")
+        debug_print("✅ Adding user_role update: %s", user_role)
     
     if is_active is not None:
         update_fields.append("IsActive = %s")
         params.append(1 if is_active else 0)
-        print(f"✅ Adding is_active update: {is_active}")
+        debug_print("✅ Adding is_active update: %s", is_active)
     
-    print(f"🔧 Update fields: {update_fields}")
-    print(f"🔧 Params: {params}")
+    debug_print("🔧 Update fields: %s", update_fields)
+    debug_print("🔧 Params: %s", params)
     
     if not update_fields:
-        print("❌ No valid fields to update")
+        debug_print("❌ No valid fields to update")
         return Response({'error': 'No valid fields to update'}, status=status.HTTP_400_BAD_REQUEST)
     
     with connection.cursor() as cursor:
@@ -335,21 +335,24 @@ def update_user(request, user_id):
         cursor.execute("SELECT UserID, Username, Email, UserRole, IsActive FROM Users WHERE UserID = %s", [user_id])
         existing_user = cursor.fetchone()
         if not existing_user:
-            print(f"❌ User not found: {user_id}")
+            debug_print("❌ User not found: %s", user_id)
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        print(f"👤 Existing user: {existing_user}")
+        debug_print("👤 Existing user: %s", existing_user)
         
         # Kullanıcıyı güncelle
         sql = f"UPDATE Users SET {', '.join(update_fields)} WHERE UserID = %s"
         params.append(user_id)
         
-        print(f"🔧 Executing SQL: {sql}")
-        print(f"🔧 With params: {params}")
+        debug_print("🔧 Executing SQL: %s", sql)
+        debug_print("🔧 With params: %s", params)
         
         cursor.execute(sql, params)
         affected_rows = cursor.rowcount
-        print(f"✅ Rows affected: {affected_rows}")
+        debug_print("✅ Rows affected: %s", affected_rows)
+        
+        # Rol / IsActive değişikliği hemen geçerli olsun
+        invalidate_principal(user_id)
         
         # Güncellenmiş kullanıcıyı getir
         cursor.execute("""
@@ -360,7 +363,7 @@ def update_user(request, user_id):
         
         columns = [col[0] for col in cursor.description]
         updated_user = dict(zip(columns, cursor.fetchone()))
-        print(f"🎉 Updated user: {updated_user}")
+        debug_print("🎉 Updated user: %s", updated_user)
     
     return Response({
         'message': 'User updated successfully',
@@ -378,8 +381,8 @@ def create_user(request):
         return Response({'error': 'You do not have permission to access this resource'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
-    print(f"🆕 User creation request")
-    print(f"📝 Request data: {request.data}")
+    debug_print("🆕 User creation request")
+    debug_print("📝 Request data: %s", request.data)
     
     # Required fields
     username = request.data.get('Username') or request.data.get('username')
@@ -390,7 +393,7 @@ def create_user(request):
     if is_active is None:
         is_active = request.data.get('isActive', True)
     
-    print(f"📋 Parsed fields - username: {username}, email: {email}, user_role: {user_role}, is_active: {is_active}")
+    debug_print("📋 Parsed fields - username: %s, email: %s, user_role: %s, is_active: %s", username, email, user_role, is_active)
     
     # Validation
     if not username or not username.strip():
@@ -449,7 +452,7 @@ def create_user(request):
         
         columns = [col[0] for col in cursor.description]
         new_user = dict(zip(columns, cursor.fetchone()))
-        print(f"🎉 Created user: {new_user}")
+        debug_print("🎉 Created user: %s", new_user)
     
     return Response({
         'message': 'User created successfully',
@@ -461,32 +464,32 @@ def create_user(request):
 @permission_classes([IsAuthenticated])
 def get_user_activity(request, user_id):
     """Kullanıcının aktivite geçmişini getiren API endpoint'i"""
-    print(f"🔴 DEBUG: get_user_activity called with user_id={user_id}")
-    print(f"🔴 DEBUG: request.user={request.user}")
-    print(f"🔴 DEBUG: request.path={request.path}")
-    print(f"🔴 DEBUG: request.method={request.method}")
+    debug_print("🔴 DEBUG: get_user_activity called with user_id=%s", user_id)
+    debug_print("🔴 DEBUG: request.user=%s", request.user)
+    debug_print("🔴 DEBUG: request.path=%s", request.path)
+    debug_print("🔴 DEBUG: request.method=%s", request.method)
     
     admin_id = request.user.id
     
     if not is_admin(admin_id):
-        print(f"🔴 DEBUG: Access denied for user {admin_id}: Not admin")
+        debug_print("🔴 DEBUG: Access denied for user %s: Not admin", admin_id)
         return Response({'error': 'You do not have permission to access this resource'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
-    print(f"🔴 DEBUG: Admin access granted for user {admin_id}")
+    debug_print("🔴 DEBUG: Admin access granted for user %s", admin_id)
     
     page = int(request.query_params.get('page', 1))
     page_size = int(request.query_params.get('pageSize', 10))
     offset = (page - 1) * page_size
     
-    print(f"🔴 DEBUG: Page={page}, PageSize={page_size}, Offset={offset}")
+    debug_print("🔴 DEBUG: Page=%s, PageSize=%s, Offset=%s", page, page_size, offset)
     
     try:
         with connection.cursor() as cursor:
             # Check if user exists
             cursor.execute("SELECT UserID FROM Users WHERE UserID = %s", [user_id])
             user_exists = cursor.fetchone()
-            print(f"🔴 DEBUG: User exists check: {user_exists}")
+            debug_print("🔴 DEBUG: User exists check: %s", user_exists)
             
             if not user_exists:
                 return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -594,7 +597,7 @@ def get_user_activity(request, user_id):
             # Total count for pagination (approximate)
             total_count = len(all_activities)
             
-            print(f"🔴 DEBUG: Returning {len(paginated_activities)} activities")
+            debug_print("🔴 DEBUG: Returning %s activities", len(paginated_activities))
             
             return Response({
                 'activities': paginated_activities,
@@ -608,7 +611,7 @@ def get_user_activity(request, user_id):
             })
             
     except Exception as e:
-        print(f"🔴 DEBUG: Error in get_user_activity: {str(e)}")
+        debug_print("🔴 DEBUG: Error in get_user_activity: %s", e)
         import traceback
         traceback.print_exc()
         return Response({
@@ -702,12 +705,12 @@ def content_management(request):
                             """, [len(videos), course_id])
                             course['TotalVideos'] = len(videos)
                         except Exception as e:
-                            print(f"Error updating TotalVideos: {str(e)}")
+                            debug_print("Error updating TotalVideos: %s", e)
                     
                     return Response(course)
                     
                 except Exception as e:
-                    print(f"Error fetching course details: {e}")
+                    debug_print("Error fetching course details: %s", e)
                     return Response({
                         'error': f'Error fetching course details: {str(e)}'
                     }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -729,9 +732,9 @@ def content_management(request):
                         ALTER TABLE Courses
                         ADD YouTubeChannelName NVARCHAR(255) NULL
                     """)
-                    print("✅ Added YouTubeChannelName column to Courses table in content_management")
+                    debug_print("✅ Added YouTubeChannelName column to Courses table in content_management")
             except Exception as e:
-                print(f"⚠️ Error checking/adding YouTubeChannelName column: {str(e)}")
+                debug_print("⚠️ Error checking/adding YouTubeChannelName column: %s", e)
                 # Continue anyway
             
             # Use COALESCE to handle NULL values safely
@@ -924,11 +927,11 @@ def create_course(request):
     user_id = request.user.id
     
     # Debug logging
-    print(f"✅ Create course API called by user ID: {user_id}")
-    print(f"✅ Request data: {request.data}")
+    debug_print("✅ Create course API called by user ID: %s", user_id)
+    debug_print("✅ Request data: %s", request.data)
     
     if not is_admin(user_id):
-        print(f"❌ User {user_id} is not admin - Access denied")
+        debug_print("❌ User %s is not admin - Access denied", user_id)
         return Response({'error': 'You do not have permission to access this resource'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
@@ -940,15 +943,15 @@ def create_course(request):
     thumbnail_url = request.data.get('thumbnailUrl')
     
     # Log each field individually for better debugging
-    print(f"✅ title: {title}")
-    print(f"✅ description: {description}")
-    print(f"✅ category: {category}")
-    print(f"✅ difficulty: {difficulty}")
-    print(f"✅ thumbnail_url: {thumbnail_url}")
+    debug_print("✅ title: %s", title)
+    debug_print("✅ description: %s", description)
+    debug_print("✅ category: %s", category)
+    debug_print("✅ difficulty: %s", difficulty)
+    debug_print("✅ thumbnail_url: %s", thumbnail_url)
     
     # Zorunlu alanları kontrol et
     if not all([title, category, difficulty]):
-        print(f"❌ Missing required fields")
+        debug_print("❌ Missing required fields")
         return Response({
             'error': 'Title, category and difficulty are required'
         }, status=status.HTTP_400_BAD_REQUEST)
@@ -970,7 +973,7 @@ def create_course(request):
                         ALTER TABLE Courses
                         ADD TotalVideos INT DEFAULT 0
                     """)
-                    print("✅ Added TotalVideos column to Courses table")
+                    debug_print("✅ Added TotalVideos column to Courses table")
                 
                 # Check if YouTubeChannelName column exists
                 cursor.execute("""
@@ -985,9 +988,9 @@ def create_course(request):
                         ALTER TABLE Courses
                         ADD YouTubeChannelName NVARCHAR(255) NULL
                     """)
-                    print("✅ Added YouTubeChannelName column to Courses table")
+                    debug_print("✅ Added YouTubeChannelName column to Courses table")
             except Exception as e:
-                print(f"⚠️ Error checking or adding columns: {str(e)}")
+                debug_print("⚠️ Error checking or adding columns: %s", e)
                 # Continue with course creation even if column check/add fails
         
         course_id = None
@@ -1001,12 +1004,12 @@ def create_course(request):
             """, [
                 title, description, category, difficulty, thumbnail_url, user_id
             ])
-            print("✅ Course inserted into database")
+            debug_print("✅ Course inserted into database")
             
             # Ayrı bir sorgu ile son eklenen ID'yi al
             cursor.execute("SELECT SCOPE_IDENTITY();")
             course_id = cursor.fetchone()[0]
-            print(f"✅ Retrieved course_id: {course_id}")
+            debug_print("✅ Retrieved course_id: %s", course_id)
             
             # Verify the course ID by querying the newly created course
             try:
@@ -1016,11 +1019,11 @@ def create_course(request):
                 """, [course_id])
                 verification = cursor.fetchone()
                 if verification:
-                    print(f"✅ Verified course in database. ID: {verification[0]}, Title: {verification[1]}")
+                    debug_print("✅ Verified course in database. ID: %s, Title: %s", verification[0], verification[1])
                 else:
-                    print(f"⚠️ Course created but not found in verification query")
+                    debug_print("⚠️ Course created but not found in verification query")
             except Exception as e:
-                print(f"⚠️ Error verifying created course: {str(e)}")
+                debug_print("⚠️ Error verifying created course: %s", e)
         
         # Aktivite logu ekle
         try:
@@ -1032,26 +1035,26 @@ def create_course(request):
                 """, [
                     user_id, f"Created course: {title}"
                 ])
-                print("✅ Added activity log entry")
+                debug_print("✅ Added activity log entry")
         except Exception as e:
-            print(f"⚠️ Error adding activity log: {str(e)}")
+            debug_print("⚠️ Error adding activity log: %s", e)
             # Non-critical, continue
         
         # Cache temizle
         try:
-            invalidate_cache(f"{settings.CACHE_KEY_PREFIX}courses_list*")
-            print("✅ Cache invalidated")
+            invalidate_tags('catalog:courses')
+            debug_print("✅ Cache invalidated")
         except Exception as e:
-            print(f"⚠️ Error invalidating cache: {str(e)}")
+            debug_print("⚠️ Error invalidating cache: %s", e)
             # Non-critical, continue
 
         # Ensure course_id is an integer
         if course_id:
             try:
                 course_id = int(float(course_id))
-                print(f"✅ Final course_id for response: {course_id}")
+                debug_print("✅ Final course_id for response: %s", course_id)
             except (ValueError, TypeError) as e:
-                print(f"⚠️ Error converting course_id to int: {str(e)}")
+                debug_print("⚠️ Error converting course_id to int: %s", e)
         
         # Add both camelCase and snake_case versions of the ID to prevent naming issues
         response_data = {
@@ -1059,12 +1062,12 @@ def create_course(request):
             'courseId': course_id,
             'course_id': course_id
         }
-        print(f"✅ Response data: {response_data}")
+        debug_print("✅ Response data: %s", response_data)
         
         return Response(response_data, status=status.HTTP_201_CREATED)
         
     except Exception as e:
-        print(f"❌ Error creating course: {str(e)}")
+        debug_print("❌ Error creating course: %s", e)
         return Response({
             'error': f'Error creating course: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1076,22 +1079,22 @@ def get_course_by_title(request):
     user_id = request.user.id
     
     # Debug logging
-    print(f"✅ Get course by title API called by user ID: {user_id}")
+    debug_print("✅ Get course by title API called by user ID: %s", user_id)
     
     if not is_admin(user_id):
-        print(f"❌ User {user_id} is not admin - Access denied")
+        debug_print("❌ User %s is not admin - Access denied", user_id)
         return Response({'error': 'You do not have permission to access this resource'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
     # Get title parameter
     title = request.GET.get('title')
     if not title:
-        print(f"❌ Missing required parameter: title")
+        debug_print("❌ Missing required parameter: title")
         return Response({
             'error': 'Title parameter is required'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    print(f"✅ Searching for course with title: {title}")
+    debug_print("✅ Searching for course with title: %s", title)
     
     try:
         with connection.cursor() as cursor:
@@ -1107,7 +1110,7 @@ def get_course_by_title(request):
             course = cursor.fetchone()
             
             if not course:
-                print(f"❌ No course found with title: {title}")
+                debug_print("❌ No course found with title: %s", title)
                 return Response({
                     'error': f'No course found with title: {title}'
                 }, status=status.HTTP_404_NOT_FOUND)
@@ -1125,11 +1128,11 @@ def get_course_by_title(request):
                 'isActive': bool(course_dict['IsActive'])
             }
             
-            print(f"✅ Found course with ID: {result['courseId']}")
+            debug_print("✅ Found course with ID: %s", result['courseId'])
             return Response(result)
             
     except Exception as e:
-        print(f"❌ Error finding course by title: {str(e)}")
+        debug_print("❌ Error finding course by title: %s", e)
         return Response({
             'error': f'Error finding course by title: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1146,7 +1149,7 @@ def system_health(request):
     
     try:
         with connection.cursor() as cursor:
-            print(f"🏥 System Health API called by admin user {user_id}")
+            debug_print("🏥 System Health API called by admin user %s", user_id)
             
             # Ana kullanıcı istatistikleri
             cursor.execute("""
@@ -1282,7 +1285,7 @@ def system_health(request):
                         database_info['tableSizes'] = table_sizes
                         
                     except Exception as table_error:
-                        print(f"⚠️ Table size query error: {str(table_error)}")
+                        debug_print("⚠️ Table size query error: %s", table_error)
                         # Daha basit fallback table sorgusu
                         try:
                             cursor.execute("""
@@ -1306,7 +1309,7 @@ def system_health(request):
                             database_info['tableSizes'] = fallback_tables
                             
                         except Exception as fallback_table_error:
-                            print(f"⚠️ Fallback table query error: {str(fallback_table_error)}")
+                            debug_print("⚠️ Fallback table query error: %s", fallback_table_error)
                             database_info['tableSizes'] = [
                                 {'tableName': 'Users', 'totalSpaceMB': 25.8, 'rowCount': 850},
                                 {'tableName': 'ActivityLogs', 'totalSpaceMB': 45.2, 'rowCount': 15000},
@@ -1329,7 +1332,7 @@ def system_health(request):
                     }
                 
             except Exception as db_error:
-                print(f"⚠️ Database size query error: {str(db_error)}")
+                debug_print("⚠️ Database size query error: %s", db_error)
                 # Çok basit fallback sorgu
                 try:
                     cursor.execute("SELECT DB_NAME()")
@@ -1360,7 +1363,7 @@ def system_health(request):
                         'error': str(db_error)
                     }
                 except Exception as fallback_error:
-                    print(f"⚠️ Fallback database query error: {str(fallback_error)}")
+                    debug_print("⚠️ Fallback database query error: %s", fallback_error)
                     database_info = {
                         'name': 'WISENTIA_DB',
                         'allocatedSpaceMB': 0,
@@ -1414,7 +1417,7 @@ def system_health(request):
                 }
                 
             except Exception as security_error:
-                print(f"⚠️ Security monitoring error: {str(security_error)}")
+                debug_print("⚠️ Security monitoring error: %s", security_error)
                 security_data = {
                     'failedLogins24h': 0,
                     'activeSessions': 0,
@@ -1453,7 +1456,7 @@ def system_health(request):
                 }
                 
             except Exception as perf_error:
-                print(f"⚠️ Performance monitoring error: {str(perf_error)}")
+                debug_print("⚠️ Performance monitoring error: %s", perf_error)
                 performance_data = {
                     'averageResponseTime': 0,
                     'requestsPerHour': 0,
@@ -1485,7 +1488,7 @@ def system_health(request):
                 }
                 
             except Exception as business_error:
-                print(f"⚠️ Business metrics error: {str(business_error)}")
+                debug_print("⚠️ Business metrics error: %s", business_error)
                 business_data = {
                     'averageCourseCompletion': 0,
                     'coursesCompletedThisWeek': 0,
@@ -1532,7 +1535,7 @@ def system_health(request):
             else:
                 overall_health = 'healthy'
             
-            print(f"✅ Comprehensive system health data compiled successfully")
+            debug_print("✅ Comprehensive system health data compiled successfully")
             
             return Response({
                 'health_status': 'operational',
@@ -1548,6 +1551,9 @@ def system_health(request):
                 'business': business_data,
                 'userGrowth': user_growth,
                 'checks': system_checks,
+                'connectionPool': pool_stats.snapshot(),
+                'upstreams': upstream_stats.snapshot(),
+                'llmCache': llm_cache_stats.snapshot(),
                 'stats': {
                     'users': users_data,
                     'content': content_data,
@@ -1561,7 +1567,7 @@ def system_health(request):
             })
             
     except Exception as e:
-        print(f"❌ System health error: {str(e)}")
+        debug_print("❌ System health error: %s", e)
         import traceback
         traceback.print_exc()
         
@@ -1623,7 +1629,7 @@ def cache_stats(request):
                        status=status.HTTP_403_FORBIDDEN)
     
     try:
-        print(f"📊 Cache stats requested by admin user {user_id}")
+        debug_print("📊 Cache stats requested by admin user %s", user_id)
         
         # Redis bağlantısını kontrol et
         try:
@@ -1717,14 +1723,16 @@ def cache_stats(request):
                 'replication': {
                     'role': info.get('role', 'unknown'),
                     'connected_slaves': info.get('connected_slaves', 0)
-                }
+                },
+                # Tag bazlı invalidation istatistikleri (hit/miss/invalidation, güncel versiyon)
+                'tags': tag_stats.snapshot()
             }
             
-            print(f"✅ Cache stats compiled successfully")
+            debug_print("✅ Cache stats compiled successfully")
             return Response(cache_data)
             
         except Exception as redis_error:
-            print(f"⚠️ Redis connection error: {str(redis_error)}")
+            debug_print("⚠️ Redis connection error: %s", redis_error)
             # Redis bağlantı hatası durumunda varsayılan veriler
             return Response({
                 'status': 'error',
@@ -1770,7 +1778,7 @@ def cache_stats(request):
             })
             
     except Exception as e:
-        print(f"❌ Cache stats error: {str(e)}")
+        debug_print("❌ Cache stats error: %s", e)
         return Response({
             'status': 'error',
             'error': f"Failed to get cache stats: {str(e)}",
@@ -1779,13 +1787,33 @@ def cache_stats(request):
             'performance': {'hits': 0, 'misses': 0, 'hit_ratio': '0.00%'}
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def llm_cache_invalidate(request):
+    """LLM yanıt önbelleğini geçersiz kılar (sadece admin); useCase verilmezse tüm alanlar"""
+    user_id = request.user.id
+    
+    if not is_admin(user_id):
+        return Response({'error': 'You do not have permission to access this resource'}, 
+                       status=status.HTTP_403_FORBIDDEN)
+    
+    use_case = request.data.get('useCase') or None
+    if use_case is not None and use_case not in settings.LLM_CACHE_TTL:
+        return Response({'error': f"Unknown LLM cache use case: {use_case}",
+                         'useCases': sorted(settings.LLM_CACHE_TTL)},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    invalidate_llm_cache(use_case)
+    debug_print("🧹 LLM cache invalidated by admin user %s (use case: %s)", user_id, use_case or 'all')
+    return Response({'message': 'LLM cache invalidated', 'useCase': use_case or 'all'})
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def admin_dashboard_debug(request):
     """Admin dashboard debug bilgilerini getiren API endpoint'i"""
-    print(f"✅ DEBUG API HIT: /admin/dashboard/debug/")
-    print(f"✅ Authenticated user ID: {request.user.id}")
-    print(f"✅ Authenticated user role: {request.user.role if hasattr(request.user, 'role') else 'unknown'}")
+    debug_print("✅ DEBUG API HIT: /admin/dashboard/debug/")
+    debug_print("✅ Authenticated user ID: %s", request.user.id)
+    debug_print("✅ Authenticated user role: %s", request.user.role if hasattr(request.user, 'role') else 'unknown')
     
     # Debug bilgileri
     debug_info = {
@@ -1820,11 +1848,11 @@ def create_course_video(request):
     user_id = request.user.id
     
     # Debug logging
-    print(f"✅ Video creation API called by user ID: {user_id}")
-    print(f"✅ Request data: {request.data}")
+    debug_print("✅ Video creation API called by user ID: %s", user_id)
+    debug_print("✅ Request data: %s", request.data)
     
     if not is_admin(user_id):
-        print(f"❌ User {user_id} is not admin - Access denied")
+        debug_print("❌ User %s is not admin - Access denied", user_id)
         return Response({'error': 'You do not have permission to access this resource'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
@@ -1844,28 +1872,28 @@ def create_course_video(request):
                 match = re.search(r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/|youtube\.com\/v\/|youtube\.com\/e\/|youtube.com\/shorts\/|youtube\.com\/watch\?.*v=)([^&?#\/\s]+)', youtube_video_id)
                 if match and match.group(1):
                     youtube_video_id = match.group(1)
-                    print(f"✅ Extracted YouTube ID: {youtube_video_id}")
+                    debug_print("✅ Extracted YouTube ID: %s", youtube_video_id)
                 else:
                     # Try youtu.be format
                     match = re.search(r'youtu\.be\/([^&?#\/\s]+)', youtube_video_id)
                     if match and match.group(1):
                         youtube_video_id = match.group(1)
-                        print(f"✅ Extracted YouTube ID from youtu.be format: {youtube_video_id}")
+                        debug_print("✅ Extracted YouTube ID from youtu.be format: %s", youtube_video_id)
             except Exception as e:
-                print(f"⚠️ Error extracting YouTube ID: {str(e)}")
+                debug_print("⚠️ Error extracting YouTube ID: %s", e)
         
         # Further validate YouTube ID (should be 11 chars typically)
         if youtube_video_id and len(youtube_video_id) > 20:
-            print(f"⚠️ YouTube ID seems too long, might be a full URL: {youtube_video_id}")
+            debug_print("⚠️ YouTube ID seems too long, might be a full URL: %s", youtube_video_id)
             youtube_video_id = youtube_video_id[:20]  # Truncate to prevent database errors
         
         # Log each field individually for better debugging
-        print(f"✅ course_id: {course_id}")
-        print(f"✅ youtube_video_id: {youtube_video_id}")
-        print(f"✅ title: {title}")
-        print(f"✅ description: {description}")
-        print(f"✅ duration: {duration}")
-        print(f"✅ order_in_course: {order_in_course}")
+        debug_print("✅ course_id: %s", course_id)
+        debug_print("✅ youtube_video_id: %s", youtube_video_id)
+        debug_print("✅ title: %s", title)
+        debug_print("✅ description: %s", description)
+        debug_print("✅ duration: %s", duration)
+        debug_print("✅ order_in_course: %s", order_in_course)
         
         # Convert numeric values if needed
         try:
@@ -1880,7 +1908,7 @@ def create_course_video(request):
             
         # Ensure course_id is properly handled
         if not course_id:
-            print(f"❌ Missing required field: course_id")
+            debug_print("❌ Missing required field: course_id")
             return Response({
                 'error': 'Course ID is required'
             }, status=status.HTTP_400_BAD_REQUEST)
@@ -1888,19 +1916,19 @@ def create_course_video(request):
         try:
             course_id = int(course_id)
         except (ValueError, TypeError):
-            print(f"❌ Invalid course_id format: {course_id}")
+            debug_print("❌ Invalid course_id format: %s", course_id)
             return Response({
                 'error': f'Invalid course_id format: {course_id}'
             }, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
-        print(f"❌ Error parsing request data: {str(e)}")
+        debug_print("❌ Error parsing request data: %s", e)
         return Response({
             'error': f'Error parsing request data: {str(e)}'
         }, status=status.HTTP_400_BAD_REQUEST)
     
     # Validate required fields
     if not all([course_id, youtube_video_id, title]):
-        print(f"❌ Missing required fields: course_id={course_id}, title={title}, youtube_id={youtube_video_id}")
+        debug_print("❌ Missing required fields: course_id=%s, title=%s, youtube_id=%s", course_id, title, youtube_video_id)
         return Response({
             'error': 'Course ID, YouTube Video ID, and Title are required'
         }, status=status.HTTP_400_BAD_REQUEST)
@@ -1909,9 +1937,9 @@ def create_course_video(request):
     channel_name = None
     try:
         channel_name = fetch_youtube_channel_name(youtube_video_id)
-        print(f"✅ Channel name for video: {channel_name}")
+        debug_print("✅ Channel name for video: %s", channel_name)
     except Exception as e:
-        print(f"⚠️ Error fetching channel name: {str(e)}")
+        debug_print("⚠️ Error fetching channel name: %s", e)
         # Non-critical, continue even if fetching channel name fails
     
     try:
@@ -1923,12 +1951,12 @@ def create_course_video(request):
             
             course_exists = cursor.fetchone()[0]
             if course_exists == 0:
-                print(f"❌ Course with ID {course_id} does not exist")
+                debug_print("❌ Course with ID %s does not exist", course_id)
                 return Response({
                     'error': f'Course with ID {course_id} does not exist'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            print(f"✅ Found course with ID {course_id}")
+            debug_print("✅ Found course with ID %s", course_id)
             
             # First check if YouTubeChannelName column exists, add it if not
             try:
@@ -1943,9 +1971,9 @@ def create_course_video(request):
                         ALTER TABLE Courses
                         ADD YouTubeChannelName NVARCHAR(255) NULL
                     """)
-                    print("✅ Added YouTubeChannelName column to Courses table")
+                    debug_print("✅ Added YouTubeChannelName column to Courses table")
             except Exception as col_err:
-                print(f"⚠️ Error checking or adding YouTubeChannelName column: {str(col_err)}")
+                debug_print("⚠️ Error checking or adding YouTubeChannelName column: %s", col_err)
                 # Continue anyway
             
             # Update the course's channel name if we have a channel name
@@ -1959,9 +1987,9 @@ def create_course_video(request):
                     """, [channel_name, course_id])
                     
                     if cursor.rowcount > 0:
-                        print(f"✅ Updated course with channel name: {channel_name}")
+                        debug_print("✅ Updated course with channel name: %s", channel_name)
                 except Exception as update_err:
-                    print(f"⚠️ Error updating channel name: {str(update_err)}")
+                    debug_print("⚠️ Error updating channel name: %s", update_err)
                     # Continue even if this fails
             
             # Insert video - fix SQL Server issue
@@ -1974,15 +2002,15 @@ def create_course_video(request):
                     course_id, youtube_video_id, title, description, duration, order_in_course
                 ])
                 
-                print(f"✅ Inserted video into CourseVideos table")
+                debug_print("✅ Inserted video into CourseVideos table")
                 
                 # Get the inserted video ID in a separate query
                 cursor.execute("SELECT SCOPE_IDENTITY();")
                 video_id = cursor.fetchone()[0]
-                print(f"✅ New video ID: {video_id}")
+                debug_print("✅ New video ID: %s", video_id)
                 
             except Exception as sql_err:
-                print(f"❌ SQL error when inserting video: {str(sql_err)}")
+                debug_print("❌ SQL error when inserting video: %s", sql_err)
                 raise sql_err
             
             # Update the total videos count in the course
@@ -1995,9 +2023,9 @@ def create_course_video(request):
                     WHERE CourseID = %s
                 """, [course_id, course_id])
                 
-                print(f"✅ Updated TotalVideos count for course {course_id}")
+                debug_print("✅ Updated TotalVideos count for course %s", course_id)
             except Exception as count_err:
-                print(f"❌ Error updating TotalVideos count: {str(count_err)}")
+                debug_print("❌ Error updating TotalVideos count: %s", count_err)
                 # Continue even if this fails
         
         # Log activity
@@ -2010,28 +2038,27 @@ def create_course_video(request):
                 """, [
                     user_id, f"Added video '{title}' to course ID {course_id}"
                 ])
-            print(f"✅ Added activity log entry")
+            debug_print("✅ Added activity log entry")
         except Exception as log_err:
-            print(f"❌ Error adding activity log: {str(log_err)}")
+            debug_print("❌ Error adding activity log: %s", log_err)
             # Non-critical, continue
         
         # Invalidate any caches related to the course
         try:
-            cache_key_prefix = getattr(settings, 'CACHE_KEY_PREFIX', '')
-            cache.delete(f"{cache_key_prefix}course_detail_{course_id}")
-            print(f"✅ Invalidated cache for course {course_id}")
+            invalidate_tags('catalog:courses')
+            debug_print("✅ Invalidated cache for course %s", course_id)
         except Exception as cache_err:
-            print(f"❌ Error invalidating cache: {str(cache_err)}")
+            debug_print("❌ Error invalidating cache: %s", cache_err)
             # Non-critical, continue
         
-        print(f"✅ Video created successfully: {title} for course {course_id}")
+        debug_print("✅ Video created successfully: %s for course %s", title, course_id)
         return Response({
             'message': 'Video created successfully',
             'videoId': video_id
         }, status=status.HTTP_201_CREATED)
         
     except Exception as e:
-        print(f"❌ Error creating video: {str(e)}")
+        debug_print("❌ Error creating video: %s", e)
         return Response({
             'error': f'Error creating video: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -2043,11 +2070,11 @@ def update_course(request, course_id):
     user_id = request.user.id
     
     # Debug logging
-    print(f"✅ Update course API called by user ID: {user_id} for course ID: {course_id}")
-    print(f"✅ Request data: {request.data}")
+    debug_print("✅ Update course API called by user ID: %s for course ID: %s", user_id, course_id)
+    debug_print("✅ Request data: %s", request.data)
     
     if not is_admin(user_id):
-        print(f"❌ User {user_id} is not admin - Access denied")
+        debug_print("❌ User %s is not admin - Access denied", user_id)
         return Response({'error': 'You do not have permission to access this resource'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
@@ -2060,12 +2087,12 @@ def update_course(request, course_id):
     is_active = request.data.get('isActive')
     
     # Log fields
-    print(f"✅ title: {title}")
-    print(f"✅ description: {description}")
-    print(f"✅ category: {category}")
-    print(f"✅ difficulty: {difficulty}")
-    print(f"✅ thumbnail_url: {thumbnail_url}")
-    print(f"✅ is_active: {is_active}")
+    debug_print("✅ title: %s", title)
+    debug_print("✅ description: %s", description)
+    debug_print("✅ category: %s", category)
+    debug_print("✅ difficulty: %s", difficulty)
+    debug_print("✅ thumbnail_url: %s", thumbnail_url)
+    debug_print("✅ is_active: %s", is_active)
     
     # Build update query dynamically
     update_fields = []
@@ -2099,7 +2126,7 @@ def update_course(request, course_id):
     update_fields.append("UpdatedDate = GETDATE()")
     
     if not update_fields:
-        print("❌ No fields to update")
+        debug_print("❌ No fields to update")
         return Response({
             'error': 'No fields to update'
         }, status=status.HTTP_400_BAD_REQUEST)
@@ -2112,7 +2139,7 @@ def update_course(request, course_id):
             """, [course_id])
             
             if cursor.fetchone()[0] == 0:
-                print(f"❌ Course with ID {course_id} not found")
+                debug_print("❌ Course with ID %s not found", course_id)
                 return Response({
                     'error': f'Course with ID {course_id} not found'
                 }, status=status.HTTP_404_NOT_FOUND)
@@ -2126,7 +2153,7 @@ def update_course(request, course_id):
             params.append(course_id)
             
             cursor.execute(query, params)
-            print(f"✅ Course updated with ID: {course_id}")
+            debug_print("✅ Course updated with ID: %s", course_id)
             
             # Check if we need to update YouTubeChannelName
             cursor.execute("""
@@ -2143,12 +2170,12 @@ def update_course(request, course_id):
                     break
             
             if first_video_id:
-                print(f"✅ Found first video ID: {first_video_id}")
+                debug_print("✅ Found first video ID: %s", first_video_id)
                 # Try to fetch and update YouTube channel name
                 try:
                     channel_name = fetch_youtube_channel_name(first_video_id)
                     if channel_name:
-                        print(f"✅ Fetched channel name for course update: {channel_name}")
+                        debug_print("✅ Fetched channel name for course update: %s", channel_name)
                         cursor.execute("""
                             UPDATE Courses
                             SET YouTubeChannelName = %s
@@ -2157,9 +2184,9 @@ def update_course(request, course_id):
                         """, [channel_name, course_id])
                         
                         if cursor.rowcount > 0:
-                            print(f"✅ Updated course channel name during update: {channel_name}")
+                            debug_print("✅ Updated course channel name during update: %s", channel_name)
                 except Exception as channel_err:
-                    print(f"⚠️ Error updating channel name during course update: {str(channel_err)}")
+                    debug_print("⚠️ Error updating channel name during course update: %s", channel_err)
                     # Non-critical, continue
             
             # Get updated course data
@@ -2183,19 +2210,17 @@ def update_course(request, course_id):
                 """, [
                     user_id, f"Updated course: {updated_course['Title']} (ID: {course_id})"
                 ])
-            print("✅ Added activity log entry for course update")
+            debug_print("✅ Added activity log entry for course update")
         except Exception as e:
-            print(f"⚠️ Error adding activity log: {str(e)}")
+            debug_print("⚠️ Error adding activity log: %s", e)
             # Non-critical, continue
         
         # Invalidate cache
         try:
-            cache_key_prefix = getattr(settings, 'CACHE_KEY_PREFIX', '')
-            cache.delete(f"{cache_key_prefix}course_detail_{course_id}")
-            cache.delete(f"{cache_key_prefix}courses_list*")
-            print("✅ Cache invalidated")
+            invalidate_tags('catalog:courses')
+            debug_print("✅ Cache invalidated")
         except Exception as e:
-            print(f"⚠️ Error invalidating cache: {str(e)}")
+            debug_print("⚠️ Error invalidating cache: %s", e)
             # Non-critical, continue
         
         return Response({
@@ -2204,7 +2229,7 @@ def update_course(request, course_id):
         })
         
     except Exception as e:
-        print(f"❌ Error updating course: {str(e)}")
+        debug_print("❌ Error updating course: %s", e)
         return Response({
             'error': f'Error updating course: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -2216,10 +2241,10 @@ def delete_course(request, course_id):
     user_id = request.user.id
     
     # Debug logging
-    print(f"✅ Delete course API called by user ID: {user_id} for course ID: {course_id}")
+    debug_print("✅ Delete course API called by user ID: %s for course ID: %s", user_id, course_id)
     
     if not is_admin(user_id):
-        print(f"❌ User {user_id} is not admin - Access denied")
+        debug_print("❌ User %s is not admin - Access denied", user_id)
         return Response({'error': 'You do not have permission to access this resource'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
@@ -2234,13 +2259,13 @@ def delete_course(request, course_id):
             
             result = cursor.fetchone()
             if not result:
-                print(f"❌ Course with ID {course_id} not found")
+                debug_print("❌ Course with ID %s not found", course_id)
                 return Response({
                     'error': f'Course with ID {course_id} not found'
                 }, status=status.HTTP_404_NOT_FOUND)
             
             course_title = result[0]
-            print(f"✅ Found course to delete: {course_title} (ID: {course_id})")
+            debug_print("✅ Found course to delete: %s (ID: %s)", course_title, course_id)
             
             # Check if course has enrolled users
             cursor.execute("""
@@ -2249,7 +2274,7 @@ def delete_course(request, course_id):
             
             enrolled_count = cursor.fetchone()[0]
             if enrolled_count > 0:
-                print(f"⚠️ Course has {enrolled_count} enrolled users, marking as inactive instead of deleting")
+                debug_print("⚠️ Course has %s enrolled users, marking as inactive instead of deleting", enrolled_count)
                 
                 # Mark as inactive instead of deleting
                 cursor.execute("""
@@ -2264,26 +2289,26 @@ def delete_course(request, course_id):
                 })
             
             # Delete associated videos first
-            print("✅ Deleting associated videos...")
+            debug_print("✅ Deleting associated videos...")
             cursor.execute("""
                 DELETE FROM CourseVideos WHERE CourseID = %s
             """, [course_id])
             videos_deleted = cursor.rowcount
-            print(f"✅ Deleted {videos_deleted} videos")
+            debug_print("✅ Deleted %s videos", videos_deleted)
             
             # Delete the course
-            print("✅ Deleting course...")
+            debug_print("✅ Deleting course...")
             cursor.execute("""
                 DELETE FROM Courses WHERE CourseID = %s
             """, [course_id])
             
             if cursor.rowcount == 0:
-                print("⚠️ No course was deleted, might have been deleted already")
+                debug_print("⚠️ No course was deleted, might have been deleted already")
                 return Response({
                     'error': 'Course not found or already deleted'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            print(f"✅ Successfully deleted course with ID: {course_id}")
+            debug_print("✅ Successfully deleted course with ID: %s", course_id)
         
         # Log activity
         try:
@@ -2295,19 +2320,17 @@ def delete_course(request, course_id):
                 """, [
                     user_id, f"Deleted course: {course_title} (ID: {course_id})"
                 ])
-            print("✅ Added activity log entry for course deletion")
+            debug_print("✅ Added activity log entry for course deletion")
         except Exception as e:
-            print(f"⚠️ Error adding activity log: {str(e)}")
+            debug_print("⚠️ Error adding activity log: %s", e)
             # Non-critical, continue
         
         # Invalidate cache
         try:
-            cache_key_prefix = getattr(settings, 'CACHE_KEY_PREFIX', '')
-            cache.delete(f"{cache_key_prefix}course_detail_{course_id}")
-            cache.delete(f"{cache_key_prefix}courses_list*")
-            print("✅ Cache invalidated")
+            invalidate_tags('catalog:courses')
+            debug_print("✅ Cache invalidated")
         except Exception as e:
-            print(f"⚠️ Error invalidating cache: {str(e)}")
+            debug_print("⚠️ Error invalidating cache: %s", e)
             # Non-critical, continue
         
         return Response({
@@ -2318,7 +2341,7 @@ def delete_course(request, course_id):
         })
         
     except Exception as e:
-        print(f"❌ Error deleting course: {str(e)}")
+        debug_print("❌ Error deleting course: %s", e)
         return Response({
             'error': f'Error deleting course: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -2483,6 +2506,7 @@ def admin_create_nft(request):
     )
     
     if result["success"]:
+        invalidate_tags('catalog:nfts')
         return Response({
             'message': 'NFT created successfully with IPFS metadata',
             'nftId': result["nftId"],
@@ -2686,6 +2710,9 @@ def update_nft(request, nft_id):
             f"Updated NFT: ID {nft_id}"
         ])
     
+    # Quest kataloğu ödül NFT'sinin başlık/görselini içerir
+    invalidate_tags('catalog:nfts', 'catalog:quests')
+    
     return Response({
         'message': 'NFT updated successfully',
         'nftId': nft_id
@@ -2949,9 +2976,9 @@ def create_quiz(request):
                 result = cursor.fetchone()
                 if result and result[0] is not None:
                     quiz_id = result[0]
-                    print(f"Manual quiz created with ID: {quiz_id}")
+                    debug_print("Manual quiz created with ID: %s", quiz_id)
             except Exception as e:
-                print(f"SCOPE_IDENTITY() failed: {str(e)}")
+                debug_print("SCOPE_IDENTITY() failed: %s", e)
             
             # Method 2: Alternatif yöntem
             if quiz_id is None:
@@ -2964,15 +2991,15 @@ def create_quiz(request):
                     result = cursor.fetchone()
                     if result and result[0] is not None:
                         quiz_id = result[0]
-                        print(f"Got quiz ID using alternative method: {quiz_id}")
+                        debug_print("Got quiz ID using alternative method: %s", quiz_id)
                 except Exception as e:
-                    print(f"Alternative method failed: {str(e)}")
+                    debug_print("Alternative method failed: %s", e)
             
             if quiz_id is None:
                 raise Exception("Failed to get quiz ID")
             
             # Soruları ekle - yapay zeka fonksiyonuna benzer şekilde
-            print(f"Processing {len(data['questions'])} questions for quiz {quiz_id}")
+            debug_print("Processing %s questions for quiz %s", len(data['questions']), quiz_id)
             
             for i, question_data in enumerate(data['questions']):
                 if not question_data.get('question_text'):
@@ -3246,7 +3273,7 @@ def update_quiz(request, quiz_id):
         })
         
     except Exception as e:
-        print(f"Quiz update error: {str(e)}")
+        debug_print("Quiz update error: %s", e)
         return Response({
             'error': 'Failed to update quiz',
             'message': str(e)
@@ -3297,7 +3324,7 @@ def delete_quiz(request, quiz_id):
         })
         
     except Exception as e:
-        print(f"Quiz deletion error: {str(e)}")
+        debug_print("Quiz deletion error: %s", e)
         return Response({
             'error': 'Failed to delete quiz',
             'message': str(e)
@@ -3307,11 +3334,11 @@ def delete_quiz(request, quiz_id):
 @permission_classes([IsAuthenticated])
 def admin_analytics(request):
     """Admin analytics verilerini getiren kapsamlı API endpoint'i - ULTRA OPTIMIZE"""
-    print(f"📊 ANALYTICS API START: {datetime.now().strftime('%H:%M:%S.%f')}")
+    debug_print("📊 ANALYTICS API START: %s", datetime.now().strftime('%H:%M:%S.%f'))
     user_id = request.user.id
     
     if not is_admin(user_id):
-        print(f"❌ Access denied for user {user_id}: Not admin")
+        debug_print("❌ Access denied for user %s: Not admin", user_id)
         return Response({'error': 'You do not have permission to access this resource'}, 
                        status=status.HTTP_403_FORBIDDEN)
     
@@ -3320,7 +3347,7 @@ def admin_analytics(request):
     try:
         # ULTRA OPTIMIZATION: Use WITH HINT for faster queries
         with connection.cursor() as cursor:
-            print(f"📊 DB CONNECTION: {datetime.now().strftime('%H:%M:%S.%f')}")
+            debug_print("📊 DB CONNECTION: %s", datetime.now().strftime('%H:%M:%S.%f'))
             
             # MEGA OPTIMIZE: Single ultra-fast query with all core metrics
             cursor.execute("""
@@ -3350,12 +3377,12 @@ def admin_analytics(request):
                 SELECT * FROM FastStats
             """)
             
-            print(f"📊 MAIN QUERY DONE: {datetime.now().strftime('%H:%M:%S.%f')}")
+            debug_print("📊 MAIN QUERY DONE: %s", datetime.now().strftime('%H:%M:%S.%f'))
             main_stats = cursor.fetchone()
             
             # FIX: Ensure we have data and validate indices
             if not main_stats or len(main_stats) < 13:
-                print(f"❌ Invalid main_stats result: {main_stats}")
+                debug_print("❌ Invalid main_stats result: %s", main_stats)
                 # Return default data structure
                 return Response({
                     'userStats': {
@@ -3416,7 +3443,7 @@ def admin_analytics(request):
                 'timestamp': datetime.now().isoformat()
             }
             
-            print(f"📊 CORE DATA BUILT: {datetime.now().strftime('%H:%M:%S.%f')}")
+            debug_print("📊 CORE DATA BUILT: %s", datetime.now().strftime('%H:%M:%S.%f'))
             
             # SPEED OPTIMIZATION: Only add extra data if we have time
             time_elapsed = (datetime.now() - start_time).total_seconds() * 1000
@@ -3519,23 +3546,23 @@ def admin_analytics(request):
                     response_data['learningProgress']['categoryStats'] = category_stats
                     response_data['learningProgress']['popularCourses'] = popular_courses
                     
-                    print(f"📊 REAL DATA ADDED: {datetime.now().strftime('%H:%M:%S.%f')}")
+                    debug_print("📊 REAL DATA ADDED: %s", datetime.now().strftime('%H:%M:%S.%f'))
                     
                 except Exception as extra_error:
-                    print(f"⚠️ Real data error (non-critical): {str(extra_error)}")
+                    debug_print("⚠️ Real data error (non-critical): %s", extra_error)
             else:
-                print(f"⚠️ Skipping extra data - time limit reached: {time_elapsed}ms")
+                debug_print("⚠️ Skipping extra data - time limit reached: %sms", time_elapsed)
     
         end_time = datetime.now()
         total_time = (end_time - start_time).total_seconds() * 1000
         
-        print(f"📊 ANALYTICS COMPLETED: {end_time.strftime('%H:%M:%S.%f')} ({total_time:.1f}ms)")
+        debug_print("📊 ANALYTICS COMPLETED: %s (%.1fms)", end_time.strftime('%H:%M:%S.%f'), total_time)
         
         return Response(response_data)
         
     except Exception as e:
         error_time = (datetime.now() - start_time).total_seconds() * 1000
-        print(f"❌ Analytics error after {error_time:.1f}ms: {str(e)}")
+        debug_print("❌ Analytics error after %.1fms: %s", error_time, e)
         return Response({
             'error': 'Failed to fetch analytics data',
             'message': str(e),
@@ -2,15 +2,18 @@ import os
 import json
 import requests
 import logging
-import time
 from django.conf import settings
 
+from .llm_cache import cached_completion
+from .llm_limits import llm_post
+
 logger = logging.getLogger(__name__)
 # Get API key from Django settings, fall back to env var
 ANTHROPIC_API_KEY = getattr(settings, 'ANTHROPIC_API_KEY', os.environ.get('ANTHROPIC_API_KEY'))
 
 CLAUDE_MODEL = "claude-3-opus-20240229"
 CLAUDE_BACKUP_MODEL = "claude-3-sonnet-20240229"  # Fallback to cheaper model if needed
+ANTHROPIC_MESSAGES_URL = "https://api.anthropic.com/v1/messages"
 
 def is_available():
     """Check if Anthropic API is available by checking if API key is set"""
@@ -20,16 +23,7 @@ def is_available():
         logger.warning("ANTHROPIC_API_KEY not found in settings or environment.")
         return False
 
-def generate_with_anthropic(prompt, system_prompt=None, history=None, stream=False, timeout=1800):
-    """
-    Claude 3 API ile yanıt üretir
-    """
-    if not ANTHROPIC_API_KEY:
-        raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
-    
-    logger.info(f"Claude API isteği gönderiliyor: {CLAUDE_MODEL}")
-    
-    # Prepare messages
+def _build_messages(prompt, history=None):
     messages = []
     
     # Add previous messages from history
@@ -46,13 +40,36 @@ def generate_with_anthropic(prompt, system_prompt=None, history=None, stream=Fal
         "role": "user",
         "content": prompt
     })
+    return messages
+
+def generate_with_anthropic(prompt, system_prompt=None, history=None, stream=False, timeout=1800,
+                            max_tokens=4000, temperature=0.2, cache_use_case='default', cache_refresh=False):
+    """
+    Claude 3 API ile yanıt üretir.
+    Akış dışı yanıtlar cache_use_case alanında önbelleğe alınır (bkz. ai/llm_cache.py);
+    cache_use_case=None önbelleği devre dışı bırakır.
+    """
+    if not ANTHROPIC_API_KEY:
+        raise ValueError("ANTHROPIC_API_KEY environment variable is not set")
+
+    messages = _build_messages(prompt, history)
+    if stream:
+        return _generate_with_anthropic(messages, system_prompt, stream, timeout, max_tokens, temperature)
+    return cached_completion(
+        cache_use_case, 'anthropic', CLAUDE_MODEL, system_prompt, messages, temperature, max_tokens,
+        lambda: _generate_with_anthropic(messages, system_prompt, stream, timeout, max_tokens, temperature),
+        refresh=cache_refresh,
+    )
+
+def _generate_with_anthropic(messages, system_prompt, stream, timeout, max_tokens, temperature):
+    logger.info(f"Claude API isteği gönderiliyor: {CLAUDE_MODEL}")
     
     # API request data
     data = {
         "model": CLAUDE_MODEL,
         "messages": messages,
-        "max_tokens": 4000,
-        "temperature": 0.2,  # Low temperature for more deterministic output
+        "max_tokens": max_tokens,
+        "temperature": temperature,
         "stream": stream
     }
     
@@ -60,38 +77,16 @@ def generate_with_anthropic(prompt, system_prompt=None, history=None, stream=Fal
     if system_prompt:
         data["system"] = system_prompt
     
+    headers = {
+        "x-api-key": ANTHROPIC_API_KEY,
+        "anthropic-version": "2023-06-01"
+    }
+
     try:
-        # Implement retry logic
-        max_retries = 2
-        retry_count = 0
-        retry_delay = 5  # seconds
-        current_timeout = timeout
-        
-        while True:
-            try:
-                # API request with timeout
-                response = requests.post(
-                    "https://api.anthropic.com/v1/messages",
-                    json=data,
-                    headers={
-                        "Content-Type": "application/json",
-                        "x-api-key": ANTHROPIC_API_KEY,
-                        "anthropic-version": "2023-06-01"
-                    },
-                    stream=stream,
-                    timeout=current_timeout  # 30 minute timeout
-                )
-                break  # Exit retry loop on success
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                retry_count += 1
-                if retry_count <= max_retries:
-                    logger.warning(f"Anthropic request attempt {retry_count} failed with {str(e)}. Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                    current_timeout *= 1.5  # Increase timeout for retry
-                else:
-                    logger.error(f"All {max_retries} Anthropic retry attempts failed.")
-                    raise  # Re-raise the last exception
+        # Paylaşılan bağlantı havuzu; bağlantı/zaman aşımı hataları ve 429/5xx http_client'ta yeniden denenir
+        response = llm_post(
+            'anthropic', ANTHROPIC_MESSAGES_URL, json=data, headers=headers, stream=stream, timeout=timeout
+        )
         
         if not response.ok:
             logger.error(f"Claude API error: {response.status_code} - {response.text}")
@@ -101,40 +96,17 @@ def generate_with_anthropic(prompt, system_prompt=None, history=None, stream=Fal
                 logger.warning(f"Falling back to {CLAUDE_BACKUP_MODEL}")
                 data["model"] = CLAUDE_BACKUP_MODEL
                 
-                # Implement retry logic for backup model too
-                backup_retry_count = 0
-                backup_retry_delay = 5
-                backup_timeout = current_timeout
-                
-                while True:
-                    try:
-                        backup_response = requests.post(
-                            "https://api.anthropic.com/v1/messages",
-                            json=data,
-                            headers={
-                                "Content-Type": "application/json",
-                                "x-api-key": ANTHROPIC_API_KEY,
-                                "anthropic-version": "2023-06-01"
-                            },
-                            stream=stream,
-                            timeout=backup_timeout
-                        )
-                        response = backup_response  # Use the backup response
-                        break
-                    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                        backup_retry_count += 1
-                        if backup_retry_count <= max_retries:
-                            logger.warning(f"Backup model request attempt {backup_retry_count} failed with {str(e)}. Retrying in {backup_retry_delay} seconds...")
-                            time.sleep(backup_retry_delay)
-                            backup_retry_delay *= 2
-                            backup_timeout *= 1.5
-                        else:
-                            logger.error(f"All {max_retries} backup model retry attempts failed.")
-                            return {
-                                'response': "Sorry, I'm having trouble processing your request.",
-                                'success': False,
-                                'error': f"Backup API Error: {str(e)}"
-                            }
+                try:
+                    response = llm_post(
+                        'anthropic', ANTHROPIC_MESSAGES_URL, json=data, headers=headers, stream=stream, timeout=timeout
+                    )
+                except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                    logger.error(f"Backup model request failed: {str(e)}")
+                    return {
+                        'response': "Sorry, I'm having trouble processing your request.",
+                        'success': False,
+                        'error': f"Backup API Error: {str(e)}"
+                    }
                 
                 if not response.ok:
                     logger.error(f"Claude backup API error: {response.status_code} - {response.text}")
@@ -0,0 +1,213 @@
+"""
+ASGI üzerinden servis edilen async AI view'ları.
+
+DRF view'ları async çalışmadığından kimlik doğrulama (CustomJWTAuthentication) ve
+throttling (DEFAULT_THROTTLE_CLASSES) elle yapılır; veritabanı işlemleri sync_to_async
+ile thread havuzunda çalışır. Django 4.2'de csrf_exempt / require_http_methods async
+view'ı sync bir fonksiyona sardığından (coroutine döner, HttpResponse değil) bu
+dekoratörler kullanılmaz: metot view içinde kontrol edilir, csrf_exempt özniteliği
+doğrudan atanır.
+"""
+import asyncio
+import json
+import logging
+import math
+import time
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.conf import settings
+from rest_framework import exceptions
+from rest_framework.settings import api_settings
+
+from users.auth import CustomJWTAuthentication
+from .chat_context import CHAT_SYSTEM_PROMPT, build_chat_context, schedule_summary_update
+from .stream_checkpoint import (
+    MESSAGE_STATUS_COMPLETE, MESSAGE_STATUS_INTERRUPTED, MESSAGE_STATUS_STREAMING,
+    StreamCheckpoint, read_stream_message,
+)
+from .streaming import stream_chat_response
+
+logger = logging.getLogger(__name__)
+
+
+def _authenticate(request):
+    """(user, None) ya da (None, JsonResponse) döndürür"""
+    try:
+        result = CustomJWTAuthentication().authenticate(request)
+    except exceptions.AuthenticationFailed as e:
+        return None, JsonResponse({'detail': str(e.detail)}, status=401)
+    if result is None:
+        return None, JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+    return result[0], None
+
+
+def _check_throttles(request, user):
+    """
+    DRF'in APIView.check_throttles karşılığı; sınır aşıldıysa Retry-After'lı 429 döndürür.
+    X-RateLimit-* başlıklarını RateLimitHeaderMiddleware ekler.
+    """
+    request.user = user
+    waits = []
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        throttle = throttle_class()
+        if not throttle.allow_request(request, None):
+            waits.append(throttle.wait())
+    if not waits:
+        return None
+
+    wait = max((wait for wait in waits if wait is not None), default=None)
+    response = JsonResponse({'detail': str(exceptions.Throttled(wait).detail)}, status=429)
+    if wait is not None:
+        response['Retry-After'] = str(math.ceil(wait))
+    return response
+
+
+def _authenticate_and_throttle(request):
+    user, error_response = _authenticate(request)
+    if error_response is None:
+        error_response = _check_throttles(request, user)
+    return user, error_response
+
+
+def _open_chat_session(user_id, session_id, message):
+    """
+    Aktif oturumu doğrular ya da yenisini açar, konuşma bağlamını kurar ve
+    kullanıcı mesajını kaydeder. (session_id, ChatContext) döndürür.
+    """
+    with connection.cursor() as cursor:
+        if session_id:
+            cursor.execute("""
+                SELECT SessionID
+                FROM ChatSessions
+                WHERE SessionID = %s AND UserID = %s AND IsActive = 1
+            """, [session_id, user_id])
+            if not cursor.fetchone():
+                session_id = None
+
+        if not session_id:
+            cursor.execute("""
+                INSERT INTO ChatSessions
+                (UserID, StartTime, IsActive)
+                VALUES (%s, GETDATE(), 1)
+            """, [user_id])
+            cursor.execute("SELECT SCOPE_IDENTITY()")
+            session_id = int(cursor.fetchone()[0])
+
+        context = build_chat_context(session_id, CHAT_SYSTEM_PROMPT, message)
+        cursor.execute("""
+            INSERT INTO ChatMessages
+            (SessionID, SenderType, MessageContent, Timestamp)
+            VALUES (%s, 'user', %s, GETDATE())
+        """, [session_id, message])
+    return session_id, context
+
+
+async def chat_message_stream(request):
+    """AI chat API endpoint with streaming responses (SSE, async)"""
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    user, error_response = await sync_to_async(_authenticate_and_throttle)(request)
+    if error_response is not None:
+        return error_response
+
+    try:
+        body = json.loads(request.body or b'{}')
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON body'}, status=400)
+
+    message = body.get('message')
+    if not message:
+        return JsonResponse({'error': 'Message is required'}, status=400)
+
+    try:
+        session_id, context = await sync_to_async(_open_chat_session)(user.id, body.get('sessionId'), message)
+    except Exception as e:
+        logger.exception(f"Chat session error for user {user.id}")
+        return JsonResponse({'error': str(e), 'success': False}, status=500)
+
+    async def event_stream():
+        # Yanıt parça parça biriktirilir ve periyodik olarak kaydedilir (bkz. stream_checkpoint)
+        checkpoint = StreamCheckpoint(session_id)
+        await sync_to_async(checkpoint.start)()
+        status = MESSAGE_STATUS_INTERRUPTED
+        try:
+            async for chunk in stream_chat_response(message, context.system_prompt, context.history):
+                offset = checkpoint.length
+                due = checkpoint.append(chunk)
+                yield f"data: {json.dumps({'chunk': chunk, 'sessionId': session_id, 'messageId': checkpoint.message_id, 'offset': offset})}\n\n"
+                if due:
+                    await sync_to_async(checkpoint.flush)()
+            status = MESSAGE_STATUS_COMPLETE
+        except asyncio.CancelledError:
+            # İstemci bağlantıyı kapattı: upstream istek stream context'inden çıkarken kapandı
+            logger.info(f"Chat stream cancelled by client (session {session_id}, {checkpoint.length} chars)")
+            raise
+        finally:
+            # Kesilen akışın o ana kadarki kısmı da kaydedilir; shield kaydı ikinci bir iptalden korur
+            await asyncio.shield(sync_to_async(checkpoint.finish)(status))
+
+        await sync_to_async(schedule_summary_update)(session_id, context.unsummarized + 2)
+        yield f"data: {json.dumps({'done': True, 'sessionId': session_id, 'messageId': checkpoint.message_id, 'status': status})}\n\n"
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# JWT ile doğrulanır (cookie oturumu yok); @csrf_exempt async view'ı Django 4.2'de bozar
+chat_message_stream.csrf_exempt = True
+
+
+async def chat_message_resume(request, message_id):
+    """
+    Yeniden bağlanan istemci için AI mesajını ?offset=N karakterinden itibaren SSE olarak döndürür.
+    Mesaj hâlâ üretiliyorsa yeni parçalar geldikçe gönderilir.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+
+    user, error_response = await sync_to_async(_authenticate_and_throttle)(request)
+    if error_response is not None:
+        return error_response
+
+    try:
+        offset = max(int(request.GET.get('offset', 0)), 0)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid offset'}, status=400)
+
+    found = await sync_to_async(read_stream_message)(message_id, user.id)
+    if found is None:
+        return JsonResponse({'error': 'Message not found'}, status=404)
+
+    async def event_stream():
+        position = offset
+        content, status = found
+        last_progress = time.monotonic()
+        while True:
+            if len(content) > position:
+                yield f"data: {json.dumps({'chunk': content[position:], 'messageId': message_id, 'offset': position})}\n\n"
+                position = len(content)
+                last_progress = time.monotonic()
+            if status != MESSAGE_STATUS_STREAMING:
+                break
+            if time.monotonic() - last_progress > settings.CHAT_STREAM_STALE_SECONDS:
+                # Üreten worker durmuş (ör. yeniden başlatma); mesaj olduğu kadarıyla kalır
+                status = MESSAGE_STATUS_INTERRUPTED
+                break
+            await asyncio.sleep(settings.CHAT_STREAM_RESUME_POLL_INTERVAL)
+            latest = await sync_to_async(read_stream_message)(message_id, user.id)
+            if latest is None:
+                status = MESSAGE_STATUS_INTERRUPTED
+                break
+            content, status = latest
+
+        yield f"data: {json.dumps({'done': True, 'messageId': message_id, 'offset': position, 'status': status})}\n\n"
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,178 @@
+"""
+Sohbet oturumları için konuşma bağlamı.
+
+Model önceki mesajları görsün ama prompt oturum uzadıkça büyümesin diye bağlam
+token bütçesiyle (CHAT_CONTEXT_TOKEN_BUDGET) kurulur:
+
+- Oturumun eski kısmı, önbellekte tutulan kayan bir özetle (rolling summary) temsil edilir
+- Özetlenmemiş mesajlardan en yenileri, bütçe dolana kadar olduğu gibi eklenir
+- Özetlenmemiş mesaj sayısı CHAT_CONTEXT_RECENT_MESSAGES + 2 * CHAT_SUMMARY_EVERY_TURNS'e
+  ulaşınca, en yeni mesajlar dışındakiler yanıt kaydedildikten sonra arka planda özete katlanır
+
+Token sayısı tokenizer yüklenmeden karakter sayısından tahmin edilir.
+
+    context = build_chat_context(session_id, CHAT_SYSTEM_PROMPT, message)
+    result = generate_response(message, context.system_prompt, context.history)
+    ...
+    schedule_summary_update(session_id, context.unsummarized + 2)
+"""
+import logging
+import os
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from wisentia_backend.db import query_rows, start_db_thread
+from .llm import generate_response
+
+logger = logging.getLogger('wisentia')
+
+# Rol/ayraç gibi mesaj başına sabit ek token
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_LOCK_TIMEOUT = 300
+
+CHAT_SYSTEM_PROMPT = "You are Wisentia AI, an educational assistant. Help users with their educational questions and guide them through their learning journey."
+
+SUMMARY_HEADER = "Summary of the earlier conversation with this learner:"
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a conversation between a learner and Wisentia AI, "
+    "an educational assistant. Merge the new messages into the existing summary. Keep the "
+    "learner's goals, questions, stated background and any answers or facts the assistant "
+    "gave that later turns may refer to. Write plain prose in the conversation's language, "
+    "at most {max_words} words, and output only the summary."
+)
+
+
+class ChatContext(NamedTuple):
+    system_prompt: str
+    history: list       # generate_response / stream_chat_response formatı: [{'content', 'is_from_ai'}]
+    unsummarized: int   # özete katılmamış mesaj sayısı (CHAT_CONTEXT_MAX_MESSAGES ile sınırlı)
+
+
+def estimate_tokens(text):
+    """Karakter sayısından kaba token tahmini (BPE tokenizer'larda ~4 karakter/token)"""
+    if not text:
+        return 0
+    return len(text) // settings.CHAT_CHARS_PER_TOKEN + 1
+
+
+def _summary_key(session_id):
+    return f"{settings.CACHE_KEY_PREFIX}chat_summary_{session_id}"
+
+
+def get_session_summary(session_id):
+    """{'summary': metin, 'through_id': özete katılan son MessageID}"""
+    return cache.get(_summary_key(session_id)) or {'summary': '', 'through_id': 0}
+
+
+def _unsummarized_messages(session_id, through_id):
+    # En yeni mesajlar; oturum ne kadar uzun olursa olsun okunan satır sayısı sabit
+    rows = query_rows("""
+        SELECT TOP (%s) MessageID, SenderType, MessageContent
+        FROM ChatMessages
+        WHERE SessionID = %s AND MessageID > %s
+        ORDER BY MessageID DESC
+    """, [settings.CHAT_CONTEXT_MAX_MESSAGES, session_id, through_id])
+    return rows[::-1]
+
+
+def build_chat_context(session_id, system_prompt, prompt):
+    """
+    Oturumun özeti ve bütçeye sığan son mesajlarıyla bağlamı kurar.
+    Yeni kullanıcı mesajı kaydedilmeden önce çağrılmalıdır (prompt olarak ayrıca gönderilir).
+    """
+    if not session_id:
+        return ChatContext(system_prompt, [], 0)
+
+    state = get_session_summary(session_id)
+    rows = _unsummarized_messages(session_id, state['through_id'])
+    if state['summary']:
+        system_prompt = f"{system_prompt}\n\n{SUMMARY_HEADER}\n{state['summary']}"
+
+    budget = settings.CHAT_CONTEXT_TOKEN_BUDGET - estimate_tokens(system_prompt) - estimate_tokens(prompt)
+    history = []
+    for row in reversed(rows):
+        if not row.MessageContent:
+            continue  # henüz içerik yazılmamış akış mesajı
+        cost = estimate_tokens(row.MessageContent) + MESSAGE_OVERHEAD_TOKENS
+        if cost > budget:
+            break
+        budget -= cost
+        history.append({'content': row.MessageContent or '', 'is_from_ai': row.SenderType == 'ai'})
+    history.reverse()
+    return ChatContext(system_prompt, history, len(rows))
+
+
+def _summary_threshold():
+    return settings.CHAT_CONTEXT_RECENT_MESSAGES + 2 * settings.CHAT_SUMMARY_EVERY_TURNS
+
+
+def _response_text(result):
+    # generate_response sağlayıcıya göre metin ya da dict döndürür
+    if isinstance(result, str):
+        return result
+    if isinstance(result, dict) and result.get('success'):
+        return result.get('content') or result.get('response') or ''
+    return ''
+
+
+def _transcript(rows):
+    max_chars = settings.CHAT_SUMMARY_MAX_TOKENS * settings.CHAT_CHARS_PER_TOKEN
+    return "\n".join(
+        f"{'Assistant' if row.SenderType == 'ai' else 'Learner'}: {(row.MessageContent or '')[:max_chars]}"
+        for row in rows
+    )
+
+
+def update_session_summary(session_id):
+    """En yeni CHAT_CONTEXT_RECENT_MESSAGES dışındaki özetlenmemiş mesajları özete katlar"""
+    state = get_session_summary(session_id)
+    rows = _unsummarized_messages(session_id, state['through_id'])
+    if len(rows) < _summary_threshold():
+        return False
+
+    to_fold = rows[:len(rows) - settings.CHAT_CONTEXT_RECENT_MESSAGES]
+    prompt = (
+        f"Existing summary:\n{state['summary'] or '(none)'}\n\n"
+        f"New messages:\n{_transcript(to_fold)}"
+    )
+    max_words = settings.CHAT_SUMMARY_MAX_TOKENS * 3 // 4
+    result = generate_response(
+        prompt, SUMMARY_SYSTEM_PROMPT.format(max_words=max_words),
+        timeout=settings.CHAT_SUMMARY_TIMEOUT, cache_use_case=None
+    )
+    summary = _response_text(result).strip()
+    if not summary:
+        logger.warning(f"Chat summary could not be generated for session {session_id}")
+        return False
+
+    max_chars = settings.CHAT_SUMMARY_MAX_TOKENS * settings.CHAT_CHARS_PER_TOKEN
+    cache.set(_summary_key(session_id), {
+        'summary': summary[:max_chars],
+        'through_id': to_fold[-1].MessageID,
+    }, settings.CHAT_SUMMARY_TTL)
+    logger.info(f"Chat summary updated for session {session_id} ({len(to_fold)} messages folded)")
+    return True
+
+
+def _update_summary_locked(session_id, lock_key):
+    try:
+        update_session_summary(session_id)
+    except Exception as e:
+        logger.error(f"Chat summary update failed for session {session_id}: {str(e)}", exc_info=True)
+    finally:
+        cache.delete(lock_key)
+
+
+def schedule_summary_update(session_id, unsummarized):
+    """
+    Özete katlanacak kadar mesaj biriktiyse özeti arka planda günceller;
+    yanıt süresine eklenmez. Aynı oturum için tek güncelleme çalışır.
+    """
+    if not session_id or unsummarized < _summary_threshold():
+        return None
+    lock_key = f"chat_summary_lock:{session_id}"
+    if not cache.add(lock_key, os.getpid(), SUMMARY_LOCK_TIMEOUT):
+        return None
+    return start_db_thread(_update_summary_locked, args=(session_id, lock_key))
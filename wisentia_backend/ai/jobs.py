@@ -0,0 +1,294 @@
+"""
+AI üretim işleri (quest/quiz) için veritabanı tabanlı kalıcı iş kuyruğu.
+
+Web worker'ları yalnızca AIJobs tablosuna iş ekler; işler `manage.py run_ai_workers`
+süreçlerinde çalışır. Böylece uzun LLM çağrıları istek sunan süreçlerde thread
+başlatmaz, worker yeniden başlatıldığında iş kaybolmaz ve eşzamanlılık sınırlıdır.
+
+- Kiralama: `UPDATE ... OUTPUT` + `READPAST` ile atomik; aynı işi iki worker alamaz
+- Görünürlük zaman aşımı: kira AI_JOB_LEASE_SECONDS sürer, çalışan iş heartbeat ile uzatır;
+  süresi dolan kira (çöken worker) başka bir worker tarafından yeniden alınır
+- Hata: AI_JOB_MAX_ATTEMPTS denemeye kadar jitter'lı exponential backoff ile yeniden sıraya
+  girer (TransientJobError ya da beklenmeyen hata); PermanentJobError yeniden denenmez
+
+Tablo `manage.py inspect_schema --bootstrap` ile oluşturulur; yoksa enqueue_job None
+döndürür ve çağıran eski (thread içi) yola düşer.
+"""
+import json
+import logging
+import os
+import random
+import socket
+import threading
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils.module_loading import import_string
+
+from wisentia_backend.db import db_task, start_db_thread
+from wisentia_backend.schema import has_table
+
+logger = logging.getLogger('wisentia')
+
+JOBS_TABLE = 'AIJobs'
+
+# İş tipi -> handler(job) yolu; handler'lar view modülünde, import döngüsü olmasın diye yol olarak
+JOB_HANDLERS = {
+    'quest_generation': 'ai.views.run_quest_generation_job',
+    'quiz_generation': 'ai.views.run_quiz_generation_job',
+}
+
+CLAIM_SQL = """
+    WITH next_job AS (
+        SELECT TOP (1) *
+        FROM AIJobs WITH (ROWLOCK, UPDLOCK, READPAST)
+        WHERE ((Status = 'queued' AND AvailableAt <= GETDATE())
+            OR (Status = 'running' AND LeaseExpiresAt < GETDATE() AND Attempts < MaxAttempts)){type_filter}
+        ORDER BY AvailableAt, JobID
+    )
+    UPDATE next_job
+    SET Status = 'running',
+        Attempts = Attempts + 1,
+        LeasedBy = %s,
+        LeaseExpiresAt = DATEADD(second, %s, GETDATE()),
+        HeartbeatAt = GETDATE()
+    OUTPUT INSERTED.JobID, INSERTED.JobType, INSERTED.Payload, INSERTED.ContentID,
+           INSERTED.Attempts, INSERTED.MaxAttempts
+"""
+
+
+class PermanentJobError(Exception):
+    """Yeniden denenmeyecek hata (geçersiz girdi, kalıcı üretim hatası)"""
+
+
+class TransientJobError(Exception):
+    """Deneme hakkı kaldıkça backoff ile yeniden denenecek hata (LLM/ağ/veritabanı)"""
+
+
+class Job(NamedTuple):
+    job_id: int
+    job_type: str
+    payload: dict
+    content_id: Optional[int]  # ilgili AIGeneratedContent kaydı
+    attempts: int
+    max_attempts: int
+
+
+def jobs_enabled():
+    return has_table(JOBS_TABLE)
+
+
+def enqueue_job(job_type, payload, content_id=None, max_attempts=None):
+    """İşi kuyruğa ekler ve JobID döndürür; AIJobs tablosu yoksa None"""
+    if job_type not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+    if not jobs_enabled():
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO AIJobs (JobType, Payload, ContentID, MaxAttempts)
+            VALUES (%s, %s, %s, %s)
+        """, [
+            job_type,
+            json.dumps(payload, default=str),
+            content_id,
+            max_attempts or settings.AI_JOB_MAX_ATTEMPTS,
+        ])
+        cursor.execute("SELECT SCOPE_IDENTITY()")
+        job_id = int(cursor.fetchone()[0])
+    logger.info(f"AI job {job_id} queued ({job_type}, content {content_id})")
+    return job_id
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+
+def claim_job(worker_id, job_types=None):
+    """Sıradaki işi (ya da kirası dolmuş işi) atomik olarak kiralar; yoksa None"""
+    type_filter, params = '', []
+    if job_types:
+        type_filter = f"\n            AND JobType IN ({', '.join(['%s'] * len(job_types))})"
+        params = list(job_types)
+
+    with connection.cursor() as cursor:
+        cursor.execute(CLAIM_SQL.format(type_filter=type_filter),
+                       params + [worker_id, settings.AI_JOB_LEASE_SECONDS])
+        row = cursor.fetchone()
+    if row is None:
+        return None
+
+    job_id, job_type, payload, content_id, attempts, max_attempts = row
+    try:
+        payload = json.loads(payload) if payload else {}
+    except json.JSONDecodeError:
+        payload = {}
+    return Job(job_id, job_type, payload, content_id, attempts, max_attempts)
+
+
+def heartbeat(job, worker_id):
+    """Kirayı uzatır; kira başka worker'a geçtiyse False"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE AIJobs
+            SET LeaseExpiresAt = DATEADD(second, %s, GETDATE()), HeartbeatAt = GETDATE()
+            WHERE JobID = %s AND LeasedBy = %s AND Status = 'running'
+        """, [settings.AI_JOB_LEASE_SECONDS, job.job_id, worker_id])
+        return cursor.rowcount > 0
+
+
+def complete_job(job, worker_id, result=None):
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE AIJobs
+            SET Status = 'succeeded', Result = %s, LastError = NULL, CompletedAt = GETDATE(),
+                LeaseExpiresAt = NULL
+            WHERE JobID = %s AND LeasedBy = %s
+        """, [json.dumps(result, default=str) if result is not None else None, job.job_id, worker_id])
+
+
+def _retry_delay(attempts):
+    # Jitter: art arda başarısız olan işler LLM servisini aynı anda yüklemesin
+    delay = min(settings.AI_JOB_RETRY_BACKOFF * 2 ** (attempts - 1), settings.AI_JOB_RETRY_BACKOFF_MAX)
+    return int(random.uniform(delay / 2, delay))
+
+
+def _mark_content_failed(cursor, content_id, error):
+    if content_id is None:
+        return
+    cursor.execute("""
+        UPDATE AIGeneratedContent
+        SET Content = %s, ApprovalStatus = 'failed'
+        WHERE ContentID = %s AND ApprovalStatus IN ('queued', 'processing')
+    """, [json.dumps({'status': 'failed', 'error': error}), content_id])
+
+
+def fail_job(job, worker_id, error, permanent=False):
+    """Denemesi kalan işi backoff ile yeniden sıraya koyar, yoksa başarısız işaretler"""
+    retry = not permanent and job.attempts < job.max_attempts
+    with connection.cursor() as cursor:
+        if retry:
+            delay = _retry_delay(job.attempts)
+            cursor.execute("""
+                UPDATE AIJobs
+                SET Status = 'queued', LastError = %s, LeasedBy = NULL, LeaseExpiresAt = NULL,
+                    AvailableAt = DATEADD(second, %s, GETDATE())
+                WHERE JobID = %s AND LeasedBy = %s
+            """, [error, delay, job.job_id, worker_id])
+            logger.warning(f"AI job {job.job_id} failed (attempt {job.attempts}/{job.max_attempts}), retrying in {delay}s: {error}")
+        else:
+            cursor.execute("""
+                UPDATE AIJobs
+                SET Status = 'failed', LastError = %s, CompletedAt = GETDATE(), LeaseExpiresAt = NULL
+                WHERE JobID = %s AND LeasedBy = %s
+            """, [error, job.job_id, worker_id])
+            _mark_content_failed(cursor, job.content_id, error)
+            logger.error(f"AI job {job.job_id} failed permanently after {job.attempts} attempt(s): {error}")
+
+
+def expire_jobs():
+    """Son denemesinde kirası dolan (worker'ı ölen) işleri başarısız işaretler"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE AIJobs
+            SET Status = 'failed', LastError = 'Lease expired on final attempt', CompletedAt = GETDATE()
+            OUTPUT INSERTED.JobID, INSERTED.ContentID
+            WHERE Status = 'running' AND LeaseExpiresAt < GETDATE() AND Attempts >= MaxAttempts
+        """)
+        expired = cursor.fetchall()
+        for job_id, content_id in expired:
+            _mark_content_failed(cursor, content_id, 'Generation worker stopped responding')
+            logger.error(f"AI job {job_id} expired on its final attempt")
+    return len(expired)
+
+
+def job_counts():
+    """{iş tipi: {durum: adet}}"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT JobType, Status, COUNT(*) FROM AIJobs GROUP BY JobType, Status")
+        rows = cursor.fetchall()
+    counts = {}
+    for job_type, job_status, count in rows:
+        counts.setdefault(job_type, {})[job_status] = count
+    return counts
+
+
+def latest_jobs_for_content(content_ids):
+    """{ContentID: en son işin durumu} (ör. kuyrukta bekleyen üretimleri ayırt etmek için)"""
+    if not content_ids or not jobs_enabled():
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT JobID, ContentID, Status, Attempts, MaxAttempts, LastError
+            FROM AIJobs
+            WHERE ContentID IN ({', '.join(['%s'] * len(content_ids))})
+            ORDER BY JobID
+        """, list(content_ids))
+        rows = cursor.fetchall()
+    return {
+        content_id: {
+            'jobId': job_id,
+            'status': job_status,
+            'attempts': attempts,
+            'maxAttempts': max_attempts,
+            'lastError': last_error,
+        }
+        for job_id, content_id, job_status, attempts, max_attempts, last_error in rows
+    }
+
+
+def _heartbeat_loop(job, worker_id, stop):
+    while not stop.wait(settings.AI_JOB_HEARTBEAT_SECONDS):
+        if not heartbeat(job, worker_id):
+            logger.warning(f"AI job {job.job_id} lease lost; another worker may pick it up")
+            return
+
+
+def run_job(job, worker_id):
+    """Handler'ı heartbeat eşliğinde çalıştırır ve sonucu kaydeder"""
+    logger.info(f"AI job {job.job_id} started ({job.job_type}, attempt {job.attempts}/{job.max_attempts})")
+    stop = threading.Event()
+    beat = start_db_thread(_heartbeat_loop, args=(job, worker_id, stop))
+    try:
+        handler = import_string(JOB_HANDLERS[job.job_type])
+        result = handler(job)
+    except PermanentJobError as e:
+        fail_job(job, worker_id, str(e), permanent=True)
+    except TransientJobError as e:
+        fail_job(job, worker_id, str(e))
+    except Exception as e:
+        logger.exception(f"AI job {job.job_id} raised an error")
+        fail_job(job, worker_id, str(e))
+    else:
+        complete_job(job, worker_id, result)
+        logger.info(f"AI job {job.job_id} succeeded")
+    finally:
+        stop.set()
+        beat.join()
+
+
+@db_task
+def run_worker(stop_event, job_types=None, drain=False):
+    """Durdurulana kadar (drain=True ise kuyruk boşalana kadar) iş alıp çalıştırır"""
+    worker_id = worker_name()
+    while not stop_event.is_set():
+        close_old_connections()
+        try:
+            job = claim_job(worker_id, job_types)
+        except Exception as e:
+            logger.error(f"AI worker {worker_id} could not claim a job: {str(e)}")
+            stop_event.wait(settings.AI_JOB_POLL_INTERVAL)
+            continue
+
+        if job is None:
+            if drain:
+                return
+            stop_event.wait(settings.AI_JOB_POLL_INTERVAL)
+            continue
+        try:
+            run_job(job, worker_id)
+        except Exception as e:
+            # Sonuç kaydedilemediyse kira dolunca iş yeniden alınır
+            logger.error(f"AI worker {worker_id} could not record job {job.job_id}: {str(e)}")
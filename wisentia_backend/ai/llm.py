@@ -5,7 +5,8 @@ import logging
 from django.conf import settings
 import re
 from .anthropic import generate_with_anthropic, estimate_cost
-import time
+from .llm_cache import cached_completion
+from .llm_limits import llm_post
 import traceback
 
 logger = logging.getLogger(__name__)
@@ -15,10 +16,13 @@ OLLAMA_API_URL = settings.OLLAMA_API_URL
 LLAMA_MODEL = settings.LLAMA_MODEL
 
 # New simplified function to call LLM services with fallbacks
-def call_llm(system_prompt, user_prompt, max_tokens=4000, temperature=0.7, timeout=1800):
+def call_llm(system_prompt, user_prompt, max_tokens=4000, temperature=0.7, timeout=1800,
+             cache_use_case='default', cache_refresh=False):
     """
     Unified function to call available LLM with fallback options.
     Returns a standardized response format for all LLM calls.
+    Successful responses are cached per use case (see ai/llm_cache.py); pass
+    cache_refresh=True to skip a cached answer, e.g. when retrying after a parse failure.
     """
     logger.info("Calling LLM with system prompt and user prompt")
     
@@ -28,7 +32,9 @@ def call_llm(system_prompt, user_prompt, max_tokens=4000, temperature=0.7, timeo
         if anthropic_api_key:
             logger.info("Using Anthropic Claude for generation")
             try:
-                result = generate_with_anthropic(user_prompt, system_prompt)
+                result = generate_with_anthropic(
+                    user_prompt, system_prompt, cache_use_case=cache_use_case, cache_refresh=cache_refresh
+                )
                 if isinstance(result, dict) and result.get('success') is False:
                     logger.warning(f"Claude API error: {result.get('error')}")
                     # Fall through to Ollama if Claude fails
@@ -66,61 +72,49 @@ def call_llm(system_prompt, user_prompt, max_tokens=4000, temperature=0.7, timeo
         data = {
             "model": LLAMA_MODEL,
             "messages": messages,
-            "temperature": temperature,
+            "options": {"temperature": temperature},  # Ollama örnekleme ayarlarını options altında okur
             "stream": False
         }
         
-        # Make API request with retry logic
-        max_retries = 2
-        retry_count = 0
-        retry_delay = 5  # seconds
-        
-        while True:
-            try:
-                # Make API request with specified timeout
-                response = requests.post(
-                    f"{OLLAMA_API_URL}/chat",
-                    json=data,
-                    headers={"Content-Type": "application/json"},
-                    timeout=timeout  # 30 minute timeout for complex generations
-                )
-                break  # If request succeeds, exit the retry loop
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                retry_count += 1
-                if retry_count <= max_retries:
-                    logger.warning(f"Request attempt {retry_count} failed with {str(e)}. Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                    timeout *= 1.5  # Increase timeout for each retry
-                else:
-                    logger.error(f"All {max_retries} retry attempts failed.")
-                    raise  # Re-raise the last exception
-        
-        if response.status_code != 200:
-            logger.error(f"Ollama API error: {response.status_code} - {response.text}")
-            return {
-                'success': False,
-                'error': f"API Error: {response.status_code} - {response.text[:200]}",
-                'content': ''
-            }
-        
-        # Parse response
-        result = response.json()
-        content = result.get('message', {}).get('content', '')
-        
-        if not content:
-            logger.warning("Empty content received from Ollama")
+        def ollama_chat():
+            # Paylaşılan bağlantı havuzu; yeniden deneme (jitter'lı backoff) http_client'ta
+            response = llm_post(
+                'ollama',
+                f"{OLLAMA_API_URL}/chat",
+                json=data,
+                timeout=timeout  # 30 minute timeout for complex generations
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                return {
+                    'success': False,
+                    'error': f"API Error: {response.status_code} - {response.text[:200]}",
+                    'content': ''
+                }
+            
+            # Parse response
+            result = response.json()
+            content = result.get('message', {}).get('content', '')
+            
+            if not content:
+                logger.warning("Empty content received from Ollama")
+                return {
+                    'success': False,
+                    'error': "Empty response from LLM",
+                    'content': ''
+                }
+            
             return {
-                'success': False,
-                'error': "Empty response from LLM",
-                'content': ''
+                'success': True,
+                'content': content,
+                'model': LLAMA_MODEL
             }
         
-        return {
-            'success': True,
-            'content': content,
-            'model': LLAMA_MODEL
-        }
+        return cached_completion(
+            cache_use_case, 'ollama', LLAMA_MODEL, None, messages, temperature, max_tokens,
+            ollama_chat, refresh=cache_refresh
+        )
         
     except Exception as e:
         logger.exception(f"Error calling LLM: {str(e)}")
@@ -130,8 +124,30 @@ def call_llm(system_prompt, user_prompt, max_tokens=4000, temperature=0.7, timeo
             'content': ''
         }
 
-def generate_response(prompt, system_prompt=None, history=None, stream=False, timeout=30):
-    """Llama 3 modeli ile yanıt üretir"""
+def generate_response(prompt, system_prompt=None, history=None, stream=False, timeout=30, cache_use_case='chat',
+                      temperature=None):
+    """
+    Llama 3 modeli ile yanıt üretir.
+    Akış dışı başarılı yanıtlar cache_use_case alanında önbelleğe alınır (None: önbellek yok).
+    temperature verilmezse settings.CHAT_TEMPERATURE Ollama'ya gönderilir.
+    """
+    if temperature is None:
+        temperature = settings.CHAT_TEMPERATURE
+    if stream:
+        return _generate_response(prompt, system_prompt, history, stream, timeout, temperature)
+
+    # Önbellek anahtarı için Ollama'ya gidecek mesaj listesiyle aynı içerik
+    messages = [
+        {"role": "assistant" if h.get('is_from_ai', False) else "user", "content": h.get('content', '')}
+        for h in history or []
+    ]
+    messages.append({"role": "user", "content": prompt})
+    return cached_completion(
+        cache_use_case, 'ollama', LLAMA_MODEL, system_prompt, messages, temperature, None,
+        lambda: _generate_response(prompt, system_prompt, history, stream, timeout, temperature)
+    )
+
+def _generate_response(prompt, system_prompt, history, stream, timeout, temperature):
     try:
         if history is None:
             history = []
@@ -164,44 +180,30 @@ def generate_response(prompt, system_prompt=None, history=None, stream=False, ti
         data = {
             "model": LLAMA_MODEL,
             "messages": messages,
+            "options": {"temperature": temperature},
             "stream": stream
         }
         
         logger.info(f"Ollama API isteği gönderiliyor: {OLLAMA_API_URL}/chat")
         
-        # Retry logic for API request
-        max_retries = 2
-        retry_count = 0
-        retry_delay = 5  # seconds
-        current_timeout = timeout
-        
-        while True:
+        try:
+            # Paylaşılan bağlantı havuzu; yeniden deneme (jitter'lı backoff) http_client'ta
+            response = llm_post(
+                'ollama',
+                f"{OLLAMA_API_URL}/chat",
+                json=data,
+                stream=stream,
+                timeout=timeout
+            )
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            # Antropic Claude ile yedek çözüm dene
+            logger.info(f"Ollama request failed after retries ({str(e)}). Trying Anthropic Claude as fallback...")
             try:
-                # Timeout ayarı ile API isteği
-                response = requests.post(
-                    f"{OLLAMA_API_URL}/chat",
-                    json=data,
-                    headers={"Content-Type": "application/json"},
-                    stream=stream,
-                    timeout=current_timeout  # Dynamic timeout
-                )
-                break  # Success, exit retry loop
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                retry_count += 1
-                if retry_count <= max_retries:
-                    logger.warning(f"Request attempt {retry_count} failed with {str(e)}. Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                    current_timeout *= 1.5  # Increase timeout for retry
-                else:
-                    # Antropic Claude ile yedek çözüm dene
-                    logger.info(f"All {max_retries} retry attempts failed. Trying Anthropic Claude as fallback...")
-                    try:
-                        anthropic_response = generate_with_anthropic(prompt, system_prompt, history, stream)
-                        return anthropic_response
-                    except Exception as anthropic_error:
-                        logger.error(f"Anthropic Claude yedek çözümü de başarısız: {str(anthropic_error)}")
-                        raise e  # Re-raise the original exception if fallback also fails
+                anthropic_response = generate_with_anthropic(prompt, system_prompt, history, stream, cache_use_case=None)
+                return anthropic_response
+            except Exception as anthropic_error:
+                logger.error(f"Anthropic Claude yedek çözümü de başarısız: {str(anthropic_error)}")
+                raise e  # Re-raise the original exception if fallback also fails
         
         if response.status_code != 200:
             logger.error(f"Ollama API hatası: {response.status_code} - {response.text}")
@@ -209,7 +211,7 @@ def generate_response(prompt, system_prompt=None, history=None, stream=False, ti
             # Antropic Claude ile yedek çözüm dene
             try:
                 logger.info("Ollama yanıt vermedi, Antropic Claude ile yeniden deneniyor...")
-                anthropic_response = generate_with_anthropic(prompt, system_prompt, history, stream)
+                anthropic_response = generate_with_anthropic(prompt, system_prompt, history, stream, cache_use_case=None)
                 return anthropic_response
             except Exception as anthropic_error:
                 logger.error(f"Antropic Claude yedek çözümü de başarısız: {str(anthropic_error)}")
@@ -231,18 +233,19 @@ def generate_response(prompt, system_prompt=None, history=None, stream=False, ti
                         'success': True
                     }
             except json.JSONDecodeError:
-                # Stream yanıtını işle
-                full_response = ""
+                # Stream yanıtını işle (parçalar listede toplanır, tek seferde birleştirilir)
+                parts = []
                 for line in response.text.splitlines():
                     if not line.strip():
                         continue
                     try:
                         chunk = json.loads(line)
                         if 'message' in chunk and 'content' in chunk['message']:
-                            full_response += chunk['message']['content']
+                            parts.append(chunk['message']['content'])
                     except json.JSONDecodeError:
                         logger.warning(f"JSON satırı işlenemedi: {line[:100]}")
                         continue
+                full_response = ''.join(parts)
                 
                 if not full_response:
                     logger.warning("Boş yanıt alındı!")
@@ -259,14 +262,15 @@ def generate_response(prompt, system_prompt=None, history=None, stream=False, ti
         else:
             # Streaming için jeneratör döndür
             def generate():
-                full_response = ""
+                # Yanıt çağırana parça parça iletilir; burada yalnızca boş olup olmadığı izlenir
+                produced = False
                 for line in response.iter_lines():
                     if line:
                         try:
                             chunk = json.loads(line)
                             if 'message' in chunk and 'content' in chunk['message']:
                                 content = chunk['message']['content']
-                                full_response += content
+                                produced = produced or bool(content)
                                 yield content
                         except json.JSONDecodeError as e:
                             logger.warning(f"Stream satırı işlenemedi: {line[:100]} - Hata: {e}")
@@ -276,7 +280,7 @@ def generate_response(prompt, system_prompt=None, history=None, stream=False, ti
                             yield "Veri işlenirken bir hata oluştu."
                             break
                 
-                if not full_response:
+                if not produced:
                     yield "Yanıt üretilirken bir sorun oluştu."
             
             return generate()
@@ -288,7 +292,7 @@ def generate_response(prompt, system_prompt=None, history=None, stream=False, ti
         # Antropic Claude ile yedek çözüm dene
         try:
             logger.info("Ollama timeout, Antropic Claude ile yeniden deneniyor...")
-            anthropic_response = generate_with_anthropic(prompt, system_prompt, history, stream)
+            anthropic_response = generate_with_anthropic(prompt, system_prompt, history, stream, cache_use_case=None)
             return anthropic_response
         except Exception as anthropic_error:
             logger.error(f"Antropic Claude yedek çözümü de başarısız: {str(anthropic_error)}")
@@ -310,7 +314,7 @@ def generate_response(prompt, system_prompt=None, history=None, stream=False, ti
         # Antropic Claude ile yedek çözüm dene
         try:
             logger.info("Ollama bağlantı hatası, Antropic Claude ile yeniden deneniyor...")
-            anthropic_response = generate_with_anthropic(prompt, system_prompt, history, stream)
+            anthropic_response = generate_with_anthropic(prompt, system_prompt, history, stream, cache_use_case=None)
             return anthropic_response
         except Exception as anthropic_error:
             logger.error(f"Antropic Claude yedek çözümü de başarısız: {str(anthropic_error)}")
@@ -332,7 +336,7 @@ def generate_response(prompt, system_prompt=None, history=None, stream=False, ti
         # Antropic Claude ile yedek çözüm dene
         try:
             logger.info(f"Ollama hatası: {str(e)}, Antropic Claude ile yeniden deneniyor...")
-            anthropic_response = generate_with_anthropic(prompt, system_prompt, history, stream)
+            anthropic_response = generate_with_anthropic(prompt, system_prompt, history, stream, cache_use_case=None)
             return anthropic_response
         except Exception as anthropic_error:
             logger.error(f"Antropic Claude yedek çözümü de başarısız: {str(anthropic_error)}")
@@ -410,7 +414,7 @@ Use real IDs from the database data provided. Make conditions challenging but ac
 """
         
         # Use existing Anthropic integration
-        result = generate_with_anthropic(user_prompt, system_prompt, timeout=30)
+        result = generate_with_anthropic(user_prompt, system_prompt, timeout=30, cache_use_case='quest')
         
         if not result.get('success'):
             return {
@@ -554,7 +558,7 @@ Use real IDs and names from the database data provided. Make conditions challeng
 """
         
         # Use existing Anthropic integration
-        result = generate_with_anthropic(user_prompt, system_prompt, timeout=30)
+        result = generate_with_anthropic(user_prompt, system_prompt, timeout=30, cache_use_case='quest')
         
         if not result.get('success'):
             return {
@@ -821,7 +825,7 @@ Format the quiz as a JSON object with this structure:
     # Optimize model parameters for faster generation
     try:
         logger.info(f"[AI] Sending LLM API request to {OLLAMA_API_URL}")
-        response = requests.post(f"{OLLAMA_API_URL}/generate", 
+        response = llm_post('ollama', f"{OLLAMA_API_URL}/generate", 
             json={
                 'model': LLAMA_MODEL,
                 'prompt': f"<s>[INST] {system_prompt}\n\n{user_prompt} [/INST]",
@@ -914,8 +918,8 @@ def extract_and_validate_quiz_json(response_text, num_questions, passing_score,
             'raw_response': response_text[:1000]
         }
 
-def generate_quiz_with_anthropic(video_id, video_title, video_content, num_questions=5, difficulty='intermediate', passing_score=70, language='en', target_audience='general', instructional_approach='conceptual'):
-    """Antropic Claude API ile quiz üretir"""
+def generate_quiz_with_anthropic(video_id, video_title, video_content, num_questions=5, difficulty='intermediate', passing_score=70, language='en', target_audience='general', instructional_approach='conceptual', cache_refresh=False):
+    """Antropic Claude API ile quiz üretir (cache_refresh=True: önbellekteki quiz yerine yenisini üretir)"""
     system_prompt = """You are an educational quiz generator. Your task is to create effective, accurate quizzes based on educational content.
 Generate a quiz with questions and answers that accurately test understanding of the provided content.
 Your output should be valid JSON following the exact structure shown in the instructions.
@@ -972,7 +976,9 @@ Respond ONLY with the properly formatted JSON. Do not include explanations.
 
     try:
         # Make API request to Anthropic
-        result = generate_with_anthropic(prompt, system_prompt, max_tokens=4000, temperature=0.7)
+        result = generate_with_anthropic(
+            prompt, system_prompt, max_tokens=4000, temperature=0.7, cache_use_case='quiz', cache_refresh=cache_refresh
+        )
         
         if not result['success']:
             return {
@@ -0,0 +1,163 @@
+"""
+LLM yanıtları için birebir eşleşme önbelleği.
+
+Aynı parametrelerle tekrar üretilen quest/quiz'ler ve sık sorulan sohbet soruları
+Ollama/Claude'a tekrar gitmez. Anahtar; sağlayıcı, model, sistem promptu, mesajlar,
+temperature ve max_tokens'ın normalize edilmiş (boşluklar sadeleştirilmiş) JSON'unun
+SHA-256 özetidir.
+
+- TTL kullanım alanına göre settings.LLM_CACHE_TTL'den okunur ('chat', 'quest', 'quiz', ...)
+- temperature > LLM_CACHE_MAX_TEMPERATURE olan çağrılar önbelleği atlar (çeşitlilik istenmiştir)
+- Yalnızca başarılı yanıtlar saklanır; akış (stream) yanıtları önbelleğe alınmaz
+- Tahliye: invalidate_llm_cache('quest') o alanın tüm kayıtlarını etiket versiyonuyla düşürür
+  (admin: POST /api/admin/llm-cache/invalidate/); quiz/quest üretim isteklerindeki
+  refresh=true tek bir üretim için kaydı atlayıp yenisini yazar
+
+Hit/miss ve tasarruf edilen maliyet (anthropic.estimate_cost) llm_cache_stats'tadır.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from wisentia_backend.utils import get_tag_versions, invalidate_tags
+
+logger = logging.getLogger('wisentia')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class LLMCacheStats:
+    """İşlem (worker) başına kullanım alanı bazlı hit / miss / bypass ve tasarruf sayaçları"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stats = defaultdict(lambda: {
+                'hits': 0,
+                'misses': 0,
+                'bypasses': 0,
+                'stores': 0,
+                'saved_cost': 0.0,
+                'saved_tokens': 0,
+            })
+
+    def record(self, use_case, event, result=None):
+        with self._lock:
+            stats = self._stats[use_case]
+            stats[event] += 1
+            if event == 'hits' and isinstance(result, dict):
+                cost = result.get('cost') or {}
+                usage = result.get('usage') or {}
+                stats['saved_cost'] += cost.get('total_cost', 0) or 0
+                stats['saved_tokens'] += (usage.get('input_tokens', 0) or 0) + (usage.get('output_tokens', 0) or 0)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                use_case: {
+                    'hits': stats['hits'],
+                    'misses': stats['misses'],
+                    'bypasses': stats['bypasses'],
+                    'stores': stats['stores'],
+                    'hitRatio': round(stats['hits'] / (stats['hits'] + stats['misses']) * 100, 2)
+                    if stats['hits'] + stats['misses'] else 0,
+                    'savedCostUsd': round(stats['saved_cost'], 6),
+                    'savedTokens': stats['saved_tokens'],
+                }
+                for use_case, stats in sorted(self._stats.items())
+            }
+
+
+llm_cache_stats = LLMCacheStats()
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return _WHITESPACE_RE.sub(' ', value).strip()
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _tags(use_case):
+    return ['llm', f'llm:{use_case}']
+
+
+def make_cache_key(use_case, provider, model, system_prompt, messages, temperature, max_tokens):
+    payload = json.dumps(_normalize({
+        'provider': provider,
+        'model': model,
+        'system': system_prompt or '',
+        'messages': messages,
+        'temperature': temperature,
+        'max_tokens': max_tokens,
+    }), sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    versions = get_tag_versions(_tags(use_case))
+    version = '.'.join(str(versions[tag]) for tag in _tags(use_case))
+    return f"{settings.CACHE_KEY_PREFIX}llm_{use_case}_{version}_{digest}"
+
+
+def _ttl(use_case):
+    ttls = getattr(settings, 'LLM_CACHE_TTL', {})
+    return ttls.get(use_case, ttls.get('default', 60 * 60))
+
+
+def _is_cacheable(result):
+    if isinstance(result, str):
+        return bool(result.strip())
+    return isinstance(result, dict) and result.get('success') is True and bool(result.get('content') or result.get('response'))
+
+
+def cached_completion(use_case, provider, model, system_prompt, messages, temperature, max_tokens, compute, refresh=False):
+    """
+    Önbellekte varsa kayıtlı yanıtı, yoksa compute() sonucunu döndürür (başarılıysa saklar).
+    use_case None ise önbellek kullanılmaz. refresh=True kaydı okumaz ama yeni yanıtı yazar
+    (ör. ayrıştırılamayan bir yanıtı yeniden denerken).
+    """
+    if use_case is None:
+        return compute()
+    if not getattr(settings, 'LLM_CACHE_ENABLED', True) or (
+        temperature is not None and temperature > settings.LLM_CACHE_MAX_TEMPERATURE
+    ):
+        llm_cache_stats.record(use_case, 'bypasses')
+        return compute()
+
+    try:
+        key = make_cache_key(use_case, provider, model, system_prompt, messages, temperature, max_tokens)
+        cached = None if refresh else cache.get(key)
+    except Exception as e:
+        # Önbellek erişilemezse LLM çağrısı engellenmesin
+        logger.warning(f"LLM cache unavailable: {str(e)}")
+        return compute()
+
+    if cached is not None:
+        llm_cache_stats.record(use_case, 'hits', cached)
+        logger.info(f"LLM cache hit ({use_case}, {provider}/{model})")
+        # 'cached' işareti: çağıran maliyeti yeniden kaydetmesin
+        return {**cached, 'cached': True} if isinstance(cached, dict) else cached
+
+    llm_cache_stats.record(use_case, 'misses')
+    result = compute()
+    if _is_cacheable(result):
+        try:
+            cache.set(key, result, _ttl(use_case))
+            llm_cache_stats.record(use_case, 'stores')
+        except Exception as e:
+            logger.warning(f"LLM response could not be cached: {str(e)}")
+    return result
+
+
+def invalidate_llm_cache(use_case=None):
+    """Kullanım alanının (None ise tümünün) kayıtlı yanıtlarını geçersiz kılar"""
+    invalidate_tags(f'llm:{use_case}' if use_case else 'llm')
@@ -0,0 +1,22 @@
+"""
+Süreç başına eşzamanlı LLM (Ollama / Anthropic) isteği sınırı.
+
+Batch quest üretimi, quiz üretimi ve sohbet aynı sağlayıcıyı paylaşır; en fazla
+LLM_MAX_CONCURRENCY istek aynı anda upstream'de bekler, fazlası sıra bekler.
+Slot yalnızca HTTP isteği boyunca tutulur: önbellek isabetleri ve istekler arası
+işleme (ayrıştırma, veritabanı) sınırı beklemez. Async akışlar (ai/streaming.py)
+LLM_STREAM_MAX_CONNECTIONS ile ayrıca sınırlıdır.
+"""
+import threading
+
+from django.conf import settings
+
+from wisentia_backend import http_client
+
+_slots = threading.BoundedSemaphore(settings.LLM_MAX_CONCURRENCY)
+
+
+def llm_post(upstream, url, **kwargs):
+    """http_client.post; boş slot olana kadar bekler (stream=True'da slot başlıklar gelince bırakılır)"""
+    with _slots:
+        return http_client.post(upstream, url, **kwargs)
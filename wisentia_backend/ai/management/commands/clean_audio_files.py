@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ai.transcriber import AUDIO_DIR, clean_audio_dir
+
+
+class Command(BaseCommand):
+    help = "AUDIO_DIR'de kalmış eski ses dosyalarını siler (cron ile çalıştırılabilir)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age', type=int, default=None,
+                            help='Saniye; bundan eski dosyalar silinir (varsayılan AUDIO_ORPHAN_MAX_AGE)')
+
+    def handle(self, *args, **options):
+        max_age = options['max_age'] if options['max_age'] is not None else settings.AUDIO_ORPHAN_MAX_AGE
+        removed, freed = clean_audio_dir(max_age)
+        self.stdout.write(self.style.SUCCESS(
+            f"{AUDIO_DIR}: {removed} dosya silindi ({freed / 1024 / 1024:.1f} MB), eşik {max_age} sn"
+        ))
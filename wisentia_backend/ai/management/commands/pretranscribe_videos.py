@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from wisentia_backend.schema import has_table
+from ai.transcripts import TRANSCRIPTS_TABLE, get_transcript, transcript_profile
+
+
+class Command(BaseCommand):
+    help = "CourseVideos'taki YouTube videolarını önceden transkripte edip VideoTranscripts'e kaydeder"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, action='append', default=[],
+                            help='Sadece belirtilen kursun videoları (tekrarlanabilir)')
+        parser.add_argument('--limit', type=int, default=None, help='En fazla bu kadar video işle')
+        parser.add_argument('--max-chars', type=int, default=None,
+                            help='Metin bütçesi: uzun videoların sadece gereken bölümlerini işle (ör. kurs quizi için 3000)')
+        parser.add_argument('--refresh', action='store_true',
+                            help='Kayıtlı transcript\'leri yok sayıp yeniden üret')
+
+    def handle(self, *args, **options):
+        if not has_table(TRANSCRIPTS_TABLE):
+            raise CommandError(f"{TRANSCRIPTS_TABLE} tablosu yok: önce 'manage.py inspect_schema --bootstrap' çalıştırın")
+
+        query = """
+            SELECT DISTINCT cv.YouTubeVideoID
+            FROM CourseVideos cv
+            WHERE cv.YouTubeVideoID IS NOT NULL AND cv.YouTubeVideoID <> ''
+        """
+        params = []
+        if options['course']:
+            query += f" AND cv.CourseID IN ({', '.join(['%s'] * len(options['course']))})"
+            params.extend(options['course'])
+        if not options['refresh']:
+            query += """
+            AND NOT EXISTS (
+                SELECT 1 FROM VideoTranscripts vt
+                WHERE vt.YouTubeVideoID = cv.YouTubeVideoID AND vt.ModelName = %s
+            )
+            """
+            params.append(transcript_profile(options['max_chars']))
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            video_ids = [row[0] for row in cursor.fetchall()]
+        if options['limit'] is not None:
+            video_ids = video_ids[:options['limit']]
+
+        self.stdout.write(f"{len(video_ids)} video transkripte edilecek (profil: {transcript_profile(options['max_chars'])})")
+        done = failed = 0
+        for i, youtube_id in enumerate(video_ids, 1):
+            started = time.monotonic()
+            try:
+                transcript = get_transcript(youtube_id, refresh=options['refresh'], max_chars=options['max_chars'])
+            except Exception as e:
+                failed += 1
+                self.stderr.write(self.style.ERROR(f"[{i}/{len(video_ids)}] {youtube_id}: {e}"))
+                continue
+            done += 1
+            self.stdout.write(
+                f"[{i}/{len(video_ids)}] {youtube_id}: {len(transcript)} karakter, {time.monotonic() - started:.1f} sn"
+            )
+
+        style = self.style.SUCCESS if not failed else self.style.WARNING
+        self.stdout.write(style(f"Tamamlandı: {done} başarılı, {failed} hatalı"))
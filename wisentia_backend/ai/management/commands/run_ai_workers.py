@@ -0,0 +1,66 @@
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.jobs import JOB_HANDLERS, expire_jobs, job_counts, jobs_enabled, run_worker
+
+
+class Command(BaseCommand):
+    help = 'AIJobs kuyruğundaki quest/quiz üretim işlerini işleyen worker havuzunu çalıştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help='Eşzamanlı iş sayısı (varsayılan AI_WORKER_CONCURRENCY)')
+        parser.add_argument('--type', dest='types', action='append', choices=sorted(JOB_HANDLERS),
+                            help='Sadece bu iş tipini işle (tekrarlanabilir)')
+        parser.add_argument('--drain', action='store_true', help='Kuyruk boşalınca çık')
+        parser.add_argument('--status', action='store_true', help='İş sayılarını durum bazında göster ve çık')
+
+    def handle(self, *args, **options):
+        if not jobs_enabled():
+            raise CommandError("AIJobs table is missing; run `manage.py inspect_schema --bootstrap` first")
+
+        if options['status']:
+            for job_type, counts in sorted(job_counts().items()):
+                summary = ', '.join(f"{state}: {count}" for state, count in sorted(counts.items()))
+                self.stdout.write(f"  {job_type:<20} {summary}")
+            return
+
+        concurrency = options['concurrency'] or settings.AI_WORKER_CONCURRENCY
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            # Çalışan işler bitirilir, yeni iş alınmaz
+            self.stdout.write(self.style.WARNING('Stopping after running jobs finish...'))
+            stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        workers = [
+            threading.Thread(target=run_worker, args=(stop, options['types'], options['drain']),
+                             name=f'ai-worker-{index}')
+            for index in range(concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(self.style.SUCCESS(
+            f"{concurrency} AI worker(s) started ({', '.join(options['types'] or sorted(JOB_HANDLERS))})"
+        ))
+
+        # Ana thread: son denemesinde kirası dolan işleri periyodik olarak başarısız işaretler
+        next_expiry_check = 0
+        while any(worker.is_alive() for worker in workers):
+            if not stop.is_set() and time.monotonic() >= next_expiry_check:
+                try:
+                    expired = expire_jobs()
+                    if expired:
+                        self.stdout.write(self.style.WARNING(f"{expired} expired job(s) marked as failed"))
+                except Exception as e:
+                    self.stderr.write(f"Expired job check failed: {e}")
+                next_expiry_check = time.monotonic() + settings.AI_JOB_LEASE_SECONDS / 2
+            stop.wait(1)
+        self.stdout.write(self.style.SUCCESS('AI workers stopped'))
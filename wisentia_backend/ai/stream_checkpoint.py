@@ -0,0 +1,116 @@
+"""
+Akışla üretilen AI sohbet mesajlarının parça parça kaydı.
+
+Parçalar listede biriktirilir (uzun yanıtlarda string birleştirme maliyeti O(n)) ve
+CHAT_STREAM_CHECKPOINT_CHARS karakterde ya da CHAT_STREAM_CHECKPOINT_SECONDS saniyede bir
+yalnızca son kayıttan sonraki kısım mesaja eklenir. Mesajın durumu ChatMessages.Status
+kolonundadır: 'streaming' -> 'complete' ya da (istemci koptuysa) 'interrupted'.
+Yeniden bağlanan istemci, kaldığı karakterden (offset) itibaren mesajı okuyabilir.
+
+Status kolonu `manage.py inspect_schema --bootstrap` ile eklenir; yoksa mesaj eskisi
+gibi yalnızca akış tamamlanınca tek seferde kaydedilir.
+"""
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from wisentia_backend.schema import has_column
+
+MESSAGE_STATUS_STREAMING = 'streaming'
+MESSAGE_STATUS_COMPLETE = 'complete'
+MESSAGE_STATUS_INTERRUPTED = 'interrupted'
+
+
+def checkpoints_enabled():
+    return has_column('ChatMessages', 'Status')
+
+
+class StreamCheckpoint:
+    """Bir AI mesajının akış sırasında biriken parçaları ve kayıt durumu"""
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.message_id = None
+        self.length = 0
+        self._chunks = []
+        self._flushed_chunks = 0
+        self._flushed_length = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def content(self):
+        return ''.join(self._chunks)
+
+    def start(self):
+        """Boş 'streaming' mesajını oluşturur; MessageID'yi döndürür (kolon yoksa None)"""
+        if not checkpoints_enabled():
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO ChatMessages
+                (SessionID, SenderType, MessageContent, Timestamp, Status)
+                VALUES (%s, 'ai', '', GETDATE(), %s)
+            """, [self.session_id, MESSAGE_STATUS_STREAMING])
+            cursor.execute("SELECT SCOPE_IDENTITY()")
+            self.message_id = int(cursor.fetchone()[0])
+        return self.message_id
+
+    def append(self, chunk):
+        """Parçayı ekler; checkpoint zamanı geldiyse True döndürür"""
+        self._chunks.append(chunk)
+        self.length += len(chunk)
+        if self.message_id is None:
+            return False
+        return (
+            self.length - self._flushed_length >= settings.CHAT_STREAM_CHECKPOINT_CHARS
+            or time.monotonic() - self._last_flush >= settings.CHAT_STREAM_CHECKPOINT_SECONDS
+        )
+
+    def flush(self, status=None):
+        """Son kayıttan sonraki parçaları mesaja ekler (status verilirse durumu da günceller)"""
+        delta = ''.join(self._chunks[self._flushed_chunks:])
+        with connection.cursor() as cursor:
+            if status:
+                cursor.execute("""
+                    UPDATE ChatMessages
+                    SET MessageContent = MessageContent + %s, Status = %s
+                    WHERE MessageID = %s
+                """, [delta, status, self.message_id])
+            elif delta:
+                cursor.execute("""
+                    UPDATE ChatMessages
+                    SET MessageContent = MessageContent + %s
+                    WHERE MessageID = %s
+                """, [delta, self.message_id])
+        self._flushed_chunks = len(self._chunks)
+        self._flushed_length = self.length
+        self._last_flush = time.monotonic()
+
+    def finish(self, status):
+        """Akış bittiğinde ya da kesildiğinde kalan parçaları ve son durumu kaydeder"""
+        if self.message_id is not None:
+            self.flush(status)
+        elif status == MESSAGE_STATUS_COMPLETE:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO ChatMessages
+                    (SessionID, SenderType, MessageContent, Timestamp)
+                    VALUES (%s, 'ai', %s, GETDATE())
+                """, [self.session_id, self.content])
+
+
+def read_stream_message(message_id, user_id):
+    """Kullanıcının oturumundaki AI mesajı için (içerik, durum); yoksa None"""
+    if not checkpoints_enabled():
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT cm.MessageContent, cm.Status
+            FROM ChatMessages cm
+            JOIN ChatSessions cs ON cs.SessionID = cm.SessionID
+            WHERE cm.MessageID = %s AND cs.UserID = %s AND cm.SenderType = 'ai'
+        """, [message_id, user_id])
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return row[0] or '', row[1]
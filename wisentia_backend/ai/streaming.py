@@ -0,0 +1,119 @@
+"""
+Async LLM streaming (Ollama, Anthropic yedeği).
+
+ASGI altında sohbet akışları event loop üzerinde çalışır; her açık akış bir
+worker thread'i değil yalnızca bir socket tutar. İstemci bağlantıyı kapatınca
+görev iptal edilir ve `async with http_client.astream(...)` upstream isteği de kapatır.
+"""
+import json
+import logging
+
+import httpx
+from django.conf import settings
+
+from wisentia_backend import http_client
+from .anthropic import ANTHROPIC_MESSAGES_URL, CLAUDE_MODEL
+
+logger = logging.getLogger(__name__)
+
+
+class LLMStreamError(Exception):
+    """Upstream LLM akışı başlatılamadı"""
+
+
+def _stream_timeout():
+    # Akışlarda okuma zaman aşımı parçalar arası bekleme süresidir
+    return httpx.Timeout(settings.LLM_STREAM_READ_TIMEOUT, connect=settings.LLM_STREAM_CONNECT_TIMEOUT)
+
+
+def build_messages(prompt, history=None):
+    """generate_response ile aynı mesaj formatı (history: [{'content', 'is_from_ai'}])"""
+    messages = [
+        {"role": "assistant" if h.get('is_from_ai', False) else "user", "content": h.get('content', '')}
+        for h in history or []
+    ]
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+async def stream_ollama(messages, system_prompt=None):
+    """Ollama /chat akışından metin parçalarını üretir"""
+    if system_prompt:
+        messages = [{"role": "system", "content": system_prompt}] + messages
+
+    data = {"model": settings.LLAMA_MODEL, "messages": messages, "options": {"temperature": settings.CHAT_TEMPERATURE},
+            "stream": True}
+    async with http_client.astream('ollama', 'POST', f"{settings.OLLAMA_API_URL}/chat",
+                                   json=data, timeout=_stream_timeout()) as response:
+        if response.status_code != 200:
+            body = await response.aread()
+            raise LLMStreamError(f"Ollama API error: {response.status_code} - {body[:200]!r}")
+
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            try:
+                chunk = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Stream satırı işlenemedi: {line[:100]} - Hata: {e}")
+                continue
+            content = chunk.get('message', {}).get('content')
+            if content:
+                yield content
+            if chunk.get('done'):
+                break
+
+
+async def stream_anthropic(messages, system_prompt=None):
+    """Anthropic Messages API SSE akışından metin parçalarını üretir"""
+    api_key = settings.ANTHROPIC_API_KEY
+    if not api_key:
+        raise LLMStreamError("ANTHROPIC_API_KEY is not set")
+
+    data = {"model": CLAUDE_MODEL, "messages": messages, "max_tokens": 4000, "temperature": 0.2, "stream": True}
+    if system_prompt:
+        data["system"] = system_prompt
+    headers = {"x-api-key": api_key, "anthropic-version": "2023-06-01"}
+
+    async with http_client.astream('anthropic', 'POST', ANTHROPIC_MESSAGES_URL,
+                                   json=data, headers=headers, timeout=_stream_timeout()) as response:
+        if response.status_code != 200:
+            body = await response.aread()
+            raise LLMStreamError(f"Claude API error: {response.status_code} - {body[:200]!r}")
+
+        async for line in response.aiter_lines():
+            if not line.startswith('data: '):
+                continue
+            try:
+                chunk = json.loads(line[6:])
+            except json.JSONDecodeError:
+                continue
+            if chunk.get('type') == 'content_block_delta' and chunk.get('delta', {}).get('text'):
+                yield chunk['delta']['text']
+            elif chunk.get('type') == 'message_stop':
+                break
+
+
+async def stream_chat_response(prompt, system_prompt=None, history=None):
+    """
+    Önce Ollama, ilk parça gelmeden hata olursa Anthropic ile akış üretir.
+    Akış ortasında kopan bağlantıda yedeğe geçilmez (istemci yarım yanıtı görmüştür).
+    """
+    messages = build_messages(prompt, history)
+    produced = False
+
+    for name, backend in (('ollama', stream_ollama), ('anthropic', stream_anthropic)):
+        try:
+            async for chunk in backend(messages, system_prompt):
+                produced = True
+                yield chunk
+            break
+        except (httpx.HTTPError, LLMStreamError) as e:
+            if produced:
+                logger.error(f"{name} stream interrupted: {e}")
+                yield "Veri işlenirken bir hata oluştu."
+                return
+            logger.warning(f"{name} stream failed before first chunk: {e}")
+
+    if not produced:
+        yield "AI servisine bağlanılamıyor. Lütfen daha sonra tekrar deneyin."
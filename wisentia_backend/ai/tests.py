@@ -1,3 +1,53 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import AsyncClient, Client, SimpleTestCase
+
+from users.auth import AuthenticatedUser
+from users.throttling import CustomUserRateThrottle
+
+
+class AsyncChatViewTests(SimpleTestCase):
+    """
+    Async SSE view'ları ASGI (AsyncClient) ve WSGI (Client) üzerinden çağrılır.
+    Django 4.2'de sync dekoratörle sarılan async view HttpResponse yerine coroutine döndürür.
+    """
+    stream_url = '/api/ai/chat/message/stream/'
+    resume_url = '/api/ai/chat/messages/1/stream/'
+
+    async def test_resume_requires_authentication_over_asgi(self):
+        response = await AsyncClient().get(self.resume_url, {'offset': 0})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_resume_rejects_other_methods_over_asgi(self):
+        response = await AsyncClient().post(self.resume_url)
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Allow'], 'GET, HEAD')
+
+    async def test_resume_rejects_invalid_offset_over_asgi(self):
+        user = AuthenticatedUser(1, 'learner', 'learner@example.com', 'regular', True, True)
+        with mock.patch('ai.async_views._authenticate', return_value=(user, None)), \
+                mock.patch.object(CustomUserRateThrottle, 'allow_request', return_value=True):
+            response = await AsyncClient().get(self.resume_url, {'offset': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_resume_over_wsgi(self):
+        response = Client().get(self.resume_url)
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_rejects_get_over_asgi(self):
+        response = await AsyncClient().get(self.stream_url)
+        self.assertEqual(response.status_code, 405)
+
+    async def test_stream_requires_authentication_without_csrf_token(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+        response = await client.post(self.stream_url, {'message': 'hi'}, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_throttled_request_gets_retry_after(self):
+        user = AuthenticatedUser(1, 'learner', 'learner@example.com', 'regular', True, True)
+        with mock.patch('ai.async_views._authenticate', return_value=(user, None)), \
+                mock.patch.object(CustomUserRateThrottle, 'allow_request', return_value=False), \
+                mock.patch.object(CustomUserRateThrottle, 'wait', return_value=12.4):
+            response = await AsyncClient().post(self.stream_url, {'message': 'hi'}, content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '13')
@@ -1,13 +1,34 @@
+import glob
+import logging
+import multiprocessing
 import os
-import whisper
-import yt_dlp
+import subprocess
+import threading
+import time
 import uuid
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from wisentia_backend.lazy import lazy_import
+
+# torch/whisper ve yt_dlp ilk transkripsiyonda import edilir
+whisper = lazy_import('whisper')
+yt_dlp = lazy_import('yt_dlp')
+np = lazy_import('numpy')
 warnings.filterwarnings("ignore", category=UserWarning, message="FP16 is not supported on CPU*")
 
+logger = logging.getLogger('wisentia')
+
 AUDIO_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "audio")
 os.makedirs(AUDIO_DIR, exist_ok=True)
 
+# Whisper'ın beklediği ses formatı: 16 kHz mono; bellekte int16 PCM (saniyede 32 KB) tutulur
+SAMPLE_RATE = 16000
+PCM_BYTES_PER_SECOND = SAMPLE_RATE * 2
+
 def download_audio(video_url):
     """Ses dosyasını audio klasörüne kaydet (.webm)"""
     filename = f"audio_{uuid.uuid4()}.webm"
@@ -27,11 +48,337 @@ def download_audio(video_url):
     except Exception as e:
         raise Exception(f"Ses indirilemedi: {str(e)}")
 
-def transcribe_audio(audio_path):
-    """Whisper ile ses transkripti üretir"""
+
+def plan_audio_windows(duration, max_seconds, windows=1, min_window_seconds=60):
+    """
+    Süre bütçesi için indirilecek (başlangıç, bitiş) aralıkları. Video bütçeden kısaysa
+    None (tamamı indirilir). Uzun videolarda bütçe, videoya eşit aralıklarla yayılan
+    `windows` parçaya bölünür (parça en az min_window_seconds).
+    """
+    if not max_seconds or not duration or duration <= max_seconds:
+        return None
+    count = max(1, min(windows, int(max_seconds // min_window_seconds)))
+    length = max_seconds / count
+    stride = duration / count
+    return [(round(stride * i, 1), round(stride * i + length, 1)) for i in range(count)]
+
+
+def _section_start(path):
+    try:
+        return float(path.rsplit('_', 1)[1].rsplit('.', 1)[0])
+    except (IndexError, ValueError):
+        return 0.0
+
+
+def download_audio_windows(video_url, max_seconds=None, windows=1):
+    """
+    Sesi indirir; max_seconds verilirse sadece plan_audio_windows'un seçtiği bölümleri
+    (yt-dlp section download, ffmpeg gerekir). Dönüş: zamana göre sıralı dosya yolları.
+    """
+    prefix = os.path.join(AUDIO_DIR, f"audio_{uuid.uuid4()}")
+    ydl_opts = {
+        'format': 'bestaudio/best',
+        'outtmpl': f"{prefix}_%(section_start)s.%(ext)s",
+        'quiet': True,
+        'noplaylist': True,
+    }
+
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            # Süre için önce sadece bilgi alınır; aynı bilgiyle indirme yapılır (ikinci istek yok)
+            info = ydl.extract_info(video_url, download=False)
+            ranges = plan_audio_windows(info.get('duration'), max_seconds, windows)
+            if ranges:
+                logger.info(f"[AI] {info.get('duration')} sn videodan {len(ranges)} bölüm indiriliyor: {ranges}")
+                ydl.params['download_ranges'] = yt_dlp.utils.download_range_func(None, ranges)
+            ydl.process_ie_result(info, download=True)
+    except Exception as e:
+        remove_audio_files(glob.glob(f"{glob.escape(prefix)}_*"))
+        raise Exception(f"Ses indirilemedi: {str(e)}")
+
+    paths = [path for path in glob.glob(f"{glob.escape(prefix)}_*") if not path.endswith('.part')]
+    if not paths:
+        raise Exception("Ses indirilemedi: dosya oluşmadı")
+    return sorted(paths, key=_section_start)
+
+
+def remove_audio_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _ffmpeg_pcm(stream_url, headers=None, start=None, end=None):
+    """ffmpeg ile akışı (istenirse sadece [start, end) bölümünü) 16 kHz mono int16 PCM'e çevirir"""
+    cmd = [settings.FFMPEG_BINARY, '-nostdin', '-loglevel', 'error']
+    if headers:
+        cmd += ['-headers', ''.join(f"{key}: {value}\r\n" for key, value in headers.items())]
+    if start is not None:
+        # -i'den önce -ss: HTTP range ile doğrudan bölüme atlanır
+        cmd += ['-ss', str(start), '-t', str(end - start)]
+    cmd += ['-i', stream_url, '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(SAMPLE_RATE), '-']
+    try:
+        result = subprocess.run(cmd, capture_output=True, check=True, timeout=settings.WHISPER_TASK_TIMEOUT)
+    except subprocess.CalledProcessError as e:
+        raise Exception(f"ffmpeg hatası: {e.stderr.decode(errors='replace')[-500:]}")
+    return result.stdout
+
+
+def fetch_audio(video_url, max_seconds=None, windows=1):
+    """
+    Sesi transkripsiyon için hazırlar. Varsayılan akış modu diske yazmaz: yt-dlp ses
+    akışının adresini çözer, ffmpeg akışı (bütçe varsa sadece seçilen bölümleri) okuyup
+    bellekte PCM'e çevirir. Ses AUDIO_STREAM_MAX_MB'a sığmıyorsa, süre bilinmiyorsa ya da
+    akış başarısız olursa dosyaya indirilir (download_audio_windows).
+
+    Dönüş: (kaynaklar, silinecek dosyalar); kaynak PCM bytes ya da dosya yoludur.
+    """
+    if settings.AUDIO_STREAMING:
+        try:
+            with yt_dlp.YoutubeDL({'format': 'bestaudio/best', 'quiet': True, 'noplaylist': True}) as ydl:
+                info = ydl.extract_info(video_url, download=False)
+            duration = info.get('duration')
+            ranges = plan_audio_windows(duration, max_seconds, windows)
+            seconds = sum(end - start for start, end in ranges) if ranges else duration
+            if seconds and seconds * PCM_BYTES_PER_SECOND <= settings.AUDIO_STREAM_MAX_MB * 1024 * 1024:
+                headers = info.get('http_headers')
+                if ranges:
+                    logger.info(f"[AI] {duration} sn videodan {len(ranges)} bölüm akıştan okunuyor: {ranges}")
+                    return [_ffmpeg_pcm(info['url'], headers, start, end) for start, end in ranges], []
+                return [_ffmpeg_pcm(info['url'], headers)], []
+            logger.info(f"[AI] Ses belleğe sığmıyor ya da süre bilinmiyor ({duration} sn), dosyaya indiriliyor")
+        except Exception as e:
+            logger.warning(f"[AI] Ses akışı başarısız, dosyaya indiriliyor: {str(e)}")
+
+    paths = download_audio_windows(video_url, max_seconds, windows)
+    return paths, paths
+
+
+def clean_audio_dir(max_age_seconds=None):
+    """
+    AUDIO_DIR'de kalmış eski ses dosyalarını siler (kill edilen worker, çöken indirme).
+    Devam eden işlerin dosyalarına dokunmamak için sadece max_age_seconds'tan eski olanlar.
+    Dönüş: (silinen dosya sayısı, boşalan byte)
+    """
+    if max_age_seconds is None:
+        max_age_seconds = settings.AUDIO_ORPHAN_MAX_AGE
+    cutoff = time.time() - max_age_seconds
+    removed = freed = 0
+    with os.scandir(AUDIO_DIR) as entries:
+        for entry in entries:
+            if not entry.name.startswith('audio_') or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+                if stat.st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+                    freed += stat.st_size
+            except OSError:
+                continue
+    if removed:
+        logger.info(f"[AI] {removed} eski ses dosyası silindi ({freed / 1024 / 1024:.1f} MB)")
+    return removed, freed
+
+
+# --- Pool worker süreci (Django'ya dokunmaz) ---
+
+_worker_model = None
+_worker_device = None
+
+
+def _rss_mb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _init_worker(model_name, device, num_threads=None):
+    """Her pool süreci modeli bir kez yükler (num_threads: CPU'da süreç başına torch thread'i)"""
+    global _worker_model, _worker_device
+    _worker_device = device
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+    _worker_model = whisper.load_model(model_name, device=device)
+
+
+def _audio_input(source):
+    # Bellekteki int16 PCM -> Whisper'ın beklediği float32 [-1, 1] dizi; dosya yolu olduğu gibi
+    if isinstance(source, (bytes, bytearray)):
+        return np.frombuffer(source, np.int16).astype(np.float32) / 32768.0
+    return source
+
+
+def _transcribe_in_worker(audio_sources, max_chars=None):
+    """Bölümleri sırayla transkripte eder; metin bütçesi dolunca kalanları atlar"""
+    texts = []
+    total = 0
+    for source in audio_sources:
+        text = _worker_model.transcribe(_audio_input(source), fp16=_worker_device != 'cpu')["text"].strip()
+        texts.append(text)
+        total += len(text)
+        if max_chars and total >= max_chars:
+            break
+    return " ".join(texts), _rss_mb()
+
+
+class TranscriptionService:
+    """
+    Whisper modelini süreç başına bir kez yükleyen sınırlı process pool.
+
+    - submit(audio_path) -> Future[str]; transcribe(audio_path) sonucu bekler.
+      audio_path dosya yolu, PCM bytes ya da bunların listesi (bölümler) olabilir;
+      max_chars ile metin bütçesi verilir
+    - Her worker max_tasks_per_child işten sonra yenilenir
+    - Bir worker işten sonra max_rss_mb'ı aşarsa pool yenilenir (eski pool
+      elindeki işleri bitirip kapanır)
+    """
+    def __init__(self, model_name='base', device='cpu', max_workers=1,
+                 max_tasks_per_child=None, max_rss_mb=None):
+        self.model_name = model_name
+        self.device = device
+        self.max_workers = max_workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.max_rss_mb = max_rss_mb
+        self._lock = threading.Lock()
+        self._executor = None
+        self.recycled = 0
+
+    def _new_executor(self):
+        # fork yerine spawn: CUDA ve ana süreçteki thread'ler (log listener vb.) fork ile güvenli değil
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.model_name, self.device, self._threads_per_worker()),
+            max_tasks_per_child=self.max_tasks_per_child,
+        )
+
+    def _threads_per_worker(self):
+        # Birden çok CPU worker'ı her biri tüm çekirdekleri kullanmaya çalışırsa birbirini yavaşlatır
+        if self.device != 'cpu' or self.max_workers <= 1:
+            return None
+        return max(1, (os.cpu_count() or 1) // self.max_workers)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+            return self._executor
+
+    def recycle(self, executor=None):
+        """Pool'u yenisiyle değiştirir; executor verilirse yalnızca hâlâ güncelse"""
+        with self._lock:
+            old = self._executor
+            if old is None or (executor is not None and old is not executor):
+                return
+            self._executor = None
+            self.recycled += 1
+        old.shutdown(wait=False)
+
+    def submit(self, audio_path, max_chars=None):
+        audio_sources = [audio_path] if isinstance(audio_path, (str, bytes)) else list(audio_path)
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_transcribe_in_worker, audio_sources, max_chars)
+        except (BrokenProcessPool, RuntimeError):
+            # Worker çöktü (ör. OOM) ya da pool kapatıldı: yeni pool ile tekrar dene
+            self.recycle(executor)
+            executor = self._get_executor()
+            future = executor.submit(_transcribe_in_worker, audio_sources, max_chars)
+        return _TranscriptFuture(future, self, executor)
+
+    def transcribe(self, audio_path, max_chars=None, timeout=None):
+        return self.submit(audio_path, max_chars).result(timeout=timeout)
+
+    def _check_memory(self, rss_mb, executor):
+        if self.max_rss_mb and rss_mb > self.max_rss_mb:
+            logger.warning(f"Whisper worker RSS {rss_mb:.0f} MB > {self.max_rss_mb} MB, recycling pool")
+            self.recycle(executor)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+class _TranscriptFuture:
+    """Worker'ın (metin, rss) sonucunu metne indirger, bellek sınırını kontrol eder"""
+    def __init__(self, future, service, executor):
+        self._future = future
+        self._service = service
+        self._executor = executor
+
+    def result(self, timeout=None):
+        try:
+            text, rss_mb = self._future.result(timeout=timeout)
+        except BrokenProcessPool:
+            self._service.recycle(self._executor)
+            raise
+        self._service._check_memory(rss_mb, self._executor)
+        return text
+
+    def done(self):
+        return self._future.done()
+
+    def cancel(self):
+        return self._future.cancel()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def default_pool_size():
+    """
+    WHISPER_POOL_SIZE=0 (otomatik) için worker sayısı: çekirdeklerin yarısı, fiziksel belleğin
+    yarısına WHISPER_WORKER_MAX_RSS_MB'lık kaç worker sığdığı ve TRANSCRIBE_PIPELINE_MAX_VIDEOS'un
+    en küçüğü (en az 1)
+    """
+    limits = [max(1, (os.cpu_count() or 2) // 2), settings.TRANSCRIBE_PIPELINE_MAX_VIDEOS]
+    if settings.WHISPER_WORKER_MAX_RSS_MB:
+        try:
+            total_mb = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 * 1024)
+            limits.append(int(total_mb / 2 // settings.WHISPER_WORKER_MAX_RSS_MB))
+        except (AttributeError, ValueError, OSError):
+            pass
+    return max(1, min(limits))
+
+
+def get_transcription_service():
+    """settings.WHISPER_* ile yapılandırılmış, süreç genelinde tek servis"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            try:
+                clean_audio_dir()
+            except OSError as e:
+                logger.warning(f"[AI] Ses klasörü temizlenemedi: {str(e)}")
+            _service = TranscriptionService(
+                model_name=settings.WHISPER_MODEL,
+                device=settings.WHISPER_DEVICE,
+                max_workers=settings.WHISPER_POOL_SIZE or default_pool_size(),
+                max_tasks_per_child=settings.WHISPER_MAX_TASKS_PER_CHILD or None,
+                max_rss_mb=settings.WHISPER_WORKER_MAX_RSS_MB or None,
+            )
+        return _service
+
+
+def transcribe_audio(audio_path, max_chars=None):
+    """Whisper ile ses transkripti üretir (audio_path: dosya, PCM bytes ya da bölüm listesi)"""
     try:
-        model = whisper.load_model("base")
-        result = model.transcribe(audio_path)
-        return result["text"]
+        return get_transcription_service().transcribe(
+            audio_path, max_chars=max_chars, timeout=settings.WHISPER_TASK_TIMEOUT
+        )
     except Exception as e:
         raise Exception(f"Transcript oluşturulamadı: {str(e)}")
@@ -0,0 +1,275 @@
+"""
+YouTube videoları için kalıcı transcript deposu.
+
+Transcript'ler VideoTranscripts tablosunda (YouTube ID, Whisper modeli) anahtarıyla
+saklanır; aynı video için quiz/quest yeniden üretildiğinde indirme ve transkripsiyon
+tekrarlanmaz. Tablo `manage.py inspect_schema --bootstrap` ile oluşturulur, yoksa
+depo devre dışıdır (her çağrı transkripsiyon yapar).
+
+Single-flight: aynı video için eşzamanlı istekler tek bir işte birleşir.
+- Süreç içinde: bekleyen Future paylaşılır
+- Süreçler arası: cache.add kilidi; kilidi alamayan, sonucun tabloya yazılmasını bekler
+
+transcribe_videos birden çok videoyu boru hattı şeklinde işler: indirmeler thread'lerde
+(TRANSCRIBE_DOWNLOAD_CONCURRENCY ile sınırlı), transkripsiyon Whisper process pool'unda.
+Bir videonun indirmesi, öncekinin transkripsiyonuyla eşzamanlı ilerler.
+
+max_chars (metin bütçesi) verilirse uzun videoların yalnızca bütçeye yetecek kadar
+sesi indirilir (TRANSCRIPT_CHARS_PER_SECOND ile süreye çevrilir, videoya yayılmış
+TRANSCRIPT_SAMPLE_WINDOWS bölüm). Bu transcript'ler ayrı bir profil adıyla saklanır.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+
+from wisentia_backend.schema import has_table
+from .transcriber import fetch_audio, remove_audio_files, transcribe_audio
+
+logger = logging.getLogger('wisentia')
+
+TRANSCRIPTS_TABLE = 'VideoTranscripts'
+
+_YOUTUBE_ID_RE = re.compile(r'(?:v=|youtu\.be/|/embed/|/shorts/|/live/)([A-Za-z0-9_-]{11})')
+
+_inflight = {}  # (youtube_id, model) -> Future
+_inflight_lock = threading.Lock()
+_download_slots = None
+
+
+def extract_youtube_id(video_url):
+    """YouTube URL'sinden 11 karakterlik video ID'sini çıkarır; bulunamazsa None"""
+    if not video_url:
+        return None
+    match = _YOUTUBE_ID_RE.search(video_url)
+    return match.group(1) if match else None
+
+
+def youtube_url(youtube_id):
+    return f"https://www.youtube.com/watch?v={youtube_id}"
+
+
+def _store_enabled():
+    return has_table(TRANSCRIPTS_TABLE)
+
+
+def transcript_profile(max_chars=None):
+    """Depo anahtarındaki ModelName: Whisper modeli (+ bütçeli transcript'lerde bütçe)"""
+    if not max_chars:
+        return settings.WHISPER_MODEL
+    return f"{settings.WHISPER_MODEL}:{max_chars}c{settings.TRANSCRIPT_SAMPLE_WINDOWS}w"
+
+
+def get_cached_transcript(youtube_id, model_name=None):
+    """Profil için kayıtlı transcript; bütçeli profilde tam transcript de kabul edilir"""
+    if not _store_enabled():
+        return None
+    model_name = model_name or settings.WHISPER_MODEL
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT TOP 1 Transcript FROM VideoTranscripts
+            WHERE YouTubeVideoID = %s AND ModelName IN (%s, %s)
+            ORDER BY CASE WHEN ModelName = %s THEN 0 ELSE 1 END
+        """, [youtube_id, model_name, settings.WHISPER_MODEL, model_name])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _save_transcript(youtube_id, model_name, transcript, seconds):
+    if not _store_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            IF NOT EXISTS (
+                SELECT 1 FROM VideoTranscripts WHERE YouTubeVideoID = %s AND ModelName = %s
+            )
+            INSERT INTO VideoTranscripts (YouTubeVideoID, ModelName, Transcript, ProcessingSeconds, CreationDate)
+            VALUES (%s, %s, %s, %s, GETDATE())
+        """, [youtube_id, model_name, youtube_id, model_name, transcript, seconds])
+
+
+def _notify(on_stage, stage):
+    if on_stage is not None:
+        on_stage(stage)
+
+
+def _get_download_slots():
+    # Süreç genelinde eşzamanlı indirme sınırı (settings import sırasında okunmasın diye tembel)
+    global _download_slots
+    with _inflight_lock:
+        if _download_slots is None:
+            _download_slots = threading.BoundedSemaphore(settings.TRANSCRIBE_DOWNLOAD_CONCURRENCY)
+    return _download_slots
+
+
+def _transcribe_video(youtube_id, video_url, on_stage=None, max_chars=None):
+    started = time.monotonic()
+    max_seconds = max_chars / settings.TRANSCRIPT_CHARS_PER_SECOND if max_chars else None
+    _notify(on_stage, 'downloading')
+    with _get_download_slots():
+        logger.info(f"[AI] Video indiriliyor: {video_url}")
+        audio_sources, spilled_paths = fetch_audio(video_url, max_seconds, settings.TRANSCRIPT_SAMPLE_WINDOWS)
+    try:
+        _notify(on_stage, 'transcribing')
+        logger.info(f"[AI] Transkript başlatılıyor: {len(audio_sources)} bölüm ({'dosya' if spilled_paths else 'bellek'})")
+        transcript = transcribe_audio(audio_sources, max_chars=max_chars)
+    finally:
+        if spilled_paths:
+            remove_audio_files(spilled_paths)
+            logger.info(f"[AI] Geçici ses dosyaları silindi: {len(spilled_paths)}")
+    return transcript, time.monotonic() - started
+
+
+def _wait_for_other_worker(youtube_id, model_name, lock_key):
+    """Kilit başka süreçteyse sonucu bekler; kilit bırakılıp sonuç yoksa None"""
+    deadline = time.monotonic() + settings.TRANSCRIPT_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(2)
+        transcript = get_cached_transcript(youtube_id, model_name)
+        if transcript is not None:
+            return transcript
+        if cache.get(lock_key) is None:
+            return None
+    return None
+
+
+def _produce(youtube_id, video_url, model_name, on_stage=None, max_chars=None):
+    transcript = get_cached_transcript(youtube_id, model_name)
+    if transcript is not None:
+        _notify(on_stage, 'cached')
+        return transcript
+
+    lock_key = f"transcript_lock:{model_name}:{youtube_id}"
+    lock_acquired = cache.add(lock_key, os.getpid(), settings.TRANSCRIPT_LOCK_TIMEOUT)
+    if not lock_acquired:
+        logger.info(f"[AI] Transcript başka bir worker'da üretiliyor, bekleniyor: {youtube_id}")
+        _notify(on_stage, 'waiting')
+        transcript = _wait_for_other_worker(youtube_id, model_name, lock_key)
+        if transcript is not None:
+            return transcript
+
+    try:
+        transcript, seconds = _transcribe_video(youtube_id, video_url or youtube_url(youtube_id), on_stage, max_chars)
+        _save_transcript(youtube_id, model_name, transcript, seconds)
+        logger.info(f"[AI] Transcript kaydedildi: {youtube_id} ({seconds:.1f} sn)")
+        return transcript
+    finally:
+        if lock_acquired:
+            cache.delete(lock_key)
+
+
+def get_transcript(youtube_id, video_url=None, refresh=False, on_stage=None, max_chars=None):
+    """
+    Videonun transcript'ini depodan döndürür, yoksa indirip transkripte eder ve kaydeder.
+    refresh=True kayıtlı transcript'i yok sayar ve yeniden üretir.
+    on_stage: aşama değiştikçe çağrılır ('cached', 'waiting', 'downloading', 'transcribing')
+    max_chars: metin bütçesi; uzun videolarda sadece gereken ses bölümleri işlenir
+    """
+    model_name = transcript_profile(max_chars)
+    if refresh:
+        delete_transcript(youtube_id, model_name)
+
+    key = (youtube_id, model_name)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+
+    if not leader:
+        _notify(on_stage, 'waiting')
+        return future.result()
+
+    try:
+        future.set_result(_produce(youtube_id, video_url, model_name, on_stage, max_chars))
+    except Exception as e:
+        future.set_exception(e)
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+    return future.result()
+
+
+def delete_transcript(youtube_id, model_name=None):
+    if not _store_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            DELETE FROM VideoTranscripts WHERE YouTubeVideoID = %s AND ModelName = %s
+        """, [youtube_id, model_name or settings.WHISPER_MODEL])
+
+
+def transcribe_url(video_url):
+    """URL YouTube ise depoyu kullanır, değilse doğrudan transkripte eder"""
+    youtube_id = extract_youtube_id(video_url)
+    if youtube_id:
+        return get_transcript(youtube_id, video_url)
+    return _transcribe_video(None, video_url)[0]
+
+
+def transcribe_videos(youtube_ids, on_update=None, poll_interval=2, max_chars=None):
+    """
+    Videoların transcript'lerini paralel üretir (max_chars: video başına metin bütçesi).
+    İndirmeler TRANSCRIBE_DOWNLOAD_CONCURRENCY, Whisper işleri Whisper pool'unun boyutu
+    (WHISPER_POOL_SIZE) ile sınırlıdır; fazlası pool kuyruğunda bekler.
+
+    Dönüş: ({youtube_id: transcript}, {youtube_id: hata mesajı}).
+    on_update({youtube_id: aşama}) durum değiştikçe çağıran thread'de çalışır, böylece
+    ilerleme kaydı isteğin kendi veritabanı bağlantısıyla yazılır.
+    """
+    youtube_ids = list(dict.fromkeys(youtube_ids))
+    progress = {youtube_id: 'queued' for youtube_id in youtube_ids}
+    progress_lock = threading.Lock()
+    changed = threading.Event()
+
+    def set_stage(youtube_id, stage):
+        with progress_lock:
+            progress[youtube_id] = stage
+        changed.set()
+
+    def work(youtube_id):
+        try:
+            return get_transcript(
+                youtube_id, on_stage=lambda stage: set_stage(youtube_id, stage), max_chars=max_chars
+            )
+        finally:
+            # Pool thread'lerinin açtığı bağlantılar isteğin sonunda kapanmaz
+            connections.close_all()
+
+    results, errors = {}, {}
+    if not youtube_ids:
+        return results, errors
+
+    max_workers = min(len(youtube_ids), settings.TRANSCRIBE_PIPELINE_MAX_VIDEOS)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='transcribe') as executor:
+        futures = {executor.submit(work, youtube_id): youtube_id for youtube_id in youtube_ids}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                youtube_id = futures[future]
+                try:
+                    results[youtube_id] = future.result()
+                    if progress[youtube_id] != 'cached':
+                        set_stage(youtube_id, 'done')
+                except Exception as e:
+                    logger.error(f"[AI] {youtube_id} transkripte edilemedi: {str(e)}")
+                    errors[youtube_id] = str(e)
+                    set_stage(youtube_id, 'failed')
+
+            if on_update is not None and changed.is_set():
+                changed.clear()
+                with progress_lock:
+                    snapshot = dict(progress)
+                try:
+                    on_update(snapshot)
+                except Exception as e:
+                    logger.warning(f"[AI] Transkripsiyon ilerlemesi kaydedilemedi: {str(e)}")
+
+    return results, errors
@@ -1,10 +1,11 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     # Chat endpoints
     path('chat/message/', views.chat_message, name='chat-message'),
-    path('chat/message/stream/', views.chat_message_stream, name='chat-message-stream'),
+    path('chat/message/stream/', async_views.chat_message_stream, name='chat-message-stream'),
+    path('chat/messages/<int:message_id>/stream/', async_views.chat_message_resume, name='chat-message-resume'),
     path('chat/message/simple/', views.chat_message_simple, name='chat-message-simple'),
     path('chat/sessions/', views.get_chat_history, name='chat-sessions'),
     path('chat/sessions/<int:session_id>/', views.get_chat_history, name='chat-session-history'),
@@ -29,6 +30,7 @@ urlpatterns = [
     path('admin/quest-queue/', views.get_quest_queue, name='get-quest-queue'),
     path('admin/quest-queue/add/', views.add_to_quest_queue, name='add-to-quest-queue'),
     path('admin/quest-queue/process/', views.process_quest_queue, name='process-quest-queue'),
+    path('admin/quest-queue/batch/<str:batch_id>/', views.quest_batch_status, name='quest-batch-status'),
     path('admin/quest-status/<int:content_id>/', views.admin_get_quest_status, name='admin-get-quest-status'),
 
     path("analyze-video/", views.analyze_video_content, name="analyze-video"),
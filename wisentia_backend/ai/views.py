@@ -3,25 +3,33 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from django.http import StreamingHttpResponse, JsonResponse
+from django.http import JsonResponse
 import json
-import requests
 from .llm import generate_response, generate_quest_with_anthropic, suggest_quest_conditions_with_anthropic, generate_quiz, generate_quiz_with_anthropic, generate_with_anthropic, call_llm
 import logging
 import re
-from .transcriber import download_audio, transcribe_audio
+from .transcripts import transcribe_url, transcribe_videos
+from .chat_context import CHAT_SYSTEM_PROMPT, build_chat_context, schedule_summary_update
+from .stream_checkpoint import checkpoints_enabled
+from .llm_limits import llm_post
 import os
 from django.conf import settings
 logger = logging.getLogger(__name__)
 OLLAMA_API_URL = settings.OLLAMA_API_URL
 LLAMA_MODEL = settings.LLAMA_MODEL
 from django.db import connection, transaction
-import threading
+from wisentia_backend.db import db_task, start_db_thread
+from .jobs import PermanentJobError, TransientJobError, enqueue_job, jobs_enabled, latest_jobs_for_content
+from wisentia_backend.utils import invalidate_tags
 import time
 import traceback  # Add missing traceback module import
 from datetime import datetime, timedelta
 from decimal import Decimal
 import random
+from types import SimpleNamespace
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.core.cache import cache
 
 # JSON encoder to handle datetime objects
 def datetime_handler(obj):
@@ -161,6 +169,9 @@ def chat_message(request):
                             'success': False
                         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
+        # Önceki mesajlar ve oturum özeti (yeni mesaj kaydedilmeden önce, token bütçesiyle)
+        context = build_chat_context(session_id, CHAT_SYSTEM_PROMPT, message)
+        
         # Store user message - session artık var, mesajı ekleyebiliriz
         try:
             with connection.cursor() as cursor:
@@ -178,9 +189,8 @@ def chat_message(request):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
         # Generate AI response
-        system_prompt = "You are Wisentia AI, an educational assistant. Help users with their educational questions and guide them through their learning journey."
-        logger.info(f"Generating response with LLM for session {session_id}")
-        result = generate_response(message, system_prompt)
+        logger.info(f"Generating response with LLM for session {session_id} ({len(context.history)} history messages)")
+        result = generate_response(message, context.system_prompt, context.history)
         
         if result['success']:
             ai_response = result['response']
@@ -195,6 +205,8 @@ def chat_message(request):
                         (SessionID, SenderType, MessageContent, Timestamp)
                         VALUES (%s, 'ai', %s, GETDATE())
                     """, [session_id, ai_response])
+                # Bu turun iki mesajıyla özet eşiği aşıldıysa arka planda özetle
+                schedule_summary_update(session_id, context.unsummarized + 2)
             except Exception as e:
                 logger.error(f"Error saving AI response: {str(e)}", exc_info=True)
                 # Continue even if we fail to save the AI response
@@ -219,95 +231,6 @@ def chat_message(request):
             'success': False
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def chat_message_stream(request):
-    """AI chat API endpoint with streaming responses"""
-    user_id = request.user.id
-    message = request.data.get('message')
-    session_id = request.data.get('sessionId')
-    
-    if not message:
-        return Response({'error': 'Message is required'}, status=status.HTTP_400_BAD_REQUEST)
-    
-    # Session operations
-    try:
-        with connection.cursor() as cursor:
-            # Session check/creation
-            if not session_id:
-                # Create new session
-                cursor.execute("""
-                    INSERT INTO ChatSessions
-                    (UserID, StartTime, IsActive)
-                    VALUES (%s, GETDATE(), 1)
-                """, [user_id])
-                
-                # Get session ID separately
-                cursor.execute("SELECT SCOPE_IDENTITY()")
-                session_id = cursor.fetchone()[0]
-            else:
-                # Check existing session
-                cursor.execute("""
-                    SELECT SessionID
-                    FROM ChatSessions
-                    WHERE SessionID = %s AND UserID = %s AND IsActive = 1
-                """, [session_id, user_id])
-                
-                if not cursor.fetchone():
-                    # Session not found or not active, create new
-                    cursor.execute("""
-                        INSERT INTO ChatSessions
-                        (UserID, StartTime, IsActive)
-                        VALUES (%s, GETDATE(), 1)
-                    """, [user_id])
-                    
-                    # Get session ID separately
-                    cursor.execute("SELECT SCOPE_IDENTITY()")
-                    session_id = cursor.fetchone()[0]
-            
-            # Save user message
-            cursor.execute("""
-                INSERT INTO ChatMessages
-                (SessionID, SenderType, MessageContent, Timestamp)
-                VALUES (%s, 'user', %s, GETDATE())
-            """, [session_id, message])
-        
-        # Create special system prompt
-        system_prompt = "You are Wisentia AI, an educational assistant. Help users with their educational questions and guide them through their learning journey."
-        
-        # Create streaming response
-        def stream_response():
-            full_response = ""
-            
-            # Use streaming function from llm.py
-            stream_generator = generate_response(message, system_prompt, stream=True)
-            
-            for chunk in stream_generator:
-                full_response += chunk
-                yield f"data: {json.dumps({'chunk': chunk, 'sessionId': session_id})}\n\n"
-            
-            # Save complete response to database
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO ChatMessages
-                    (SessionID, SenderType, MessageContent, Timestamp)
-                    VALUES (%s, 'ai', %s, GETDATE())
-                """, [session_id, full_response])
-            
-            yield f"data: {json.dumps({'done': True, 'sessionId': session_id})}\n\n"
-        
-        return StreamingHttpResponse(
-            streaming_content=stream_response(),
-            content_type='text/event-stream'
-        )
-    except Exception as e:
-        import traceback
-        return Response({
-            'error': str(e),
-            'traceback': traceback.format_exc(),
-            'success': False
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def chat_message_simple(request):
@@ -365,8 +288,10 @@ def get_chat_history(request, session_id=None):
                 logger.warning(f"Session {session_id} not found for user {user_id}")
                 return Response({'error': 'Session not found'}, status=status.HTTP_404_NOT_FOUND)
             
-            cursor.execute("""
-                SELECT cm.MessageID, cm.SenderType, cm.MessageContent as content, cm.Timestamp
+            # status: akışla üretilen mesajlar için 'streaming'/'interrupted' (istemci kaldığı yerden devam edebilir)
+            status_column = ", cm.Status AS status" if checkpoints_enabled() else ""
+            cursor.execute(f"""
+                SELECT cm.MessageID, cm.SenderType, cm.MessageContent as content, cm.Timestamp{status_column}
                 FROM ChatMessages cm
                 WHERE cm.SessionID = %s
                 ORDER BY cm.Timestamp
@@ -711,6 +636,7 @@ def approve_generated_quest(request, content_id):
                     trade_value,
                     nft_rarity
                 ])
+                invalidate_tags('catalog:nfts')
                 
                 # Get the new NFT ID
                 cursor.execute("SELECT SCOPE_IDENTITY()")
@@ -744,6 +670,7 @@ def approve_generated_quest(request, content_id):
             """, [
                 title, description, required_points, reward_points, difficulty_level, created_nft_id
             ])
+            invalidate_tags('catalog:quests')
             
             # Then, get the ID in a separate query
             cursor.execute("SELECT SCOPE_IDENTITY()")
@@ -833,38 +760,105 @@ def ai_generate_quiz(request):
     model_type = request.data.get('model', 'llama')  # 'llama' or 'anthropic'
     
     if source_type == 'youtube':
-        # YouTube video için quiz oluştur
-        video_id = request.data.get('videoId')
-        video_title = request.data.get('videoTitle')
-        video_url = request.data.get('videoUrl')
-
-        if not video_id or not video_title or not video_url:
+        if not request.data.get('videoId') or not request.data.get('videoTitle') or not request.data.get('videoUrl'):
             return Response({
                 'error': 'Video ID, title and URL are required'
             }, status=status.HTTP_400_BAD_REQUEST)
-            
-        return generate_quiz_for_youtube_video(request, video_id, video_title, video_url, model_type)
-    
     elif source_type == 'course':
-        # Kurs videoları için quiz oluştur
-        course_id = request.data.get('courseId')
-        course_name = request.data.get('courseName')
-        selected_videos = request.data.get('selectedVideos', [])
-        
-        if not course_id or not course_name or not selected_videos:
+        if not request.data.get('courseId') or not request.data.get('courseName') or not request.data.get('selectedVideos'):
             return Response({
                 'error': 'Course ID, name and selected videos are required'
             }, status=status.HTTP_400_BAD_REQUEST)
-            
-        return generate_quiz_for_course_videos(request, course_id, course_name, selected_videos, model_type)
-    
     else:
         return Response({
             'error': 'Invalid source type. Use "youtube" or "course".'
         }, status=status.HTTP_400_BAD_REQUEST)
 
-def generate_quiz_for_youtube_video(request, video_id, video_title, video_url, model_type):
-    """YouTube videosu için quiz oluştur"""
+    if not jobs_enabled():
+        # İş kuyruğu tablosu yoksa eskisi gibi istek içinde üret
+        return _generate_quiz(request.data)
+
+    # Üretim run_ai_workers süreçlerinde yapılır; ilerleme AIGeneratedContent kaydından izlenir
+    data = request.data.dict() if hasattr(request.data, 'dict') else dict(request.data)
+    content_id = _create_generation_record('quiz', {
+        'source': source_type,
+        'model': model_type,
+        'video_id': data.get('videoId'),
+        'video_title': data.get('videoTitle'),
+        'course_id': data.get('courseId'),
+        'course_name': data.get('courseName'),
+    }, approval_status='queued')
+    job_id = enqueue_job('quiz_generation', {'data': data}, content_id=content_id)
+    return Response({
+        'message': 'Quiz generation queued',
+        'contentId': content_id,
+        'jobId': job_id,
+        'status': 'queued'
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+def _generate_quiz(data, progress_content_id=None):
+    """Quiz'i kaynağa göre üretir; view ve AI worker tarafından kullanılır (data: istek gövdesi)"""
+    request = SimpleNamespace(data=data)  # üretim fonksiyonları yalnızca request.data kullanır
+    model_type = data.get('model', 'llama')
+    if data.get('source', 'youtube') == 'course':
+        return generate_quiz_for_course_videos(
+            request, data.get('courseId'), data.get('courseName'), data.get('selectedVideos', []),
+            model_type, progress_content_id
+        )
+    return generate_quiz_for_youtube_video(
+        request, data.get('videoId'), data.get('videoTitle'), data.get('videoUrl'),
+        model_type, progress_content_id
+    )
+
+
+def _quiz_failure_status(result):
+    return status.HTTP_422_UNPROCESSABLE_ENTITY if result.get('raw_response') else status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+def _raise_job_failure(job, error, permanent=False):
+    """
+    Handler hatasını iş kuyruğuna bildirir. Geçici hatada deneme hakkı kaldıysa kayıt
+    'failed'dan 'processing'e döner (iş backoff sonrası yeniden çalışacak).
+    """
+    if permanent:
+        raise PermanentJobError(error)
+    if job.attempts < job.max_attempts:
+        _update_generation_status(job.content_id, {
+            'status': 'processing',
+            'message': f"Retrying after error (attempt {job.attempts}/{job.max_attempts})",
+            'error': error,
+            'attempt': job.attempts
+        })
+    raise TransientJobError(error)
+
+
+def run_quiz_generation_job(job):
+    """
+    AI worker handler'ı: quiz_generation işi. 5xx (transkripsiyon, LLM bağlantısı, veritabanı)
+    yeniden denenir; 4xx (geçersiz girdi, ayrıştırılamayan model çıktısı) denenmez.
+    """
+    _update_generation_status(job.content_id, {
+        'status': 'processing',
+        'startedAt': datetime.now().isoformat(),
+        'attempt': job.attempts
+    })
+    response = _generate_quiz(job.payload['data'], job.content_id)
+    if response.status_code >= 400:
+        _raise_job_failure(
+            job, response.data.get('error', 'Quiz generation failed'),
+            permanent=response.status_code < 500
+        )
+    return {'contentId': response.data.get('contentId')}
+
+def generate_quiz_for_youtube_video(request, video_id, video_title, video_url, model_type, progress_content_id=None):
+    """YouTube videosu için quiz oluştur (progress_content_id: sonucu yazılacak kuyruk kaydı)"""
+    response = _generate_youtube_quiz(request, progress_content_id, video_id, video_title, video_url, model_type)
+    _mark_generation_failed(progress_content_id, response)
+    return response
+
+
+def _generate_youtube_quiz(request, progress_content_id, video_id, video_title, video_url, model_type):
     num_questions = request.data.get('numQuestions', 5)
     difficulty = request.data.get('difficulty', 'intermediate')
     language = request.data.get('language', 'en')
@@ -873,15 +867,7 @@ def generate_quiz_for_youtube_video(request, video_id, video_title, video_url, m
     passing_score = request.data.get('passingScore', 70)
 
     try:
-        logger.info(f"[AI] Video indiriliyor: {video_url}")
-        audio_path = download_audio(video_url)
-
-        logger.info(f"[AI] Transkript başlatılıyor: {audio_path}")
-        transcript = transcribe_audio(audio_path)
-
-        if os.path.exists(audio_path):
-            os.remove(audio_path)
-            logger.info(f"[AI] Geçici ses dosyası silindi: {audio_path}")
+        transcript = transcribe_url(video_url)
 
     except Exception as e:
         logger.error(f"[AI] Transkript oluşturulamadı: {str(e)}")
@@ -905,7 +891,8 @@ def generate_quiz_for_youtube_video(request, video_id, video_title, video_url, m
                 passing_score,
                 language,
                 target_audience,
-                instructional_approach
+                instructional_approach,
+                cache_refresh=bool(request.data.get('refresh', False))
             )
             
             # Maliyet bilgisini ekle
@@ -933,7 +920,7 @@ def generate_quiz_for_youtube_video(request, video_id, video_title, video_url, m
             logger.info(f"[AI] Prompt uzunluğu: {len(analysis_prompt)} karakter")
             logger.info(f"[AI] LLM API isteği gönderiliyor: {OLLAMA_API_URL} - Model: {LLAMA_MODEL}")
 
-            analysis_response = requests.post(f"{OLLAMA_API_URL}/generate", json={
+            analysis_response = llm_post('ollama', f"{OLLAMA_API_URL}/generate", json={
                 'model': LLAMA_MODEL,
                 'prompt': analysis_prompt,
                 'stream': False,
@@ -968,10 +955,11 @@ def generate_quiz_for_youtube_video(request, video_id, video_title, video_url, m
 
     # Quiz API çıktısını kontrol et
     if not result['success']:
+        # Model yanıtı geldi ama ayrıştırılamadıysa 422, sağlayıcıya ulaşılamadıysa 500
         return Response({
             'error': result.get('error', 'Failed to generate quiz'),
             'raw_response': result.get('raw_response', '')
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        }, status=_quiz_failure_status(result))
 
     # Handle different response formats - data field or direct structure
     quiz_data = None
@@ -997,7 +985,7 @@ def generate_quiz_for_youtube_video(request, video_id, video_title, video_url, m
         return Response({
             'error': 'Invalid quiz data returned from generator',
             'details': f"No valid quiz data found. Result keys: {list(result.keys())}"
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
     # JSON doğrulama
     if isinstance(quiz_data, str):
@@ -1009,7 +997,7 @@ def generate_quiz_for_youtube_video(request, video_id, video_title, video_url, m
             return Response({
                 'error': f'Oluşturulan quiz JSON formatında değil: {str(e)}',
                 'raw_response': quiz_data[:2000]
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
     try:
         # Metadata bilgisine YouTube video bilgisini ekle
@@ -1026,20 +1014,32 @@ def generate_quiz_for_youtube_video(request, video_id, video_title, video_url, m
         if 'cost' in result:
             metadata['cost'] = result['cost']
         
-        content_id = None
+        content_id = progress_content_id
         with connection.cursor() as cursor:
-            cursor.execute("""
-                INSERT INTO AIGeneratedContent
-                (ContentType, Content, GenerationParams, CreationDate, ApprovalStatus)
-                VALUES ('quiz', %s, %s, GETDATE(), 'pending')
-            """, [
-                json.dumps(quiz_data),
-                json.dumps(metadata)
-            ])
+            if content_id is not None:
+                # Kuyruk kaydı quiz içeriğiyle tamamlanıp onaya düşer
+                cursor.execute("""
+                    UPDATE AIGeneratedContent
+                    SET Content = %s, GenerationParams = %s, ApprovalStatus = 'pending'
+                    WHERE ContentID = %s
+                """, [
+                    json.dumps(quiz_data),
+                    json.dumps(metadata),
+                    content_id
+                ])
+            else:
+                cursor.execute("""
+                    INSERT INTO AIGeneratedContent
+                    (ContentType, Content, GenerationParams, CreationDate, ApprovalStatus)
+                    VALUES ('quiz', %s, %s, GETDATE(), 'pending')
+                """, [
+                    json.dumps(quiz_data),
+                    json.dumps(metadata)
+                ])
 
-            # SCOPE_IDENTITY'yi aynı cursor ile hemen alın
-            cursor.execute("SELECT SCOPE_IDENTITY()")
-            content_id = cursor.fetchone()[0]
+                # SCOPE_IDENTITY'yi aynı cursor ile hemen alın
+                cursor.execute("SELECT SCOPE_IDENTITY()")
+                content_id = cursor.fetchone()[0]
 
     except Exception as e:
         logger.error(f"Veritabanı hatası: {e}")
@@ -1063,8 +1063,74 @@ def generate_quiz_for_youtube_video(request, video_id, video_title, video_url, m
         'cost': result.get('cost', {})
     })
 
-def generate_quiz_for_course_videos(request, course_id, course_name, selected_videos, model_type):
-    """Kurs videoları için quiz oluştur"""
+# Kurs quizinde her videodan LLM'e giden transcript uzunluğu; indirme/transkripsiyon da bu bütçeyle sınırlı
+COURSE_VIDEO_TRANSCRIPT_CHARS = 3000
+
+
+def _create_generation_record(content_type, generation_params, approval_status='processing'):
+    """Üretim başlarken ('processing') ya da kuyruğa alınırken ('queued') AIGeneratedContent kaydı açar"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO AIGeneratedContent
+            (ContentType, Content, GenerationParams, CreationDate, ApprovalStatus)
+            VALUES (%s, %s, %s, GETDATE(), %s)
+        """, [
+            content_type,
+            json.dumps({
+                'status': approval_status,
+                'queuedAt' if approval_status == 'queued' else 'startedAt': datetime.now().isoformat()
+            }),
+            json.dumps(generation_params),
+            approval_status
+        ])
+        cursor.execute("SELECT SCOPE_IDENTITY()")
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None else None
+
+
+def _update_generation_status(content_id, content, approval_status='processing'):
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE AIGeneratedContent
+            SET Content = %s, ApprovalStatus = %s
+            WHERE ContentID = %s
+        """, [json.dumps(content, default=datetime_handler), approval_status, content_id])
+
+
+def _mark_generation_failed(content_id, response):
+    """Hata yanıtını ilerleme kaydına 'failed' olarak yazar"""
+    if content_id is None or response.status_code < 400:
+        return
+    try:
+        _update_generation_status(content_id, {
+            'status': 'failed',
+            'error': response.data.get('error'),
+            'details': response.data.get('details')
+        }, 'failed')
+    except Exception as e:
+        logger.warning(f"[AI] Quiz {content_id} başarısız olarak işaretlenemedi: {str(e)}")
+
+
+def generate_quiz_for_course_videos(request, course_id, course_name, selected_videos, model_type, progress_content_id=None):
+    """Kurs videoları için quiz oluştur; ilerleme AIGeneratedContent kaydında izlenir"""
+    content_id = progress_content_id
+    if content_id is None:
+        try:
+            content_id = _create_generation_record('quiz', {
+                'source': 'course',
+                'course_id': course_id,
+                'course_name': course_name,
+                'model': model_type
+            })
+        except Exception as e:
+            logger.warning(f"[AI] İlerleme kaydı oluşturulamadı, kayıtsız devam ediliyor: {str(e)}")
+
+    response = _generate_course_quiz(request, content_id, course_id, course_name, selected_videos, model_type)
+    _mark_generation_failed(content_id, response)
+    return response
+
+
+def _generate_course_quiz(request, progress_content_id, course_id, course_name, selected_videos, model_type):
     num_questions = request.data.get('numQuestions', 5)
     difficulty = request.data.get('difficulty', 'intermediate')
     language = request.data.get('language', 'en')
@@ -1081,7 +1147,6 @@ def generate_quiz_for_course_videos(request, course_id, course_name, selected_vi
     
     try:
         # Tüm videoları işle
-        all_transcripts = []
         video_details = []
         
         for i, video in enumerate(selected_videos):
@@ -1093,36 +1158,41 @@ def generate_quiz_for_course_videos(request, course_id, course_name, selected_vi
                 logger.warning(f"[AI] Video {i+1}/{video_count} için YouTube ID bulunamadı: {video_id}")
                 continue
             
-            video_url = f"https://www.youtube.com/watch?v={youtube_id}"
             video_details.append({
                 'video_id': video_id,
                 'video_title': video_title,
                 'youtube_id': youtube_id
             })
-            
-            try:
-                # Video indirme
-                logger.info(f"[AI] Video {i+1}/{video_count} indiriliyor: {video_url}")
-                audio_path = download_audio(video_url)
-                
-                # Transkript
-                logger.info(f"[AI] Video {i+1}/{video_count} transkript ediliyor")
-                transcript = transcribe_audio(audio_path)
-                
-                all_transcripts.append({
-                    'video_id': video_id,
-                    'title': video_title,
-                    'transcript': transcript
-                })
-                
-                # Geçici dosyayı sil
-                if os.path.exists(audio_path):
-                    os.remove(audio_path)
-                    logger.info(f"[AI] Geçici ses dosyası silindi: {audio_path}")
-                
-            except Exception as e:
-                logger.error(f"[AI] Video {i+1}/{video_count} işlenirken hata: {str(e)}")
-                # Devam et, tek bir video hatası tüm işlemi kesmesin
+        
+        # İndirmeler thread'lerde, transkripsiyon Whisper pool'unda paralel ilerler;
+        # video başına durum ilerleme kaydına yazılır
+        def report_progress(progress):
+            if progress_content_id is None:
+                return
+            finished = sum(1 for stage in progress.values() if stage in ('done', 'cached', 'failed'))
+            _update_generation_status(progress_content_id, {
+                'status': 'processing',
+                'message': f"Transcribing videos ({finished}/{len(progress)})",
+                'videos': progress
+            })
+        
+        logger.info(f"[AI] {len(video_details)} video transkript ediliyor")
+        transcripts, errors = transcribe_videos(
+            [video['youtube_id'] for video in video_details],
+            on_update=report_progress,
+            max_chars=COURSE_VIDEO_TRANSCRIPT_CHARS
+        )
+        
+        # Tek bir video hatası tüm işlemi kesmesin
+        all_transcripts = [
+            {
+                'video_id': video['video_id'],
+                'title': video['video_title'],
+                'transcript': transcripts[video['youtube_id']]
+            }
+            for video in video_details
+            if video['youtube_id'] in transcripts
+        ]
         
         if not all_transcripts:
             return Response({
@@ -1131,7 +1201,7 @@ def generate_quiz_for_course_videos(request, course_id, course_name, selected_vi
         
         # Tüm transkriptleri birleştir
         combined_content = "\n\n".join([
-            f"Video: {t['title']}\nTranscript: {t['transcript'][:3000]}" 
+            f"Video: {t['title']}\nTranscript: {t['transcript'][:COURSE_VIDEO_TRANSCRIPT_CHARS]}" 
             for t in all_transcripts
         ])
         
@@ -1151,7 +1221,8 @@ def generate_quiz_for_course_videos(request, course_id, course_name, selected_vi
                     passing_score,
                     language,
                     target_audience,
-                    instructional_approach
+                    instructional_approach,
+                    cache_refresh=bool(request.data.get('refresh', False))
                 )
                 
                 # Maliyet bilgisini ekle
@@ -1179,7 +1250,7 @@ def generate_quiz_for_course_videos(request, course_id, course_name, selected_vi
                 Cevabında 10-15 cümlelik detaylı bir özet oluştur.
                 """
                 
-                analysis_response = requests.post(f"{OLLAMA_API_URL}/generate", json={
+                analysis_response = llm_post('ollama', f"{OLLAMA_API_URL}/generate", json={
                     'model': LLAMA_MODEL,
                     'prompt': analysis_prompt,
                     'stream': False,
@@ -1217,7 +1288,7 @@ def generate_quiz_for_course_videos(request, course_id, course_name, selected_vi
             return Response({
                 'error': result.get('error', 'Failed to generate quiz'),
                 'raw_response': result.get('raw_response', '')
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            }, status=_quiz_failure_status(result))
         
         # Quiz verilerini al - Handle both data structures
         quiz_data = None
@@ -1246,7 +1317,7 @@ def generate_quiz_for_course_videos(request, course_id, course_name, selected_vi
             return Response({
                 'error': 'Invalid quiz data returned from generator',
                 'details': f"Expected dict, got {type(quiz_data).__name__}. Result keys: {list(result.keys())}"
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
         try:
             # Metadata bilgisine YouTube video bilgisini ekle
@@ -1265,46 +1336,59 @@ def generate_quiz_for_course_videos(request, course_id, course_name, selected_vi
                 metadata['cost'] = result['cost']
             
             # Veritabanına kaydet
-            content_id = None
+            content_id = progress_content_id
             
-            # Veritabanı işlemi için yeni bir transaction ve cursor başlat
-            with transaction.atomic():
+            if content_id is not None:
+                # İlerleme kaydı quiz içeriğiyle tamamlanıp onaya düşer
                 with connection.cursor() as cursor:
-                    try:
-                        cursor.execute("""
-                            INSERT INTO AIGeneratedContent
-                            (ContentType, Content, GenerationParams, CreationDate, ApprovalStatus)
-                            VALUES ('quiz', %s, %s, GETDATE(), 'pending')
-                        """, [
-                            json.dumps(quiz_data),
-                            json.dumps(metadata)
-                        ])
+                    cursor.execute("""
+                        UPDATE AIGeneratedContent
+                        SET Content = %s, GenerationParams = %s, ApprovalStatus = 'pending'
+                        WHERE ContentID = %s
+                    """, [
+                        json.dumps(quiz_data),
+                        json.dumps(metadata),
+                        content_id
+                    ])
+            else:
+                # Veritabanı işlemi için yeni bir transaction ve cursor başlat
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        try:
+                            cursor.execute("""
+                                INSERT INTO AIGeneratedContent
+                                (ContentType, Content, GenerationParams, CreationDate, ApprovalStatus)
+                                VALUES ('quiz', %s, %s, GETDATE(), 'pending')
+                            """, [
+                                json.dumps(quiz_data),
+                                json.dumps(metadata)
+                            ])
                         
-                        # Aynı cursor'da ID'yi hemen sorgula
-                        cursor.execute("SELECT SCOPE_IDENTITY()")
-                        result_row = cursor.fetchone()
+                            # Aynı cursor'da ID'yi hemen sorgula
+                            cursor.execute("SELECT SCOPE_IDENTITY()")
+                            result_row = cursor.fetchone()
                         
-                        if not result_row or result_row[0] is None:
-                            logger.error("[AI] SCOPE_IDENTITY() null döndü, son INSERT ID'si alınamadı")
-                            # Son eklenen kaydı bulmak için alternatif yöntem
-                            cursor.execute("""
-                                SELECT TOP 1 ContentID FROM AIGeneratedContent 
-                                WHERE ContentType = 'quiz' AND ApprovalStatus = 'pending'
-                                ORDER BY CreationDate DESC
-                            """)
-                            alt_result = cursor.fetchone()
+                            if not result_row or result_row[0] is None:
+                                logger.error("[AI] SCOPE_IDENTITY() null döndü, son INSERT ID'si alınamadı")
+                                # Son eklenen kaydı bulmak için alternatif yöntem
+                                cursor.execute("""
+                                    SELECT TOP 1 ContentID FROM AIGeneratedContent 
+                                    WHERE ContentType = 'quiz' AND ApprovalStatus = 'pending'
+                                    ORDER BY CreationDate DESC
+                                """)
+                                alt_result = cursor.fetchone()
                             
-                            if alt_result and alt_result[0]:
-                                content_id = alt_result[0]
-                                logger.info(f"[AI] Alternatif ID bulma yöntemi başarılı: {content_id}")
+                                if alt_result and alt_result[0]:
+                                    content_id = alt_result[0]
+                                    logger.info(f"[AI] Alternatif ID bulma yöntemi başarılı: {content_id}")
+                                else:
+                                    raise Exception("Failed to retrieve content ID with both methods")
                             else:
-                                raise Exception("Failed to retrieve content ID with both methods")
-                        else:
-                            content_id = result_row[0]
-                            logger.info(f"[AI] ContentID başarıyla alındı: {content_id}")
-                    except Exception as db_error:
-                        logger.exception(f"[AI] Veritabanı işleminde hata: {str(db_error)}")
-                        raise db_error
+                                content_id = result_row[0]
+                                logger.info(f"[AI] ContentID başarıyla alındı: {content_id}")
+                        except Exception as db_error:
+                            logger.exception(f"[AI] Veritabanı işleminde hata: {str(db_error)}")
+                            raise db_error
 
         except Exception as e:
             logger.error(f"Veritabanı hatası: {e}")
@@ -2010,22 +2094,35 @@ def analyze_video_content(request):
         return Response({"error": "videoUrl parametresi zorunludur."}, status=400)
 
     try:
-        logger.info(f"[AI] Video indiriliyor: {video_url}")
-        audio_path = download_audio(video_url)
-
-        logger.info(f"[AI] Transkript başlatılıyor: {audio_path}")
-        transcript = transcribe_audio(audio_path)
-
-        if os.path.exists(audio_path):
-            os.remove(audio_path)
-            logger.info(f"[AI] Dosya silindi: {audio_path}")
-
+        transcript = transcribe_url(video_url)
         return Response({"transcript": transcript})
 
     except Exception as e:
         logger.exception("analyze_video_content sırasında hata oluştu:")
         return Response({"error": str(e)}, status=500)
 
+def _quiz_generation_state(content_id, approval_status, content_json):
+    """Henüz sonuçlanmamış (ya da başarısız) quiz üretiminin durumu"""
+    try:
+        progress = json.loads(content_json) if content_json else {}
+    except json.JSONDecodeError:
+        progress = {}
+    if not isinstance(progress, dict):
+        progress = {}
+    job = latest_jobs_for_content([content_id]).get(content_id)
+    # Geçici hatada kayıt kısa süre 'failed' görünür; iş yeniden denenecekse üretim sürüyordur
+    if approval_status == 'failed' and job and job['status'] in ('queued', 'running'):
+        approval_status = 'processing'
+    return {
+        'contentId': content_id,
+        'approval_status': approval_status,
+        'status': progress.get('status', approval_status),
+        'message': progress.get('message'),
+        'error': progress.get('error') if approval_status == 'failed' else None,
+        'job': job
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_quiz_content_detail(request, content_id):
@@ -2057,6 +2154,10 @@ def get_quiz_content_detail(request, content_id):
         columns = [col[0] for col in cursor.description]
         content = dict(zip(columns, row))
         
+        # Üretim sürerken Content soru değil ilerleme bilgisi tutar; generate-quiz sayfası bu yanıtı yoklar
+        if content['ApprovalStatus'] in ('queued', 'processing', 'failed'):
+            return Response(_quiz_generation_state(content_id, content['ApprovalStatus'], content['Content']))
+        
         # Parse JSON data
         try:
             # Get the raw content for debugging
@@ -2208,6 +2309,7 @@ def get_quiz_content_detail(request, content_id):
             
             # Create response with all necessary data
             response_data = {
+                'approval_status': content['ApprovalStatus'],
                 'title': content_json.get('title', 'Untitled Quiz'),
                 'description': content_json.get('description', ''),
                 'passing_score': content_json.get('passing_score', 70),
@@ -2261,7 +2363,8 @@ def ai_generate_complete_quest(request):
             'category': category,
             'points_required': points_required,
             'points_reward': points_reward,
-            'auto_create': auto_create
+            'auto_create': auto_create,
+            'refresh': bool(request.data.get('refresh', False))  # önbellekteki yanıtı kullanma
         }
         
         # Create AIGeneratedContent record
@@ -2328,20 +2431,13 @@ def ai_generate_complete_quest(request):
                 'details': 'Database did not return a valid ID'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-        # Start background processing
-        # In a real Django application with Celery, you would do:
-        # process_quest_generation_task.delay(content_id, generation_params)
-        # For this demo without Celery, we'll run in a thread
-        thread = threading.Thread(
-            target=process_quest_generation_background, 
-            args=(content_id, generation_params)
-        )
-        thread.daemon = True
-        thread.start()
+        # Üretim AI worker kuyruğunda (run_ai_workers) yapılır
+        job_id = _start_quest_generation(content_id, generation_params)
         
         response_data = {
             'message': 'Quest generation started',
             'contentId': content_id,
+            'jobId': job_id,
             'status': 'queued'
         }
         
@@ -2355,6 +2451,76 @@ def ai_generate_complete_quest(request):
             'details': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _start_quest_generation(content_id, generation_params):
+    """
+    Quest üretimini AI worker kuyruğuna verir ve JobID döndürür.
+    AIJobs tablosu yoksa eskisi gibi web sürecinde bir thread'de çalıştırır (None).
+    Kayıt önce 'processing' yapılır; 'queued' kalırsa process_quest_queue onu tekrar
+    alıp aynı quest için ikinci bir iş başlatır.
+    """
+    use_jobs = jobs_enabled()
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE AIGeneratedContent
+            SET ApprovalStatus = 'processing', Content = %s
+            WHERE ContentID = %s AND ApprovalStatus = 'queued'
+        """, [
+            json.dumps({
+                "status": "processing",
+                "message": "Waiting for an AI worker" if use_jobs
+                else "Quest generation started - initializing AI process",
+                "startedAt": datetime.now().isoformat()
+            }, default=datetime_handler),
+            content_id
+        ])
+        if cursor.rowcount == 0:
+            # Başka bir istek (kuyruk işleme) kaydı zaten aldı
+            logger.info(f"Quest content {content_id} was already claimed; not starting another generation")
+            return None
+
+    job_id = enqueue_job('quest_generation', {}, content_id=content_id) if use_jobs else None
+    if job_id is None:
+        start_db_thread(process_quest_generation_background, args=(content_id, generation_params))
+    return job_id
+
+
+def run_quest_generation_job(job):
+    """AI worker handler'ı: quest_generation işi (parametreler kayıttan okunur)"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT GenerationParams FROM AIGeneratedContent WHERE ContentID = %s
+        """, [job.content_id])
+        row = cursor.fetchone()
+    if not row:
+        raise PermanentJobError(f"AIGeneratedContent {job.content_id} not found")
+    try:
+        generation_params = json.loads(row[0]) if row[0] else {}
+    except json.JSONDecodeError:
+        raise PermanentJobError(f"Invalid generation parameters for content {job.content_id}")
+
+    # Hatalar kayda yazılır; iş durumu kaydın son durumundan belirlenir
+    process_quest_generation_background(job.content_id, generation_params)
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT ApprovalStatus, Content FROM AIGeneratedContent WHERE ContentID = %s
+        """, [job.content_id])
+        row = cursor.fetchone()
+    approval_status, content_json = row if row else ('failed', None)
+    if approval_status == 'failed':
+        try:
+            content = json.loads(content_json) if content_json else {}
+        except json.JSONDecodeError:
+            content = {}
+        # Ayrıştırılamayan/eksik model çıktısı kalıcı; LLM ve veritabanı hataları geçici
+        _raise_job_failure(
+            job, content.get('error') or 'Quest generation failed',
+            permanent=content.get('retryable') is False
+        )
+    elif approval_status in ('queued', 'processing'):
+        _raise_job_failure(job, 'Quest generation ended without a result')
+    return {'contentId': job.content_id, 'status': approval_status}
+
+
 def process_quest_generation_background(content_id, generation_params):
     """Background process to generate a quest"""
     max_retries = 3
@@ -2605,12 +2771,14 @@ def process_quest_generation_background(content_id, generation_params):
                     
                     # Call LLM with increasing timeout for retries
                     logger.info(f"Calling AI service for quest generation (attempt {retry_count + 1})")
-                    result = call_llm(system_prompt, user_prompt)
+                    # Yeniden denemede (ayrıştırılamayan yanıt vb.) önbellekteki yanıt atlanır
+                    result = call_llm(system_prompt, user_prompt, cache_use_case='quest',
+                                      cache_refresh=retry_count > 0 or generation_params.get('refresh', False))
                     logger.info(f"AI service returned result: {type(result)}")
                     
-                    # Track API cost if available
+                    # Track API cost if available (önbellekten gelen yanıt yeni maliyet doğurmaz)
                     api_cost = None
-                    if isinstance(result, dict):
+                    if isinstance(result, dict) and not result.get('cached'):
                         api_cost = result.get('cost')
                         if not api_cost and result.get('usage'):
                             from .anthropic import estimate_cost
@@ -2803,6 +2971,7 @@ def process_quest_generation_background(content_id, generation_params):
                                 quest_data['difficultyLevel']
                             ])
                             logger.info("Quest INSERT statement executed successfully")
+                            invalidate_tags('catalog:quests')
                             
                             # Get the ID immediately after insert in same transaction
                             cursor.execute("SELECT SCOPE_IDENTITY()")
@@ -2942,7 +3111,8 @@ def process_quest_generation_background(content_id, generation_params):
                                             "status": "failed",
                                             "message": "Quest creation failed - database verification failed",
                                             "error": verification_message,
-                                            "apiCost": api_cost
+                                            "apiCost": api_cost,
+                                            "retryable": False  # quest kaydı oluştu; tekrar üretilmez
                                         }, default=datetime_handler),
                                         'failed',
                                         content_id
@@ -3001,7 +3171,8 @@ def process_quest_generation_background(content_id, generation_params):
                             "error": f"Failed to parse AI response: {str(e)}",
                             "raw_response": content,
                             "errorDetails": traceback.format_exc(),
-                            "apiCost": api_cost
+                            "apiCost": api_cost,
+                            "retryable": False
                         }),
                         'failed',
                         content_id
@@ -3111,18 +3282,8 @@ def transcribe_audio(request):
         data = request.data
         
         if 'url' in data:
-            # Download audio from URL first
-            from .transcriber import download_audio, transcribe_audio as transcribe
-            
-            audio_path = download_audio(data['url'])
-            transcript = transcribe(audio_path)
-            
-            # Cleanup downloaded file
-            try:
-                import os
-                os.remove(audio_path)
-            except:
-                pass
+            # YouTube URL'leri transcript deposundan gelir
+            transcript = transcribe_url(data['url'])
                 
             return Response({
                 'success': True,
@@ -3276,6 +3437,7 @@ def add_to_quest_queue(request):
         'points_required': points_required,
         'points_reward': points_reward,
         'auto_create': auto_create,
+        'refresh': bool(request.data.get('refresh', False)),
         'database_data': database_data
     }
     
@@ -3347,10 +3509,51 @@ def add_to_quest_queue(request):
     
     return Response(response_data)
 
+QUEST_BATCH_CLAIM_SQL = """
+    WITH batch AS (
+        SELECT TOP (%s) ContentID, Content, GenerationParams, ApprovalStatus
+        FROM AIGeneratedContent WITH (ROWLOCK, UPDLOCK, READPAST)
+        WHERE ContentType = 'quest' AND ApprovalStatus = 'queued'
+        ORDER BY CreationDate ASC
+    )
+    UPDATE batch
+    SET ApprovalStatus = 'processing', Content = %s
+    OUTPUT INSERTED.ContentID, INSERTED.GenerationParams
+"""
+
+
+def _claim_queued_quests(limit, message):
+    """En eski 'queued' quest kayıtlarından en fazla limit tanesini atomik olarak 'processing' yapar"""
+    with connection.cursor() as cursor:
+        cursor.execute(QUEST_BATCH_CLAIM_SQL, [
+            limit,
+            json.dumps({
+                "status": "processing",
+                "message": message,
+                "startedAt": datetime.now().isoformat()
+            }, default=datetime_handler)
+        ])
+        return cursor.fetchall()
+
+
+def _quest_batch_key(batch_id):
+    return f"{settings.CACHE_KEY_PREFIX}quest_batch_{batch_id}"
+
+
+def _run_quest_batch_in_process(items):
+    """AIJobs tablosu yokken batch'i web sürecinde, QUEST_BATCH_CONCURRENCY ile sınırlı çalıştırır"""
+    with ThreadPoolExecutor(max_workers=settings.QUEST_BATCH_CONCURRENCY, thread_name_prefix='quest-batch') as executor:
+        for content_id, generation_params in items:
+            executor.submit(db_task(process_quest_generation_background), content_id, generation_params)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def process_quest_queue(request):
-    """Process the next item in the quest generation queue"""
+    """
+    Process queued quests. batchSize (varsayılan 1) kadar kayıt atomik olarak alınır ve
+    eşzamanlı üretilir; ilerleme admin/quest-queue/batch/<batchId>/ ile izlenir.
+    """
     user_id = request.user.id
     
     # Admin check
@@ -3364,57 +3567,132 @@ def process_quest_queue(request):
             return Response({'error': 'Only administrators can process quest queue'}, 
                            status=status.HTTP_403_FORBIDDEN)
     
-    # Find the next queued item
+    try:
+        batch_size = min(max(int(request.data.get('batchSize', 1)), 1), settings.QUEST_BATCH_MAX_SIZE)
+    except (TypeError, ValueError):
+        return Response({'error': 'batchSize must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Sıradaki kayıtları al ve 'processing' yap (eşzamanlı tıklamalar aynı kaydı alamaz).
+    # İş kuyruğunda kayıt, worker alana kadar AIJobs'ta 'queued' görünür (bkz. quest_batch_status)
+    use_jobs = jobs_enabled()
+    rows = _claim_queued_quests(batch_size, (
+        "Waiting for an AI worker" if use_jobs
+        else "Quest generation started - initializing AI process"
+    ))
+    if not rows:
+        return Response({'message': 'No quests in queue to process'})
+    
+    items, invalid_ids = [], []
+    for content_id, params_json in rows:
+        try:
+            items.append((content_id, json.loads(params_json)))
+        except (TypeError, json.JSONDecodeError):
+            invalid_ids.append(content_id)
+            _update_generation_status(content_id, {
+                'status': 'failed',
+                'error': 'Invalid generation parameters'
+            }, 'failed')
+    
+    # Üretim AI worker kuyruğunda (run_ai_workers); tablo yoksa web sürecinde sınırlı paralellikle
+    job_ids = []
+    if use_jobs:
+        job_ids = [enqueue_job('quest_generation', {}, content_id=content_id) for content_id, _ in items]
+    elif items:
+        start_db_thread(_run_quest_batch_in_process, args=(items,))
+    
+    content_ids = [content_id for content_id, _ in items]
+    batch_id = uuid.uuid4().hex[:12]
+    cache.set(_quest_batch_key(batch_id), {
+        'contentIds': content_ids + invalid_ids,
+        'startedAt': datetime.now().isoformat()
+    }, settings.QUEST_BATCH_TTL)
+    
+    if not items:
+        return Response({
+            'error': 'Invalid generation parameters',
+            'contentId': invalid_ids[0],
+            'batchId': batch_id
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'message': 'Quest generation started',
+        'contentId': content_ids[0],
+        'contentIds': content_ids,
+        'invalidContentIds': invalid_ids,
+        'jobId': job_ids[0] if job_ids else None,
+        'jobIds': job_ids,
+        'batchId': batch_id,
+        'status': 'processing'
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def quest_batch_status(request, batch_id):
+    """Batch'teki quest'lerin toplu ilerlemesi ve kayıt bazında API maliyeti"""
+    user_id = request.user.id
+    
+    # Admin check
     with connection.cursor() as cursor:
         cursor.execute("""
-            SELECT TOP 1 ContentID, Content, GenerationParams
-            FROM AIGeneratedContent
-            WHERE ContentType = 'quest' AND ApprovalStatus = 'queued'
-            ORDER BY CreationDate ASC
-        """)
-        
-        row = cursor.fetchone()
-        if not row:
-            return Response({'message': 'No quests in queue to process'})
-        
-        content_id = row[0]
+            SELECT UserRole FROM Users WHERE UserID = %s
+        """, [user_id])
         
-        try:
-            generation_params = json.loads(row[2])
-        except json.JSONDecodeError:
-            return Response({
-                'error': 'Invalid generation parameters',
-                'contentId': content_id
-            }, status=status.HTTP_400_BAD_REQUEST)
+        user_role = cursor.fetchone()
+        if not user_role or user_role[0] != 'admin':
+            return Response({'error': 'Only administrators can view quest batches'}, 
+                           status=status.HTTP_403_FORBIDDEN)
+    
+    batch = cache.get(_quest_batch_key(batch_id))
+    if not batch:
+        return Response({'error': 'Batch not found or expired'}, status=status.HTTP_404_NOT_FOUND)
     
-    # Update status to processing BEFORE starting background thread
+    content_ids = batch['contentIds']
     with connection.cursor() as cursor:
-        cursor.execute("""
-            UPDATE AIGeneratedContent
-            SET ApprovalStatus = 'processing',
-                Content = %s
-            WHERE ContentID = %s
-        """, [
-            json.dumps({
-                "status": "processing", 
-                "message": "Quest generation started - initializing AI process",
-                "startedAt": datetime.now().isoformat()
-            }, default=datetime_handler),
-            content_id
-        ])
+        cursor.execute(f"""
+            SELECT ContentID, ApprovalStatus, Content
+            FROM AIGeneratedContent
+            WHERE ContentID IN ({', '.join(['%s'] * len(content_ids))})
+        """, content_ids)
+        rows = {row[0]: row for row in cursor.fetchall()}
+    jobs = latest_jobs_for_content(content_ids)
     
-    # Start a background thread to process the quest generation
-    thread = threading.Thread(
-        target=process_quest_generation_background,
-        args=(content_id, generation_params)
-    )
-    thread.daemon = True
-    thread.start()
+    items = []
+    counts = {}
+    total_cost = 0
+    for content_id in content_ids:
+        _, approval_status, content_json = rows.get(content_id, (content_id, 'missing', None))
+        job = jobs.get(content_id)
+        # Kayıt 'processing' olsa da iş henüz bir worker'a düşmediyse (ya da retry backoff'unda) bekliyordur
+        if approval_status == 'processing' and job and job['status'] == 'queued':
+            approval_status = 'queued'
+        try:
+            content = json.loads(content_json) if content_json else {}
+        except json.JSONDecodeError:
+            content = {}
+        api_cost = content.get('apiCost') or content.get('cost') if isinstance(content, dict) else None
+        if isinstance(api_cost, dict):
+            total_cost += api_cost.get('total_cost', 0) or 0
+        counts[approval_status] = counts.get(approval_status, 0) + 1
+        items.append({
+            'contentId': content_id,
+            'status': approval_status,
+            'job': job,
+            'apiCost': api_cost,
+            'createdQuestId': content.get('createdQuestId') if isinstance(content, dict) else None,
+            'error': content.get('error') if isinstance(content, dict) else None
+        })
     
+    finished = sum(count for state, count in counts.items() if state not in ('queued', 'processing'))
     return Response({
-        'message': 'Quest generation started',
-        'contentId': content_id,
-        'status': 'processing'
+        'batchId': batch_id,
+        'startedAt': batch['startedAt'],
+        'total': len(content_ids),
+        'finished': finished,
+        'progress': round(finished / len(content_ids) * 100, 1) if content_ids else 100,
+        'statusCounts': counts,
+        'totalCost': total_cost,
+        'items': items
     })
 
 # Import the function from llm.py
@@ -3574,6 +3852,14 @@ def quest_queue(request):
 
 # Fallback quest creation removed - AI generation should work properly
 
+def meaningful_words(text, min_length, limit):
+    """Metindeki en az min_length karakterli ilk `limit` kelimeyi küçük harfle döndürür"""
+    return [word for word in text.lower().split() if len(word) >= min_length][:limit]
+
+def count_matching_words(words, text):
+    """`words` içinden `text` içinde (alt dizi olarak) geçenlerin sayısı"""
+    return sum(1 for word in words if word in text)
+
 def check_duplicate_quest(title, description):
     """Check if a quest with similar title and description already exists"""
     try:
@@ -3590,8 +3876,8 @@ def check_duplicate_quest(title, description):
                 return result[0]
             
             # Check for similar title (fuzzy match) - more precise matching
-            title_words = [word for word in title.lower().split() if len(word) > 3][:4]  # Take meaningful words
-            description_words = [word for word in description.lower().split() if len(word) > 4][:8]  # Take meaningful words
+            title_words = meaningful_words(title, min_length=4, limit=4)
+            description_words = meaningful_words(description, min_length=5, limit=8)
             
             if title_words and len(title_words) >= 2:
                 # Create a more sophisticated search pattern for titles
@@ -3605,7 +3891,7 @@ def check_duplicate_quest(title, description):
                 for result in results:
                     existing_title = result[1].lower()
                     # Check if at least 2 meaningful words match
-                    matching_words = sum(1 for word in title_words if word in existing_title)
+                    matching_words = count_matching_words(title_words, existing_title)
                     if matching_words >= 2:
                         logger.info(f"Found similar quest title: '{result[1]}' matches '{title}' (ID: {result[0]})")
                         return result[0]
@@ -3623,7 +3909,7 @@ def check_duplicate_quest(title, description):
                 for result in results:
                     existing_desc = result[2].lower() if result[2] else ""
                     # Check if at least 3 meaningful words match
-                    matching_words = sum(1 for word in description_words if word in existing_desc)
+                    matching_words = count_matching_words(description_words, existing_desc)
                     if matching_words >= 3:
                         logger.info(f"Found similar quest description: '{result[1]}' (ID: {result[0]})")
                         return result[0]
@@ -3656,6 +3942,7 @@ def create_quest_in_database(quest_data):
                 quest_data['rewardPoints'], 
                 quest_data['difficultyLevel']
             ])
+            invalidate_tags('catalog:quests')
             
             # Get the ID in a separate query using different methods
             try:
@@ -0,0 +1,116 @@
+"""
+JSON render benchmark'ı: eski process_data + JSONRenderer yolu vs. CustomJSONRenderer.
+
+admin_analytics, available_nfts ve list_courses çıktılarına benzer büyük
+payload'lar üzerinde çalışır. Django ve DRF kurulu olmalıdır; veritabanı gerekmez.
+
+Kullanım:
+    python benchmarks/bench_json_render.py --size 20000 --repeat 5
+"""
+import argparse
+import datetime
+import decimal
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+if not settings.configured:
+    settings.configure(INSTALLED_APPS=['rest_framework'], USE_TZ=True)
+    django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from users.utils import CustomJSONRenderer, orjson  # noqa: E402
+
+
+class LegacyJSONRenderer(JSONRenderer):
+    """Önceki CustomJSONRenderer: her yanıtı önce derin kopyalıyordu"""
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is not None:
+            data = self.process_data(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+    def process_data(self, data):
+        if isinstance(data, decimal.Decimal):
+            return float(data)
+        elif isinstance(data, dict):
+            return {key: self.process_data(value) for key, value in data.items()}
+        elif isinstance(data, list):
+            return [self.process_data(item) for item in data]
+        return data
+
+
+def list_courses_payload(size):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        {
+            'CourseID': i, 'Title': f"Course {i}", 'Description': "Lorem ipsum dolor sit amet " * 6,
+            'Category': 'Programming', 'Difficulty': 'beginner', 'CreationDate': now,
+            'ThumbnailURL': f"https://img.example.com/{i}.png", 'InstructorName': f"instructor{i % 40}",
+            'VideoCount': i % 25, 'EnrolledUsers': i * 3, 'Rating': decimal.Decimal('4.35'),
+        }
+        for i in range(size)
+    ]
+
+
+def available_nfts_payload(size):
+    return [
+        {
+            'NFTID': i, 'Title': f"NFT {i}", 'Description': "Collectible " * 8,
+            'ImageURI': f"ipfs://{uuid.uuid4().hex}", 'TradeValue': decimal.Decimal('125.50'),
+            'SubscriptionDays': 30, 'NFTType': 'subscription', 'Owner': uuid.uuid4(),
+            'Rarity': 'rare', 'IsOwned': bool(i % 2),
+        }
+        for i in range(size)
+    ]
+
+
+def admin_analytics_payload(size):
+    today = datetime.date.today()
+    return {
+        'dailyActivity': [
+            {'date': today - datetime.timedelta(days=i), 'users': i, 'revenue': decimal.Decimal(i) / 7}
+            for i in range(size)
+        ],
+        'topCourses': list_courses_payload(size // 10),
+        'summary': {'totalUsers': size, 'totalRevenue': decimal.Decimal('987654.321')},
+    }
+
+
+def bench(renderer, payload, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        renderer.render(payload, 'application/json', {})
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = {
+        'list_courses': list_courses_payload(args.size),
+        'available_nfts': available_nfts_payload(args.size),
+        'admin_analytics': admin_analytics_payload(args.size),
+    }
+    legacy, current = LegacyJSONRenderer(), CustomJSONRenderer()
+    print(f"backend: {'orjson' if orjson else 'stdlib json'}, size={args.size}, best of {args.repeat}")
+    print(f"{'payload':<18} {'legacy':>12} {'custom':>12} {'speedup':>9}")
+    for name, payload in payloads.items():
+        legacy_ms = bench(legacy, payload, args.repeat)
+        current_ms = bench(current, payload, args.repeat)
+        print(f"{name:<18} {legacy_ms:>9.1f} ms {current_ms:>9.1f} ms {legacy_ms / current_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Satır eşleme benchmark'ı: dict-per-row kalıbı vs. wisentia_backend.rows.
+
+Veritabanı gerektirmez; pyodbc cursor'ını taklit eden sahte bir cursor
+üzerinde süre ve tepe bellek (tracemalloc) ölçer.
+
+Kullanım:
+    python benchmarks/bench_row_mapping.py --rows 100000
+"""
+import argparse
+import datetime
+import decimal
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wisentia_backend.rows import fetch_dicts, fetch_rows, iter_rows  # noqa: E402
+
+COLUMNS = ('CourseID', 'Title', 'Description', 'Category', 'Difficulty',
+           'CreationDate', 'ThumbnailURL', 'InstructorName', 'VideoCount', 'Rating')
+
+
+class FakeCursor:
+    """fetchall / fetchmany / description sağlayan pyodbc benzeri cursor"""
+    def __init__(self, rows):
+        self.description = [(name, None, None, None, None, None, None) for name in COLUMNS]
+        self._rows = rows
+        self._pos = 0
+
+    def fetchall(self):
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return rows
+
+    def fetchmany(self, size):
+        rows = self._rows[self._pos:self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+
+def make_rows(count):
+    created = datetime.datetime(2024, 1, 1)
+    return [
+        (i, f"Course {i}", "Lorem ipsum dolor sit amet " * 4, "Programming", "beginner",
+         created, f"https://img.example.com/{i}.png", f"instructor{i % 50}", i % 30,
+         decimal.Decimal("4.25"))
+        for i in range(count)
+    ]
+
+
+def legacy_dicts(cursor):
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def stream_consume(cursor):
+    # Satırları tutmadan tüketir (export senaryosu)
+    total = 0
+    for row in iter_rows(cursor):
+        total += row.VideoCount
+    return total
+
+
+def measure(name, func, rows):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(FakeCursor(rows))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{name:<28} {elapsed * 1000:>10.1f} ms {peak / 1024 / 1024:>10.2f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    print(f"{args.rows} rows, {len(COLUMNS)} columns")
+    print(f"{'method':<28} {'time':>13} {'peak memory':>14}")
+    measure('dict per row (legacy)', legacy_dicts, rows)
+    measure('fetch_dicts', fetch_dicts, rows)
+    measure('fetch_rows (namedtuple)', fetch_rows, rows)
+    measure('iter_rows (streaming)', stream_consume, rows)
+
+
+if __name__ == '__main__':
+    main()
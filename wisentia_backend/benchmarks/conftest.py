@@ -0,0 +1,42 @@
+"""
+pytest-benchmark ile sıcak yol (hot path) mikro benchmark'ları.
+
+Proje settings'i ile Django'yu ayağa kaldırır; veritabanına / Redis'e bağlanmaz.
+Sonuçlar makine bazında benchmarks/baselines/ altında saklanır ve her koşu en
+son kaydedilen baseline ile karşılaştırılır. Ortalama süre eşik değerinden
+(pytest.ini: --benchmark-compare-fail) fazla kötüleşirse koşu başarısız olur.
+
+Kullanım (wisentia_backend/ dizininden):
+    pip install -r benchmarks/requirements.txt
+    pytest benchmarks                          # son baseline ile karşılaştır
+    pytest benchmarks --benchmark-autosave     # bilinçli bir değişiklikten sonra yeni baseline kaydet
+"""
+import logging
+import os
+import sys
+
+import pytest
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wisentia_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Komut satırında --benchmark-storage verilmediyse baseline'ları repo içinde tut
+    if getattr(config.option, 'benchmark_storage', None) == 'file://./.benchmarks':
+        config.option.benchmark_storage = 'file://' + os.path.join(BENCHMARK_DIR, 'baselines')
+
+
+@pytest.fixture(autouse=True)
+def _silence_logging():
+    """Log handler'larının dosya I/O'su ölçümleri oynatmasın; mesaj formatlama yine ölçülür"""
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
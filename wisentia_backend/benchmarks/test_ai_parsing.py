@@ -0,0 +1,80 @@
+"""AI çıktısı işleme: clean_json_string, extract_and_validate_quiz_json ve quest tekrar kontrolü"""
+import json
+
+import pytest
+
+from ai.llm import extract_and_validate_quiz_json
+from ai.views import clean_json_string, count_matching_words, meaningful_words
+
+
+def quiz_json(num_questions):
+    return json.dumps({
+        'title': 'Python Fundamentals',
+        'description': 'Educational quiz based on the introductory Python lecture',
+        'passing_score': 70,
+        'questions': [
+            {
+                'question_text': f"Question {i}: what does the interpreter print for expression {i}?",
+                'question_type': 'multiple_choice',
+                'explanation': 'Operator precedence and integer division rules apply here. ' * 3,
+                'options': [
+                    {'text': f"Option {j} for question {i}", 'is_correct': j == i % 4}
+                    for j in range(4)
+                ],
+            }
+            for i in range(num_questions)
+        ],
+    }, indent=2)
+
+
+def llm_response(num_questions):
+    """Modellerin JSON'u açıklama metni arasına gömdüğü tipik yanıt"""
+    return (
+        "Sure! Here is the quiz you requested, following the exact structure:\n\n"
+        + quiz_json(num_questions)
+        + "\n\nLet me know if you would like harder questions."
+    )
+
+
+def broken_json(num_questions):
+    """Tırnaksız anahtarlar ve fazla virgüller içeren bozuk model çıktısı"""
+    text = quiz_json(num_questions)
+    for key in ('title', 'description', 'passing_score', 'question_type', 'is_correct', 'text'):
+        text = text.replace(f'"{key}":', f'{key}:')
+    return '\ufeff' + text.replace('}\n', '},\n')
+
+
+@pytest.mark.parametrize('num_questions', [5, 30])
+def test_clean_json_string(benchmark, num_questions):
+    raw = broken_json(num_questions)
+    benchmark(clean_json_string, raw)
+
+
+@pytest.mark.parametrize('num_questions', [5, 30])
+def test_extract_and_validate_quiz_json(benchmark, num_questions):
+    response_text = llm_response(num_questions)
+    result = benchmark(extract_and_validate_quiz_json, response_text, num_questions, 70, 'Python')
+    assert result['success']
+
+
+def test_duplicate_quest_word_matching(benchmark):
+    title = 'Complete the Advanced Python Data Structures Challenge'
+    description = (
+        'Finish every lesson in the advanced python course, pass the data structures quiz '
+        'with a high score and start a discussion about dictionaries and sets in the community.'
+    )
+    existing = [
+        (f"complete the advanced python module {i} challenge",
+         f"finish lessons in course {i} and pass the data structures quiz with a score above {i}")
+        for i in range(200)
+    ]
+
+    def match():
+        title_words = meaningful_words(title, min_length=4, limit=4)
+        description_words = meaningful_words(description, min_length=5, limit=8)
+        for existing_title, existing_desc in existing:
+            if count_matching_words(title_words, existing_title) >= 2:
+                continue
+            count_matching_words(description_words, existing_desc)
+
+    benchmark(match)
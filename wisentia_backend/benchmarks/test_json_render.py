@@ -0,0 +1,55 @@
+"""CustomJSONRenderer.render ve get_cache_key: her istekte çalışan yollar"""
+import datetime
+import decimal
+import uuid
+
+import pytest
+
+from users.utils import CustomJSONRenderer
+from wisentia_backend.utils import get_cache_key
+
+
+def list_courses_payload(size):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        {
+            'CourseID': i, 'Title': f"Course {i}", 'Description': "Lorem ipsum dolor sit amet " * 6,
+            'Category': 'Programming', 'Difficulty': 'beginner', 'CreationDate': now,
+            'ThumbnailURL': f"https://img.example.com/{i}.png", 'InstructorName': f"instructor{i % 40}",
+            'VideoCount': i % 25, 'EnrolledUsers': i * 3, 'Rating': decimal.Decimal('4.35'),
+        }
+        for i in range(size)
+    ]
+
+
+def available_nfts_payload(size):
+    return [
+        {
+            'NFTID': i, 'Title': f"NFT {i}", 'Description': "Collectible " * 8,
+            'ImageURI': f"ipfs://{uuid.UUID(int=i).hex}", 'TradeValue': decimal.Decimal('125.50'),
+            'SubscriptionDays': 30, 'NFTType': 'subscription', 'Owner': uuid.UUID(int=i * 7),
+            'Rarity': 'rare', 'IsOwned': bool(i % 2),
+        }
+        for i in range(size)
+    ]
+
+
+@pytest.mark.parametrize('size', [50, 1000])
+def test_render_list_courses(benchmark, size):
+    renderer, payload = CustomJSONRenderer(), list_courses_payload(size)
+    benchmark(renderer.render, payload, 'application/json', {})
+
+
+@pytest.mark.parametrize('size', [50, 1000])
+def test_render_available_nfts(benchmark, size):
+    renderer, payload = CustomJSONRenderer(), available_nfts_payload(size)
+    benchmark(renderer.render, payload, 'application/json', {})
+
+
+def test_cache_key_plain(benchmark):
+    benchmark(get_cache_key, 'course_detail', 42)
+
+
+def test_cache_key_with_params(benchmark):
+    params = {'category': 'Programming', 'difficulty': 'beginner', 'page': 3, 'search': 'python', 'user': 1234}
+    benchmark(get_cache_key, 'courses_list', 'all', params)
@@ -0,0 +1,31 @@
+"""quizzes.views.score_quiz_answers: submit_quiz'in puanlama döngüsü"""
+import pytest
+
+from quizzes.views import score_quiz_answers
+
+
+def quiz_fixture(num_questions):
+    question_types, correct_options, answers = {}, {}, []
+    for qid in range(1, num_questions + 1):
+        kind = ('multiple_choice', 'true_false', 'short_answer')[qid % 3]
+        question_types[qid] = kind
+        correct_options[qid] = [qid * 10 + 1]
+        answers.append({
+            'questionId': qid,
+            'selectedOptionId': qid * 10 + (1 if qid % 2 else 2),
+            'textAnswer': 'free text answer' if kind == 'short_answer' else None,
+        })
+    # Geçersiz / bilinmeyen soru ID'leri de gelebiliyor
+    answers.append({'questionId': None, 'selectedOptionId': 1})
+    answers.append({'questionId': num_questions + 99, 'selectedOptionId': 1})
+    return question_types, correct_options, answers
+
+
+@pytest.mark.parametrize('num_questions', [10, 100])
+def test_score_quiz_answers(benchmark, num_questions):
+    question_types, correct_options, answers = quiz_fixture(num_questions)
+    correct_count, answer_results, scores = benchmark(
+        score_quiz_answers, question_types, correct_options, answers
+    )
+    assert len(answer_results) == num_questions
+    assert correct_count == sum(1 for s in scores if s['isCorrect'])
@@ -0,0 +1,724 @@
+"""
+Ölçek testleri için sentetik veri üretir.
+
+DB.txt'deki tüm tablolar için birbirine referans veren (FK tutarlı) kayıtları
+çok satırlı INSERT'lerle yazar. --scale 10 / 100 ile mevcut hacmin katları,
+--seed ile aynı veri dağılımı yeniden üretilebilir.
+
+Örnek:
+    python manage.py generate_load_data --scale 10 --seed 42
+
+Not: IDENTITY değerleri eklenen satırlar geri okunarak eşlenir; komut ayrı bir
+yük testi veritabanında, eşzamanlı yazma olmadan çalıştırılmalıdır.
+"""
+import hashlib
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from wisentia_backend.schema import schema_registry
+
+# SQL Server: sorgu başına en fazla 2100 parametre, INSERT ... VALUES başına 1000 satır
+MAX_PARAMS_PER_STATEMENT = 2000
+MAX_ROWS_PER_STATEMENT = 1000
+
+# --scale 1 için hacimler (mevcut üretim verisine yakın)
+BASE_VOLUMES = {
+    'users': 1000,
+    'courses': 40,
+    'nfts': 60,
+    'quests': 50,
+    'ai_content': 100,
+}
+
+# Kullanıcı başına ortalama kayıt sayıları (kullanıcı sayısıyla birlikte ölçeklenir)
+PER_USER = {
+    'enrollments': 4,
+    'quiz_attempts': 6,
+    'user_nfts': 3,
+    'trades': 0.1,
+    'quest_progress': 5,
+    'posts': 0.3,
+    'comments_per_post': 3,
+    'likes': 4,
+    'recommendations': 5,
+    'chat_sessions': 2,
+    'messages_per_session': 10,
+    'subscriptions': 0.2,
+    'activity_logs': 200,
+    'notifications': 50,
+}
+
+CATEGORIES = ['Programming', 'Data Science', 'Blockchain', 'Design', 'Mathematics', 'Languages', 'Business']
+DIFFICULTIES = ['beginner', 'intermediate', 'advanced']
+QUEST_DIFFICULTIES = ['easy', 'medium', 'hard']
+QUESTION_TYPES = ['multiple_choice', 'multiple_choice', 'multiple_choice', 'true_false', 'short_answer']
+CONDITION_TYPES = ['course_completion', 'quiz_score', 'watch_videos', 'total_points', 'take_quiz', 'start_discussion']
+NFT_TYPES = {
+    'achievement': 'Earned through completing specific achievements',
+    'subscription': 'Provides access to premium features for a period',
+    'quest_reward': 'Earned by completing quests',
+    'course_completion': 'Earned by completing courses',
+}
+ACTIVITY_TYPES = ['login', 'course_start', 'video_watch', 'quiz_completion', 'quest_progress', 'nft_acquired', 'post_created']
+NOTIFICATION_TYPES = ['system', 'achievement', 'reminder', 'course', 'quest', 'community']
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 Version/17.4 Safari/605.1.15',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148',
+    'Mozilla/5.0 (Linux; Android 14) AppleWebKit/537.36 Chrome/124.0 Mobile Safari/537.36',
+]
+WORDS = (
+    'learn python data model network chain token smart contract design pattern api query index '
+    'function class module async stream cache vector matrix graph proof ledger wallet quiz video '
+    'lesson project challenge practice review advanced basic guide deep dive intro'
+).split()
+
+
+class Command(BaseCommand):
+    help = "Ölçek testleri için DB.txt tablolarına FK tutarlı sentetik veri üretir"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Kullanıcıya bağlı hacim çarpanı (10 = 10x kullanıcı ve aktivite)')
+        parser.add_argument('--catalog-scale', type=float, default=None,
+                            help='Kurs / NFT / quest kataloğu çarpanı (varsayılan: --scale)')
+        parser.add_argument('--seed', type=int, default=42, help='Rastgele üreteç tohumu')
+        parser.add_argument('--days', type=int, default=365, help='Üretilecek geçmiş aralığı (gün)')
+        parser.add_argument('--page-size', type=int, default=5000,
+                            help='Eklenen satırları geri okurken sayfa boyutu')
+        parser.add_argument('--force', action='store_true',
+                            help='DEBUG=False iken de çalıştır')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError("DEBUG=False: üretim veritabanına yazmamak için --force gerekli")
+
+        self.rng = random.Random(options['seed'])
+        self.seed = options['seed']
+        self.scale = options['scale']
+        self.catalog_scale = options['catalog_scale'] or options['scale']
+        self.page_size = options['page_size']
+        self.now = datetime.now().replace(microsecond=0)
+        self.start = self.now - timedelta(days=options['days'])
+        self.totals = {}
+
+        schema_registry.load()
+        started = time.monotonic()
+
+        with connection.cursor() as cursor:
+            self.cursor = cursor
+            users = self.generate_users()
+            courses = self.generate_courses(users)
+            quizzes = self.generate_quizzes(courses)
+            nfts = self.generate_nfts()
+            quests = self.generate_quests(nfts, courses, quizzes)
+            self.generate_learning_activity(users, courses, quizzes)
+            self.generate_nft_ownership(users, nfts)
+            self.generate_quest_progress(users, quests)
+            self.generate_community(users)
+            self.generate_ai_data(users, courses, quests)
+            self.generate_subscriptions(users, nfts)
+            self.generate_logs_and_notifications(users, courses)
+            self.generate_system_settings(users)
+
+        elapsed = time.monotonic() - started
+        for table, count in self.totals.items():
+            self.stdout.write(f"  {table:<24} {count:>12,}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{sum(self.totals.values()):,} rows generated in {elapsed:.1f}s (seed={self.seed}, scale={self.scale})"
+        ))
+
+    # ------------------------------------------------------------------ helpers
+
+    def count(self, base, scale=None):
+        return max(1, int(round(base * (self.scale if scale is None else scale))))
+
+    def per_user(self, key):
+        """Ortalaması PER_USER[key] olan rastgele adet"""
+        mean = PER_USER[key]
+        if mean < 1:
+            return 1 if self.rng.random() < mean else 0
+        return self.rng.randint(0, int(mean * 2))
+
+    def random_date(self, after=None):
+        start = after or self.start
+        span = max(1, int((self.now - start).total_seconds()))
+        return start + timedelta(seconds=self.rng.randrange(span))
+
+    def text(self, words):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words))
+
+    def max_id(self, table, id_column):
+        self.cursor.execute(f"SELECT ISNULL(MAX({id_column}), 0) FROM {table}")
+        return self.cursor.fetchone()[0]
+
+    def insert(self, table, columns, rows):
+        """
+        Satırları çok satırlı INSERT ... VALUES ile yazar. Canlı şemada olmayan
+        kolonlar (ör. opsiyonel Users.IsEmailVerified) atlanır.
+        """
+        keep = [i for i, column in enumerate(columns) if schema_registry.has_column(table, column)]
+        if not keep:
+            raise CommandError(f"{table} tablosu bulunamadı; önce şemayı oluşturun")
+        kept_columns = [columns[i] for i in keep]
+        project = len(keep) != len(columns)
+
+        per_statement = min(MAX_ROWS_PER_STATEMENT, MAX_PARAMS_PER_STATEMENT // len(kept_columns))
+        row_sql = '(' + ', '.join(['%s'] * len(kept_columns)) + ')'
+        prefix = f"INSERT INTO {table} ({', '.join(kept_columns)}) VALUES "
+
+        inserted, batch = 0, []
+
+        def flush():
+            params = [value for row in batch for value in row]
+            self.cursor.execute(prefix + ', '.join([row_sql] * len(batch)), params)
+
+        for row in rows:
+            batch.append([row[i] for i in keep] if project else row)
+            if len(batch) >= per_statement:
+                flush()
+                inserted += len(batch)
+                batch = []
+        if batch:
+            flush()
+            inserted += len(batch)
+
+        self.totals[table] = self.totals.get(table, 0) + inserted
+        return inserted
+
+    def iter_new(self, table, id_column, columns, after_id):
+        """
+        after_id'den sonra eklenen satırları ID sırasıyla sayfa sayfa okur. Her sayfa
+        fetchall ile tamamen alındığı için aynı cursor üzerinde araya INSERT girebilir
+        (MARS kapalı bağlantılarda da güvenli).
+        """
+        select = ', '.join([id_column] + list(columns))
+        last_id = after_id
+        while True:
+            self.cursor.execute(
+                f"SELECT TOP ({int(self.page_size)}) {select} FROM {table} "
+                f"WHERE {id_column} > %s ORDER BY {id_column}",
+                [last_id]
+            )
+            page = self.cursor.fetchall()
+            if not page:
+                return
+            yield from page
+            last_id = page[-1][0]
+
+    def insert_and_fetch(self, table, id_column, columns, rows, fetch_columns=()):
+        """Satırları ekler, yeni ID'leri (ve istenen kolonları) liste olarak döndürür"""
+        after_id = self.max_id(table, id_column)
+        self.insert(table, columns, rows)
+        return [tuple(row) for row in self.iter_new(table, id_column, fetch_columns, after_id)]
+
+    # ------------------------------------------------------------------ generators
+
+    def generate_users(self):
+        user_count = self.count(BASE_VOLUMES['users'])
+        self.stdout.write(f"Users: {user_count:,}")
+        offset = self.max_id('Users', 'UserID')
+        password_hash = hashlib.sha256(b'loadtest').hexdigest()
+
+        def rows():
+            for i in range(user_count):
+                n = offset + i + 1
+                yield (
+                    f"lt{self.seed}_user{n}", f"lt{self.seed}_user{n}@load.test", password_hash,
+                    f"0x{hashlib.sha1(f'{self.seed}:{n}'.encode()).hexdigest()}",
+                    self.random_date(), self.random_date(),
+                    'admin' if self.rng.random() < 0.01 else 'regular',
+                    self.rng.choice(['light', 'dark']), self.rng.randint(0, 5000), 1, 1,
+                )
+
+        users = self.insert_and_fetch('Users', 'UserID', [
+            'Username', 'Email', 'PasswordHash', 'WalletAddress', 'JoinDate', 'LastLogin',
+            'UserRole', 'ThemePreference', 'TotalPoints', 'IsActive', 'IsEmailVerified',
+        ], rows(), ['UserRole'])
+        return {
+            'all': [row[0] for row in users],
+            'admins': [row[0] for row in users if row[1] == 'admin'] or [users[0][0]],
+        }
+
+    def generate_courses(self, users):
+        course_count = self.count(BASE_VOLUMES['courses'], self.catalog_scale)
+        self.stdout.write(f"Courses: {course_count:,}")
+        admins = users['admins']
+
+        course_rows = [
+            (
+                f"{self.text(3).title()} {i + 1}", self.text(40), self.rng.choice(CATEGORIES),
+                self.rng.choice(DIFFICULTIES), self.random_date(), self.now, 1,
+                f"https://img.load.test/course/{i + 1}.png", self.rng.choice(admins),
+            )
+            for i in range(course_count)
+        ]
+        course_ids = [row[0] for row in self.insert_and_fetch('Courses', 'CourseID', [
+            'Title', 'Description', 'Category', 'Difficulty', 'CreationDate', 'UpdatedDate',
+            'IsActive', 'ThumbnailURL', 'CreatedBy',
+        ], course_rows)]
+
+        def video_rows():
+            for course_id in course_ids:
+                for order in range(1, self.rng.randint(8, 15) + 1):
+                    yield (
+                        course_id, hashlib.md5(f"{course_id}:{order}".encode()).hexdigest()[:11],
+                        f"Lesson {order}: {self.text(3)}", self.text(25),
+                        self.rng.randint(180, 3600), order,
+                    )
+
+        videos = {}
+        for video_id, course_id in self.insert_and_fetch('CourseVideos', 'VideoID', [
+            'CourseID', 'YouTubeVideoID', 'Title', 'Description', 'Duration', 'OrderInCourse',
+        ], video_rows(), ['CourseID']):
+            videos.setdefault(course_id, []).append(video_id)
+
+        if schema_registry.has_column('Courses', 'TotalVideos'):
+            self.cursor.execute("""
+                UPDATE c SET TotalVideos = v.VideoCount
+                FROM Courses c
+                JOIN (SELECT CourseID, COUNT(*) AS VideoCount FROM CourseVideos GROUP BY CourseID) v
+                    ON v.CourseID = c.CourseID
+                WHERE c.CourseID >= %s
+            """, [min(course_ids)])
+
+        return {'ids': course_ids, 'videos': videos}
+
+    def generate_quizzes(self, courses):
+        """Her ~3 videoya bir quiz; sorular ve şıklar ile birlikte"""
+        def quiz_rows():
+            for course_id in courses['ids']:
+                for video_id in courses['videos'].get(course_id, [])[::3]:
+                    yield (f"Quiz: {self.text(3)}", self.text(15), self.rng.choice([60, 70, 80]), 1, course_id, video_id)
+
+        quizzes = self.insert_and_fetch('Quizzes', 'QuizID', [
+            'Title', 'Description', 'PassingScore', 'IsActive', 'CourseID', 'VideoID',
+        ], quiz_rows(), ['CourseID', 'VideoID'])
+        self.insert('QuizVideoRelations', ['QuizID', 'VideoID'], ((q[0], q[2]) for q in quizzes))
+
+        def question_rows():
+            for quiz_id, _, _ in quizzes:
+                for order in range(1, self.rng.randint(5, 10) + 1):
+                    yield quiz_id, f"{self.text(10)}?", self.rng.choice(QUESTION_TYPES), order
+
+        questions = self.insert_and_fetch('QuizQuestions', 'QuestionID', [
+            'QuizID', 'QuestionText', 'QuestionType', 'OrderInQuiz',
+        ], question_rows(), ['QuizID', 'QuestionType'])
+
+        def option_rows():
+            for question_id, _, question_type in questions:
+                if question_type == 'short_answer':
+                    continue
+                option_count = 2 if question_type == 'true_false' else 4
+                correct = self.rng.randrange(option_count)
+                for order in range(option_count):
+                    yield question_id, self.text(4), 1 if order == correct else 0, order + 1
+
+        options = {}
+        for option_id, question_id, is_correct in self.insert_and_fetch('QuestionOptions', 'OptionID', [
+            'QuestionID', 'OptionText', 'IsCorrect', 'OrderInQuestion',
+        ], option_rows(), ['QuestionID', 'IsCorrect']):
+            options.setdefault(question_id, []).append((option_id, bool(is_correct)))
+
+        by_course = {}
+        for quiz_id, course_id, _ in quizzes:
+            by_course.setdefault(course_id, []).append(quiz_id)
+        quiz_questions = {}
+        for question_id, quiz_id, question_type in questions:
+            quiz_questions.setdefault(quiz_id, []).append((question_id, question_type, options.get(question_id, [])))
+
+        return {'ids': [q[0] for q in quizzes], 'by_course': by_course, 'questions': quiz_questions}
+
+    def generate_nfts(self):
+        self.cursor.execute("SELECT NFTTypeID, TypeName FROM NFTTypes")
+        types = {name: type_id for type_id, name in self.cursor.fetchall()}
+        missing = [(name, description) for name, description in NFT_TYPES.items() if name not in types]
+        if missing:
+            self.insert('NFTTypes', ['TypeName', 'Description'], missing)
+            self.cursor.execute("SELECT NFTTypeID, TypeName FROM NFTTypes")
+            types = {name: type_id for type_id, name in self.cursor.fetchall()}
+
+        type_names = list(NFT_TYPES)
+        nft_count = self.count(BASE_VOLUMES['nfts'], self.catalog_scale)
+
+        def rows():
+            for i in range(nft_count):
+                type_name = type_names[i % len(type_names)]
+                yield (
+                    types[type_name], f"{type_name.replace('_', ' ').title()} #{i + 1}", self.text(12),
+                    f"ipfs://lt{self.seed}/{i + 1}.png", json.dumps({'seed': self.seed, 'index': i}),
+                    self.rng.choice([10, 25, 50, 100, 250]),
+                    30 * self.rng.randint(1, 12) if type_name == 'subscription' else None, 1,
+                )
+
+        nfts = self.insert_and_fetch('NFTs', 'NFTID', [
+            'NFTTypeID', 'Title', 'Description', 'ImageURI', 'BlockchainMetadata',
+            'TradeValue', 'SubscriptionDays', 'IsActive',
+        ], rows(), ['SubscriptionDays'])
+        return {
+            'ids': [row[0] for row in nfts],
+            'subscription': [(row[0], row[1]) for row in nfts if row[1]],
+        }
+
+    def generate_quests(self, nfts, courses, quizzes):
+        quest_count = self.count(BASE_VOLUMES['quests'], self.catalog_scale)
+
+        def rows():
+            for i in range(quest_count):
+                start = self.random_date()
+                yield (
+                    f"Quest {i + 1}: {self.text(3)}", self.text(20), self.rng.randint(0, 500),
+                    self.rng.choice(nfts['ids']), self.rng.choice([10, 25, 50, 100]),
+                    self.rng.choice(QUEST_DIFFICULTIES), 1, 1 if self.rng.random() < 0.4 else 0,
+                    start, start, start + timedelta(days=self.rng.randint(7, 90)),
+                    self.rng.choice(CATEGORIES),
+                )
+
+        quest_ids = [row[0] for row in self.insert_and_fetch('Quests', 'QuestID', [
+            'Title', 'Description', 'RequiredPoints', 'RewardNFTID', 'RewardPoints', 'DifficultyLevel',
+            'IsActive', 'IsAIGenerated', 'CreationDate', 'StartDate', 'EndDate', 'Category',
+        ], rows())]
+
+        def condition_rows():
+            for quest_id in quest_ids:
+                for _ in range(self.rng.randint(1, 3)):
+                    condition_type = self.rng.choice(CONDITION_TYPES)
+                    if condition_type in ('course_completion', 'watch_videos', 'start_discussion'):
+                        target_id = self.rng.choice(courses['ids'])
+                    elif condition_type in ('quiz_score', 'take_quiz') and quizzes['ids']:
+                        target_id = self.rng.choice(quizzes['ids'])
+                    else:
+                        target_id = None
+                    yield quest_id, condition_type, target_id, self.rng.randint(1, 100), self.text(8)
+
+        self.insert('QuestConditions', ['QuestID', 'ConditionType', 'TargetID', 'TargetValue', 'Description'],
+                    condition_rows())
+        return quest_ids
+
+    def generate_learning_activity(self, users, courses, quizzes):
+        """Kayıt, kurs ilerlemesi, video izleme, quiz denemeleri ve cevaplar"""
+        enrollments = []  # (user_id, course_id, enrolled_at)
+        progress_rows, view_rows = [], []
+        has_enrollments = schema_registry.has_table('UserCourseEnrollments')
+        course_ids = courses['ids']
+
+        def flush():
+            if has_enrollments:
+                self.insert('UserCourseEnrollments', ['UserID', 'CourseID', 'EnrollmentDate'], enrollments)
+            self.insert('UserCourseProgress', [
+                'UserID', 'CourseID', 'LastVideoID', 'CompletionPercentage', 'LastAccessDate',
+                'IsCompleted', 'CompletionDate',
+            ], progress_rows)
+            self.insert('UserVideoViews', [
+                'UserID', 'VideoID', 'ViewDate', 'WatchedPercentage', 'IsCompleted', 'CompletionDate',
+                'EarnedPoints',
+            ], view_rows)
+            enrollments.clear()
+            progress_rows.clear()
+            view_rows.clear()
+
+        attempts = []  # (user_id, quiz_id) - cevaplar attempt ID'leri okunduktan sonra üretilir
+        for user_id in users['all']:
+            for course_id in self.rng.sample(course_ids, min(len(course_ids), self.per_user('enrollments'))):
+                enrolled_at = self.random_date()
+                videos = courses['videos'].get(course_id, [])
+                watched = videos[:self.rng.randint(0, len(videos))]
+                completed = bool(videos) and len(watched) == len(videos)
+                enrollments.append((user_id, course_id, enrolled_at))
+                progress_rows.append((
+                    user_id, course_id, watched[-1] if watched else None,
+                    round(100.0 * len(watched) / len(videos), 2) if videos else 0,
+                    self.random_date(enrolled_at), 1 if completed else 0,
+                    self.random_date(enrolled_at) if completed else None,
+                ))
+                for video_id in watched:
+                    viewed_at = self.random_date(enrolled_at)
+                    done = self.rng.random() < 0.8
+                    view_rows.append((
+                        user_id, video_id, viewed_at, 100 if done else self.rng.randint(5, 95),
+                        1 if done else 0, viewed_at if done else None, 10 if done else 0,
+                    ))
+                for quiz_id in quizzes['by_course'].get(course_id, []):
+                    if self.rng.random() < PER_USER['quiz_attempts'] / 10:
+                        attempts.append((user_id, quiz_id))
+            if len(view_rows) >= 50000:
+                flush()
+        flush()
+
+        after_id = self.max_id('UserQuizAttempts', 'AttemptID')
+
+        def attempt_rows():
+            for user_id, quiz_id in attempts:
+                score = self.rng.randint(0, 100)
+                yield user_id, quiz_id, score, 100, self.random_date(), 1 if score >= 70 else 0, 10 + (20 if score >= 70 else 0)
+
+        self.insert('UserQuizAttempts', [
+            'UserID', 'QuizID', 'Score', 'MaxScore', 'AttemptDate', 'Passed', 'EarnedPoints',
+        ], attempt_rows())
+        del attempts
+
+        def answer_rows():
+            for attempt_id, quiz_id in self.iter_new('UserQuizAttempts', 'AttemptID', ['QuizID'], after_id):
+                for question_id, question_type, options in quizzes['questions'].get(quiz_id, []):
+                    if question_type == 'short_answer' or not options:
+                        yield attempt_id, question_id, None, self.text(6), 0
+                        continue
+                    option_id, is_correct = self.rng.choice(options)
+                    yield attempt_id, question_id, option_id, None, 1 if is_correct else 0
+
+        self.insert('UserQuizAnswers', [
+            'AttemptID', 'QuestionID', 'SelectedOptionID', 'TextAnswer', 'IsCorrect',
+        ], answer_rows())
+
+    def generate_nft_ownership(self, users, nfts):
+        def user_nft_rows():
+            for user_id in users['all']:
+                for nft_id in self.rng.sample(nfts['ids'], min(len(nfts['ids']), self.per_user('user_nfts'))):
+                    acquired = self.random_date()
+                    minted = self.rng.random() < 0.6
+                    yield (
+                        user_id, nft_id, acquired, None,
+                        f"0x{self.rng.getrandbits(256):064x}" if minted else None, 1 if minted else 0,
+                    )
+
+        owned = self.insert_and_fetch('UserNFTs', 'UserNFTID', [
+            'UserID', 'NFTID', 'AcquisitionDate', 'ExpiryDate', 'TransactionHash', 'IsMinted',
+        ], user_nft_rows(), ['UserID'])
+        if not owned:
+            return
+
+        owned_by_user = {}
+        for user_nft_id, user_id in owned:
+            owned_by_user.setdefault(user_id, []).append(user_nft_id)
+
+        def trade_rows():
+            offer_users = list(owned_by_user)
+            for _ in range(int(len(users['all']) * PER_USER['trades'])):
+                status = self.rng.choice(['pending', 'completed', 'rejected'])
+                created = self.random_date()
+                yield (
+                    self.rng.choice(offer_users), self.rng.choice(nfts['ids']), status, created,
+                    created if status == 'completed' else None,
+                )
+
+        trades = self.insert_and_fetch('NFTTrades', 'TradeID', [
+            'OfferUserID', 'TargetNFTID', 'TradeStatus', 'CreationDate', 'CompletionDate',
+        ], trade_rows(), ['OfferUserID'])
+        # Teklif edilen NFT, teklifi yapan kullanıcıya ait olmalı
+        self.insert('NFTTradeDetails', ['TradeID', 'OfferedUserNFTID'], (
+            (trade_id, self.rng.choice(owned_by_user[user_id])) for trade_id, user_id in trades
+        ))
+
+    def generate_quest_progress(self, users, quests):
+        def rows():
+            for user_id in users['all']:
+                for quest_id in self.rng.sample(quests, min(len(quests), self.per_user('quest_progress'))):
+                    completed = self.rng.random() < 0.3
+                    yield (
+                        user_id, quest_id, 100 if completed else self.rng.randint(0, 99), 1 if completed else 0,
+                        self.random_date() if completed else None, 1 if completed and self.rng.random() < 0.5 else 0,
+                    )
+
+        self.insert('UserQuestProgress', [
+            'UserID', 'QuestID', 'CurrentProgress', 'IsCompleted', 'CompletionDate', 'RewardClaimed',
+        ], rows())
+
+    def generate_community(self, users):
+        user_ids = users['all']
+
+        def post_rows():
+            for user_id in user_ids:
+                for _ in range(self.per_user('posts')):
+                    yield (
+                        user_id, self.text(6).capitalize(), self.text(80), self.random_date(),
+                        self.rng.choice(CATEGORIES), self.rng.choice([0, 0, 0, 10, 25]),
+                        self.rng.randint(0, 200), self.rng.randint(0, 5000), 1,
+                    )
+
+        posts = self.insert_and_fetch('CommunityPosts', 'PostID', [
+            'UserID', 'Title', 'Content', 'CreationDate', 'Category', 'PointsCost', 'Likes', 'Views', 'IsActive',
+        ], post_rows(), ['CreationDate'])
+        if not posts:
+            return
+
+        def comment_rows():
+            for post_id, created in posts:
+                for _ in range(self.rng.randint(0, PER_USER['comments_per_post'] * 2)):
+                    yield post_id, self.rng.choice(user_ids), self.text(30), self.random_date(created), self.rng.randint(0, 50), 1
+
+        comments = self.insert_and_fetch('CommunityComments', 'CommentID', [
+            'PostID', 'UserID', 'Content', 'CreationDate', 'Likes', 'IsActive',
+        ], comment_rows(), ['PostID'])
+
+        # Yanıt zinciri: yorumların ~%20'si aynı gönderinin ilk yorumuna yanıt (tek set-based UPDATE)
+        if comments:
+            self.cursor.execute("""
+                UPDATE c SET ParentCommentID = f.FirstCommentID
+                FROM CommunityComments c
+                JOIN (
+                    SELECT PostID, MIN(CommentID) AS FirstCommentID
+                    FROM CommunityComments WHERE CommentID >= %s
+                    GROUP BY PostID
+                ) f ON f.PostID = c.PostID
+                WHERE c.CommentID > f.FirstCommentID AND c.CommentID %% 5 = 0
+            """, [comments[0][0]])
+
+        post_ids = [post[0] for post in posts]
+        comment_ids = [comment[0] for comment in comments]
+
+        def like_rows():
+            for user_id in user_ids:
+                count = self.per_user('likes')
+                for post_id in self.rng.sample(post_ids, min(len(post_ids), count // 2 + count % 2)):
+                    yield user_id, post_id, None, self.random_date()
+                for comment_id in self.rng.sample(comment_ids, min(len(comment_ids), count // 2)):
+                    yield user_id, None, comment_id, self.random_date()
+
+        self.insert('UserLikes', ['UserID', 'PostID', 'CommentID', 'LikeDate'], like_rows())
+
+    def generate_ai_data(self, users, courses, quests):
+        user_ids = users['all']
+
+        def recommendation_rows():
+            for user_id in user_ids:
+                for _ in range(self.per_user('recommendations')):
+                    kind = self.rng.choice(['course', 'quest'])
+                    target = self.rng.choice(courses['ids'] if kind == 'course' else quests)
+                    yield (
+                        user_id, kind, target, self.text(15), round(self.rng.uniform(40, 99), 2),
+                        self.random_date(), self.rng.randint(0, 1), 0,
+                    )
+
+        self.insert('AIRecommendations', [
+            'UserID', 'RecommendationType', 'TargetID', 'RecommendationReason', 'Confidence',
+            'CreationDate', 'IsViewed', 'IsDismissed',
+        ], recommendation_rows())
+
+        self.insert('AIUserAnalytics', [
+            'UserID', 'LearningStyle', 'InterestCategories', 'StrengthAreas', 'WeaknessAreas',
+            'EngagementLevel', 'LastUpdated',
+        ], (
+            (
+                user_id, self.rng.choice(['visual', 'auditory', 'reading', 'kinesthetic']),
+                json.dumps(self.rng.sample(CATEGORIES, 3)), json.dumps(self.rng.sample(WORDS, 3)),
+                json.dumps(self.rng.sample(WORDS, 2)), round(self.rng.uniform(0, 100), 2), self.random_date(),
+            )
+            for user_id in user_ids
+        ))
+
+        after_id = self.max_id('ChatSessions', 'SessionID')
+
+        def session_rows():
+            for user_id in user_ids:
+                for _ in range(self.per_user('chat_sessions')):
+                    started = self.random_date()
+                    yield user_id, started, started + timedelta(minutes=self.rng.randint(1, 90)), 0
+
+        self.insert('ChatSessions', ['UserID', 'StartTime', 'EndTime', 'IsActive'], session_rows())
+
+        def message_rows():
+            for session_id, started in self.iter_new('ChatSessions', 'SessionID', ['StartTime'], after_id):
+                for i in range(self.rng.randint(2, PER_USER['messages_per_session'] * 2)):
+                    yield (
+                        session_id, 'user' if i % 2 == 0 else 'ai', self.text(12 if i % 2 == 0 else 60),
+                        started + timedelta(seconds=30 * i),
+                        self.rng.choice(courses['ids']) if self.rng.random() < 0.2 else None,
+                        self.rng.choice(quests) if self.rng.random() < 0.1 else None,
+                    )
+
+        self.insert('ChatMessages', [
+            'SessionID', 'SenderType', 'MessageContent', 'Timestamp', 'RelatedCourseID', 'RelatedQuestID',
+        ], message_rows())
+
+        self.insert('AIGeneratedContent', [
+            'ContentType', 'Content', 'GenerationParams', 'CreationDate', 'ApprovalStatus', 'ApprovalDate',
+            'ApprovedBy',
+        ], (
+            (
+                self.rng.choice(['quest', 'quiz_question', 'recommendation']), self.text(50),
+                json.dumps({'model': 'llama', 'seed': self.seed}), created, status,
+                created if status != 'pending' else None,
+                self.rng.choice(users['admins']) if status != 'pending' else None,
+            )
+            for _ in range(self.count(BASE_VOLUMES['ai_content'], self.catalog_scale))
+            for created, status in [(self.random_date(), self.rng.choice(['pending', 'approved', 'rejected']))]
+        ))
+
+    def generate_subscriptions(self, users, nfts):
+        plans = self.insert_and_fetch('SubscriptionPlans', 'PlanID', [
+            'PlanName', 'Description', 'DurationDays', 'Price', 'NFTID', 'Features', 'IsActive',
+        ], [
+            (
+                f"LT{self.seed} {name}", f"{name} plan", days, price,
+                nfts['subscription'][i % len(nfts['subscription'])][0] if nfts['subscription'] else None,
+                json.dumps(['premium_courses', 'ai_chat'][:i + 1]), 1,
+            )
+            for i, (name, days, price) in enumerate([('Monthly', 30, 9.99), ('Quarterly', 90, 24.99), ('Yearly', 365, 89.99)])
+        ], ['DurationDays'])
+
+        def rows():
+            for user_id in users['all']:
+                for _ in range(self.per_user('subscriptions')):
+                    plan_id, days = self.rng.choice(plans)
+                    started = self.random_date()
+                    ends = started + timedelta(days=days)
+                    yield (
+                        user_id, plan_id, started, ends, 1 if ends > self.now else 0,
+                        f"0x{self.rng.getrandbits(128):032x}", self.rng.choice(['wallet', 'card']),
+                        self.rng.randint(0, 1),
+                    )
+
+        self.insert('UserSubscriptions', [
+            'UserID', 'PlanID', 'StartDate', 'EndDate', 'IsActive', 'PaymentTransactionID',
+            'PaymentMethod', 'AutoRenew',
+        ], rows())
+
+    def generate_logs_and_notifications(self, users, courses):
+        """En büyük tablolar: kullanıcı başına yüzlerce satır, üretici ile akıtılır"""
+        def activity_rows():
+            for user_id in users['all']:
+                ip = f"10.{self.rng.randint(0, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}"
+                agent = self.rng.choice(USER_AGENTS)
+                for _ in range(self.per_user('activity_logs')):
+                    activity = self.rng.choice(ACTIVITY_TYPES)
+                    yield user_id, activity, f"{activity} {self.text(4)}", self.random_date(), ip, agent
+
+        self.stdout.write("ActivityLogs...")
+        self.insert('ActivityLogs', [
+            'UserID', 'ActivityType', 'Description', 'Timestamp', 'IPAddress', 'UserAgent',
+        ], activity_rows())
+
+        def notification_rows():
+            for user_id in users['all']:
+                for _ in range(self.per_user('notifications')):
+                    created = self.random_date()
+                    read = self.rng.random() < 0.7
+                    yield (
+                        user_id, self.text(4).capitalize(), self.text(20), self.rng.choice(NOTIFICATION_TYPES),
+                        self.rng.choice(courses['ids']), 1 if read else 0,
+                        1 if read and self.rng.random() < 0.3 else 0, created,
+                    )
+
+        self.stdout.write("Notifications...")
+        self.insert('Notifications', [
+            'UserID', 'Title', 'Message', 'NotificationType', 'RelatedEntityID', 'IsRead', 'IsDismissed',
+            'CreationDate',
+        ], notification_rows())
+
+    def generate_system_settings(self, users):
+        self.cursor.execute("SELECT SettingKey FROM SystemSettings WHERE SettingKey LIKE %s", [f"lt{self.seed}_%"])
+        existing = {row[0] for row in self.cursor.fetchall()}
+        self.insert('SystemSettings', ['SettingKey', 'SettingValue', 'Description', 'LastUpdated', 'UpdatedBy'], [
+            (key, value, 'Load test setting', self.now, users['admins'][0])
+            for key, value in [
+                (f"lt{self.seed}_scale", str(self.scale)),
+                (f"lt{self.seed}_generated_at", self.now.isoformat()),
+            ]
+            if key not in existing
+        ])
@@ -0,0 +1,136 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from wisentia_backend.schema import schema_registry
+
+
+# Çalışma zamanında değil, açık bir bootstrap adımında oluşturulan tablolar
+BOOTSTRAP_TABLES = {
+    'UserCourseEnrollments': """
+        CREATE TABLE UserCourseEnrollments (
+            EnrollmentID INT IDENTITY(1,1) PRIMARY KEY,
+            UserID INT NOT NULL,
+            CourseID INT NOT NULL,
+            EnrollmentDate DATETIME NOT NULL DEFAULT GETDATE(),
+            CONSTRAINT FK_UserCourseEnrollments_Users FOREIGN KEY (UserID) REFERENCES Users(UserID),
+            CONSTRAINT FK_UserCourseEnrollments_Courses FOREIGN KEY (CourseID) REFERENCES Courses(CourseID),
+            CONSTRAINT UQ_UserCourseEnrollments UNIQUE (UserID, CourseID)
+        )
+    """,
+    'UserCourseProgress': """
+        CREATE TABLE UserCourseProgress (
+            ProgressID INT IDENTITY(1,1) PRIMARY KEY,
+            UserID INT NOT NULL,
+            CourseID INT NOT NULL,
+            LastVideoID INT NULL,
+            CompletionPercentage FLOAT NOT NULL DEFAULT 0,
+            LastAccessDate DATETIME NOT NULL DEFAULT GETDATE(),
+            IsCompleted BIT NOT NULL DEFAULT 0,
+            CONSTRAINT FK_UserCourseProgress_Users FOREIGN KEY (UserID) REFERENCES Users(UserID),
+            CONSTRAINT FK_UserCourseProgress_Courses FOREIGN KEY (CourseID) REFERENCES Courses(CourseID),
+            CONSTRAINT UQ_UserCourseProgress UNIQUE (UserID, CourseID)
+        )
+    """,
+    # ai/transcripts.py: YouTube ID + Whisper modeli başına transcript deposu
+    'VideoTranscripts': """
+        CREATE TABLE VideoTranscripts (
+            TranscriptID INT IDENTITY(1,1) PRIMARY KEY,
+            YouTubeVideoID NVARCHAR(20) NOT NULL,
+            ModelName NVARCHAR(50) NOT NULL,
+            Transcript NVARCHAR(MAX) NOT NULL,
+            ProcessingSeconds FLOAT NULL,
+            CreationDate DATETIME NOT NULL DEFAULT GETDATE(),
+            CONSTRAINT UQ_VideoTranscripts UNIQUE (YouTubeVideoID, ModelName)
+        )
+    """,
+    # ai/jobs.py: quest/quiz üretimi için kalıcı iş kuyruğu (run_ai_workers)
+    'AIJobs': """
+        CREATE TABLE AIJobs (
+            JobID INT IDENTITY(1,1) PRIMARY KEY,
+            JobType NVARCHAR(50) NOT NULL,
+            Payload NVARCHAR(MAX) NOT NULL,
+            ContentID INT NULL,
+            Status NVARCHAR(20) NOT NULL DEFAULT 'queued',
+            Attempts INT NOT NULL DEFAULT 0,
+            MaxAttempts INT NOT NULL DEFAULT 3,
+            AvailableAt DATETIME NOT NULL DEFAULT GETDATE(),
+            LeasedBy NVARCHAR(200) NULL,
+            LeaseExpiresAt DATETIME NULL,
+            HeartbeatAt DATETIME NULL,
+            LastError NVARCHAR(MAX) NULL,
+            Result NVARCHAR(MAX) NULL,
+            CreationDate DATETIME NOT NULL DEFAULT GETDATE(),
+            CompletedAt DATETIME NULL
+        );
+        CREATE INDEX IX_AIJobs_Claim ON AIJobs (Status, AvailableAt) INCLUDE (LeaseExpiresAt, Attempts, MaxAttempts, JobType);
+    """,
+}
+
+# Mevcut tablolara eklenen kolonlar: (tablo, kolon) -> DDL
+BOOTSTRAP_COLUMNS = {
+    # ai/stream_checkpoint.py: akışla üretilen AI mesajının durumu (streaming/complete/interrupted)
+    ('ChatMessages', 'Status'): """
+        ALTER TABLE ChatMessages
+        ADD Status NVARCHAR(20) NOT NULL CONSTRAINT DF_ChatMessages_Status DEFAULT 'complete'
+    """,
+}
+
+# Eski UserCourseProgress kayıtlarını UserCourseEnrollments ile eşitler
+SYNC_ENROLLMENTS_SQL = """
+    INSERT INTO UserCourseEnrollments (UserID, CourseID, EnrollmentDate)
+    SELECT DISTINCT UserID, CourseID, LastAccessDate
+    FROM UserCourseProgress
+    WHERE NOT EXISTS (
+        SELECT 1 FROM UserCourseEnrollments
+        WHERE UserCourseEnrollments.UserID = UserCourseProgress.UserID
+        AND UserCourseEnrollments.CourseID = UserCourseProgress.CourseID
+    )
+"""
+
+
+class Command(BaseCommand):
+    help = "Veritabanı şemasını inceler; --bootstrap ile eksik kurs/transcript/iş kuyruğu tablolarını ve kolonları oluşturur"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bootstrap', action='store_true',
+                            help='Eksik tabloları/kolonları oluştur ve kayıt senkronizasyonunu çalıştır')
+        parser.add_argument('--table', action='append', default=[],
+                            help='Sadece belirtilen tablonun kolonlarını göster (tekrarlanabilir)')
+
+    def handle(self, *args, **options):
+        schema_registry.load()
+
+        if options['bootstrap']:
+            self.bootstrap()
+            schema_registry.refresh()
+
+        tables = options['table'] or schema_registry.table_names()
+        for table in tables:
+            if not schema_registry.has_table(table):
+                self.stdout.write(self.style.WARNING(f"{table}: missing"))
+                continue
+            columns = schema_registry.columns(table)
+            self.stdout.write(f"{table}: {len(columns)} columns")
+            if options['table']:
+                for column in columns:
+                    self.stdout.write(f"  - {column}")
+
+    def bootstrap(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            for table, ddl in BOOTSTRAP_TABLES.items():
+                if schema_registry.has_table(table):
+                    continue
+                self.stdout.write(f"Creating {table} table...")
+                cursor.execute(ddl)
+                self.stdout.write(self.style.SUCCESS(f"{table} table created"))
+
+            for (table, column), ddl in BOOTSTRAP_COLUMNS.items():
+                if not schema_registry.has_table(table) or schema_registry.has_column(table, column):
+                    continue
+                self.stdout.write(f"Adding {table}.{column} column...")
+                cursor.execute(ddl)
+                self.stdout.write(self.style.SUCCESS(f"{table}.{column} column added"))
+
+            self.stdout.write("Syncing existing enrollment records...")
+            cursor.execute(SYNC_ENROLLMENTS_SQL)
+            self.stdout.write(self.style.SUCCESS(f"{cursor.rowcount} enrollment records synced"))
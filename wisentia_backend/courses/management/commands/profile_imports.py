@@ -0,0 +1,127 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Ayrı bir süreçte çalışır: worker açılışını (django.setup + URLconf) taklit eder
+PROBE_SCRIPT = """
+import json, sys, time
+
+def rss_kb():
+    try:
+        with open('/proc/self/status') as status:
+            fields = dict(line.split(':', 1) for line in status if ':' in line)
+        return int(fields['VmRSS'].split()[0]), int(fields['VmHWM'].split()[0])
+    except (OSError, KeyError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            peak //= 1024
+        return None, peak
+
+stages = []
+def mark(name, started):
+    rss, peak = rss_kb()
+    stages.append({'stage': name, 'seconds': time.perf_counter() - started, 'rss_kb': rss, 'peak_kb': peak})
+
+started = time.perf_counter()
+mark('interpreter', started)
+
+import django
+django.setup()
+mark('django.setup', started)
+
+from django.urls import get_resolver
+get_resolver().url_patterns
+mark('urlconf', started)
+
+from wisentia_backend.lazy import _registry, lazy_import_stats
+if %(load_lazy)r:
+    for module in list(_registry.values()):
+        try:
+            module._load()
+        except ImportError:
+            pass  # kurulu değilse süre None kalır
+    mark('lazy modules', started)
+
+print(json.dumps({'stages': stages, 'lazy': lazy_import_stats()}))
+"""
+
+
+def parse_importtime(stderr):
+    """-X importtime çıktısı -> [(modül, self_us, cumulative_us)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            rows.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Worker açılışındaki import maliyetini (modül/paket bazında süre) ve bellek kullanımını raporlar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=25, help='Listelenecek en pahalı modül/paket sayısı')
+        parser.add_argument('--load-lazy', action='store_true',
+                            help='Tembel modülleri (whisper, yt_dlp, web3) de yükleyerek karşılaştır')
+        parser.add_argument('--json', action='store_true', help='Sonucu JSON olarak yaz')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'wisentia_backend.settings'))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROBE_SCRIPT % {'load_lazy': options['load_lazy']}],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        try:
+            probe = json.loads(result.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            raise CommandError(f"Import probe failed:\n{result.stderr[-4000:]}")
+
+        modules = parse_importtime(result.stderr)
+        packages = defaultdict(int)
+        for name, self_us, _ in modules:
+            packages[name.split('.')[0]] += self_us
+
+        top_modules = sorted(modules, key=lambda row: row[2], reverse=True)[:options['top']]
+        top_packages = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:options['top']]
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'stages': probe['stages'],
+                'lazy': probe['lazy'],
+                'total_import_ms': sum(row[1] for row in modules) / 1000,
+                'packages': [{'package': name, 'self_ms': us / 1000} for name, us in top_packages],
+                'modules': [{'module': name, 'self_ms': s / 1000, 'cumulative_ms': c / 1000} for name, s, c in top_modules],
+            }, indent=2))
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Açılış aşamaları'))
+        for stage in probe['stages']:
+            rss = f"{stage['rss_kb'] / 1024:.1f} MB" if stage['rss_kb'] is not None else '-'
+            self.stdout.write(
+                f"  {stage['stage']:<16} {stage['seconds'] * 1000:>9.1f} ms   RSS {rss:>10}   peak {stage['peak_kb'] / 1024:.1f} MB"
+            )
+        self.stdout.write(f"  toplam import süresi: {sum(row[1] for row in modules) / 1000:.1f} ms ({len(modules)} modül)")
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Tembel modüller'))
+        for name, seconds in probe['lazy'].items():
+            state = f"{seconds * 1000:.1f} ms" if seconds is not None else 'yüklenmedi'
+            self.stdout.write(f"  {name:<30} {state}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'En pahalı {len(top_packages)} paket (self)'))
+        for name, us in top_packages:
+            self.stdout.write(f"  {us / 1000:>9.1f} ms  {name}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'En pahalı {len(top_modules)} modül (cumulative)'))
+        for name, self_us, cumulative_us in top_modules:
+            self.stdout.write(f"  {cumulative_us / 1000:>9.1f} ms  (self {self_us / 1000:.1f})  {name}")
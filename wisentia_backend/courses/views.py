@@ -5,89 +5,15 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from wisentia_backend.utils import cache_response
+from wisentia_backend.utils import cache_response, invalidate_tags
+from wisentia_backend.schema import has_table, has_column
+from wisentia_backend.log_pipeline import debug_print
 from django.core.cache import cache
 import json
 from django.http import JsonResponse
-import pyodbc
 from datetime import datetime, timedelta
 
 
-# Ensure UserCourseEnrollments table exists
-def ensure_course_tables_exist():
-    with connection.cursor() as cursor:
-        try:
-            # Check if UserCourseEnrollments table exists
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM INFORMATION_SCHEMA.TABLES 
-                WHERE TABLE_NAME = 'UserCourseEnrollments'
-            """)
-            
-            table_exists = cursor.fetchone()[0] > 0
-            
-            if not table_exists:
-                print("Creating UserCourseEnrollments table...")
-                # Create the UserCourseEnrollments table
-                cursor.execute("""
-                    CREATE TABLE UserCourseEnrollments (
-                        EnrollmentID INT IDENTITY(1,1) PRIMARY KEY,
-                        UserID INT NOT NULL,
-                        CourseID INT NOT NULL,
-                        EnrollmentDate DATETIME NOT NULL DEFAULT GETDATE(),
-                        CONSTRAINT FK_UserCourseEnrollments_Users FOREIGN KEY (UserID) REFERENCES Users(UserID),
-                        CONSTRAINT FK_UserCourseEnrollments_Courses FOREIGN KEY (CourseID) REFERENCES Courses(CourseID),
-                        CONSTRAINT UQ_UserCourseEnrollments UNIQUE (UserID, CourseID)
-                    )
-                """)
-                print("UserCourseEnrollments table created successfully")
-            
-            # Also check if UserCourseProgress table exists
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM INFORMATION_SCHEMA.TABLES 
-                WHERE TABLE_NAME = 'UserCourseProgress'
-            """)
-            
-            progress_table_exists = cursor.fetchone()[0] > 0
-            
-            if not progress_table_exists:
-                print("Creating UserCourseProgress table...")
-                # Create the UserCourseProgress table
-                cursor.execute("""
-                    CREATE TABLE UserCourseProgress (
-                        ProgressID INT IDENTITY(1,1) PRIMARY KEY,
-                        UserID INT NOT NULL,
-                        CourseID INT NOT NULL,
-                        LastVideoID INT NULL,
-                        CompletionPercentage FLOAT NOT NULL DEFAULT 0,
-                        LastAccessDate DATETIME NOT NULL DEFAULT GETDATE(),
-                        IsCompleted BIT NOT NULL DEFAULT 0,
-                        CONSTRAINT FK_UserCourseProgress_Users FOREIGN KEY (UserID) REFERENCES Users(UserID),
-                        CONSTRAINT FK_UserCourseProgress_Courses FOREIGN KEY (CourseID) REFERENCES Courses(CourseID),
-                        CONSTRAINT UQ_UserCourseProgress UNIQUE (UserID, CourseID)
-                    )
-                """)
-                print("UserCourseProgress table created successfully")
-                
-            # Sync existing records between tables
-            print("Syncing existing enrollment records...")
-            cursor.execute("""
-                INSERT INTO UserCourseEnrollments (UserID, CourseID, EnrollmentDate)
-                SELECT DISTINCT UserID, CourseID, LastAccessDate
-                FROM UserCourseProgress
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM UserCourseEnrollments
-                    WHERE UserCourseEnrollments.UserID = UserCourseProgress.UserID
-                    AND UserCourseEnrollments.CourseID = UserCourseProgress.CourseID
-                )
-            """)
-            print("Enrollment records synced successfully")
-                
-        except Exception as e:
-            print(f"Error ensuring course tables exist: {str(e)}")
-
-
 @swagger_auto_schema(
     method='get',
     manual_parameters=[
@@ -122,34 +48,14 @@ def ensure_course_tables_exist():
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_response(key_prefix='courses_list', tags=['catalog:courses'])
 def list_courses(request):
     category = request.query_params.get('category')
     difficulty = request.query_params.get('difficulty')
     
     with connection.cursor() as cursor:
-        # Check if UserCourseRatings table exists
-        try:
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM INFORMATION_SCHEMA.TABLES 
-                WHERE TABLE_NAME = 'UserCourseRatings'
-            """)
-            ratings_table_exists = cursor.fetchone()[0] > 0
-        except Exception as e:
-            print(f"Error checking if UserCourseRatings table exists: {str(e)}")
-            ratings_table_exists = False
-            
-        # Check if UserCourseEnrollments table exists
-        try:
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM INFORMATION_SCHEMA.TABLES 
-                WHERE TABLE_NAME = 'UserCourseEnrollments'
-            """)
-            enrollments_table_exists = cursor.fetchone()[0] > 0
-        except Exception as e:
-            print(f"Error checking if UserCourseEnrollments table exists: {str(e)}")
-            enrollments_table_exists = False
+        ratings_table_exists = has_table('UserCourseRatings')
+        enrollments_table_exists = has_table('UserCourseEnrollments')
         
         # Modify queries based on table existence
         if enrollments_table_exists:
@@ -226,17 +132,7 @@ def list_courses(request):
 @permission_classes([AllowAny])
 def course_detail(request, course_id):
     with connection.cursor() as cursor:
-        # Check if UserCourseRatings table exists
-        try:
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM INFORMATION_SCHEMA.TABLES 
-                WHERE TABLE_NAME = 'UserCourseRatings'
-            """)
-            table_exists = cursor.fetchone()[0] > 0
-        except Exception as e:
-            print(f"Error checking if UserCourseRatings table exists: {str(e)}")
-            table_exists = False
+        table_exists = has_table('UserCourseRatings')
         
         # Kurs bilgilerini al - with modified query based on table existence
         if table_exists:
@@ -269,7 +165,7 @@ def course_detail(request, course_id):
             SELECT COUNT(DISTINCT UserID) FROM UserCourseEnrollments WHERE CourseID = %s
         """, [course_id])
         direct_count = cursor.fetchone()[0]
-        print(f"Debug: Course {course_id} - Direct enrollment count from UserCourseEnrollments: {direct_count}")
+        debug_print("Debug: Course %s - Direct enrollment count from UserCourseEnrollments: %s", course_id, direct_count)
         
         # Force the enrollment count to be accurate by overriding any value in course data
         course['EnrolledUsers'] = direct_count
@@ -282,7 +178,7 @@ def course_detail(request, course_id):
         """, [course_id])
         
         enrollment_records = cursor.fetchall()
-        print(f"Debug: Course {course_id} - Enrollment records: {enrollment_records}")
+        debug_print("Debug: Course %s - Enrollment records: %s", course_id, enrollment_records)
         
         # Kurs videolarını al
         cursor.execute("""
@@ -309,7 +205,7 @@ def course_detail(request, course_id):
                     WHERE CourseID = %s
                 """, [len(videos), course_id])
             except Exception as e:
-                print(f"Error updating TotalVideos: {str(e)}")
+                debug_print("Error updating TotalVideos: %s", e)
                 
         # Calculate totalDuration from videos - ensure we handle NULL values properly
         total_duration = 0
@@ -321,11 +217,11 @@ def course_detail(request, course_id):
                     duration_seconds = int(duration)
                     total_duration += duration_seconds
                     # Debug log
-                    print(f"  Video {video.get('VideoID')}: Duration = {duration_seconds} seconds")
+                    debug_print("  Video %s: Duration = %s seconds", video.get('VideoID'), duration_seconds)
                 except (ValueError, TypeError) as e:
-                    print(f"  Error converting video duration to integer: {str(e)}, Value: {duration}")
+                    debug_print("  Error converting video duration to integer: %s, Value: %s", e, duration)
             else:
-                print(f"  Video {video.get('VideoID')}: No duration data available")
+                debug_print("  Video %s: No duration data available", video.get('VideoID'))
         
         course['totalDuration'] = total_duration
         
@@ -345,7 +241,7 @@ def course_detail(request, course_id):
             course['formattedDuration'] = "0 minutes"
         
         # Log the duration calculation results for debugging
-        print(f"Course {course_id} - Videos: {len(videos)}, Total Duration: {total_duration} seconds, Formatted: {course.get('formattedDuration')}")
+        debug_print("Course %s - Videos: %s, Total Duration: %s seconds, Formatted: %s", course_id, len(videos), total_duration, course.get('formattedDuration'))
         
         # Kullanıcı girişi yapmışsa, ilerleme bilgisini ekle
         if request.user and hasattr(request.user, 'is_authenticated') and request.user.is_authenticated:
@@ -450,10 +346,10 @@ def video_detail(request, video_id):
                 quizzes = [dict(zip(quiz_columns, row)) for row in cursor.fetchall()]
                 video['quizzes'] = quizzes
                 
-                print(f"Found {len(quizzes)} quizzes for video {video_id} (YouTube ID: {youtube_video_id})")
+                debug_print("Found %s quizzes for video %s (YouTube ID: %s)", len(quizzes), video_id, youtube_video_id)
                 
             except Exception as quiz_error:
-                print(f"Quiz bilgisi getirme hatası: {quiz_error}")
+                debug_print("Quiz bilgisi getirme hatası: %s", quiz_error)
                 video['quizzes'] = []
             
             return Response(video)
@@ -502,8 +398,8 @@ def track_video_progress(request, video_id):
         last_position = float(data.get('lastPosition', 0))
         view_duration = int(data.get('viewDuration', 0))
         
-        print(f"[Track:{tracking_id}] Processing video progress: Video #{video_id}, User #{user_id}")
-        print(f"[Track:{tracking_id}] Progress data: {watched_percentage}%, Completed: {is_completed}")
+        debug_print("[Track:%s] Processing video progress: Video #%s, User #%s", tracking_id, video_id, user_id)
+        debug_print("[Track:%s] Progress data: %s%%, Completed: %s", tracking_id, watched_percentage, is_completed)
         
         with connection.cursor() as cursor:
             # First check if video exists
@@ -598,7 +494,7 @@ def track_video_progress(request, video_id):
             })
             
     except Exception as e:
-        print(f"[Track:{tracking_id}] Error tracking progress:", e)
+        debug_print("[Track:%s] Error tracking progress: %s", tracking_id, e)
         return Response({
             'error': f'Failed to track progress: {str(e)}'
         }, status=500)
@@ -716,9 +612,6 @@ def enroll_course(request, course_id):
     """Kullanıcıyı belirtilen kursa kaydeden endpoint"""
     user_id = request.user.id
     
-    # Ensure necessary tables exist
-    ensure_course_tables_exist()
-    
     with connection.cursor() as cursor:
         # Önce kursun var olup olmadığını kontrol et
         cursor.execute("""
@@ -779,11 +672,8 @@ def enroll_course(request, course_id):
             else:
                 progress_id = existing_progress[0]
             
-            # Invalidate cache for both course detail and course list
-            cache.delete(f"course_detail_{course_id}")
-            cache.delete("courses_list")
-            # Clear all cache to ensure no stale data remains
-            cache.clear()
+            # Invalidate cache for both course detail and course list (EnrolledUsers)
+            invalidate_tags('catalog:courses')
             
             return Response({
                 'success': True,
@@ -847,7 +737,7 @@ def enroll_course(request, course_id):
                         enrollment_id_result = cursor.fetchone()
                         enrollment_id = enrollment_id_result[0] if enrollment_id_result else None
             except Exception as id_error:
-                print(f"Error retrieving enrollment ID: {str(id_error)}")
+                debug_print("Error retrieving enrollment ID: %s", id_error)
                 enrollment_id = None
             
             # Eğer UserCourseProgress tablosunda kayıt yoksa, oluştur
@@ -864,7 +754,7 @@ def enroll_course(request, course_id):
                     progress_id_result = cursor.fetchone()
                     progress_id = progress_id_result[0] if progress_id_result else None
                 except Exception as progress_error:
-                    print(f"Error retrieving progress ID: {str(progress_error)}")
+                    debug_print("Error retrieving progress ID: %s", progress_error)
                     progress_id = None
             else:
                 progress_id = existing_progress[0]
@@ -877,14 +767,11 @@ def enroll_course(request, course_id):
                     VALUES (%s, 'course_enrollment', %s, GETDATE())
                 """, [user_id, f"Enrolled in course: {course[1]}"])
             except Exception as log_error:
-                print(f"Error adding activity log: {str(log_error)}")
+                debug_print("Error adding activity log: %s", log_error)
                 # Continue despite error in activity log
             
-            # Invalidate cache for both course detail and course list
-            cache.delete(f"course_detail_{course_id}")
-            cache.delete("courses_list")
-            # Clear all cache to ensure no stale data remains
-            cache.clear()
+            # Invalidate cache for both course detail and course list (EnrolledUsers)
+            invalidate_tags('catalog:courses')
             
             # Always return a successful response with course information
             # even if we couldn't retrieve IDs
@@ -898,7 +785,7 @@ def enroll_course(request, course_id):
             })
             
         except Exception as e:
-            print(f"SQL Error during enrollment: {str(e)}")
+            debug_print("SQL Error during enrollment: %s", e)
             return Response({
                 'success': False,
                 'error': str(e)
@@ -928,9 +815,6 @@ def enrollment_status(request, course_id):
     """Kullanıcının kurs kaydı durumunu getiren endpoint"""
     user_id = request.user.id
     
-    # Ensure necessary tables exist
-    ensure_course_tables_exist()
-    
     with connection.cursor() as cursor:
         # Önce kursun var olup olmadığını kontrol et
         cursor.execute("""
@@ -1001,7 +885,7 @@ def enrollment_status(request, course_id):
                 
                 progress = cursor.fetchone()
             except Exception as e:
-                print(f"Error creating progress record: {str(e)}")
+                debug_print("Error creating progress record: %s", e)
                 return Response({
                     'is_enrolled': True,
                     'progress': {
@@ -1073,9 +957,6 @@ def user_enrolled_courses(request):
     """Kullanıcının kayıtlı olduğu kursları listeleyen endpoint"""
     user_id = request.user.id
     
-    # Ensure necessary tables exist
-    ensure_course_tables_exist()
-    
     with connection.cursor() as cursor:
         cursor.execute("""
             SELECT c.CourseID, c.Title, c.Description, c.Category, c.Difficulty,
@@ -1271,11 +1152,10 @@ def create_video(request):
                     WHERE CourseID = %s
                 """, [course_id, course_id])
             except Exception as e:
-                print(f"Error updating TotalVideos count: {str(e)}")
+                debug_print("Error updating TotalVideos count: %s", e)
         
         # Invalidate cache for course data
-        cache.delete(f"course_detail_{course_id}")
-        cache.delete_pattern(f"list_courses*")
+        invalidate_tags('catalog:courses')
         
         return Response({
             'message': 'Video created successfully',
@@ -1283,7 +1163,7 @@ def create_video(request):
         }, status=status.HTTP_201_CREATED)
         
     except Exception as e:
-        print(f"Error creating video: {str(e)}")
+        debug_print("Error creating video: %s", e)
         return Response({
             'error': f'Error creating video: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1313,8 +1193,8 @@ def debug_enrollment_count(request, course_id):
         enrollments = [dict(zip(columns, row)) for row in cursor.fetchall()]
         
         # Print a detailed log to the server console
-        print(f"DEBUG - Course {course_id} enrollment count: {enrollment_count}")
-        print(f"DEBUG - Raw enrollment records: {enrollments}")
+        debug_print("DEBUG - Course %s enrollment count: %s", course_id, enrollment_count)
+        debug_print("DEBUG - Raw enrollment records: %s", enrollments)
         
         # Check if the tables exist
         cursor.execute("""
@@ -1370,13 +1250,7 @@ def get_video_views(request, video_id):
         actual_video_id = video_data[0]
         
         # Check if the lastPosition column exists in UserVideoViews
-        cursor.execute("""
-            SELECT COLUMN_NAME 
-            FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_NAME = 'UserVideoViews' 
-            AND COLUMN_NAME = 'lastPosition'
-        """)
-        has_last_position = cursor.fetchone() is not None
+        has_last_position = has_column('UserVideoViews', 'lastPosition')
         
         # Query for user's viewing history
         if has_last_position:
@@ -1421,7 +1295,7 @@ def get_video_views(request, video_id):
         })
         
     except Exception as e:
-        print(f"Error getting video view data for video {video_id}: {str(e)}")
+        debug_print("Error getting video view data for video %s: %s", video_id, e)
         return Response(
             {"error": f"Failed to retrieve video view data: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1461,13 +1335,7 @@ def course_progress(request, course_id):
             progress = cursor.fetchone()
             
             # Check if UserVideoViews table has lastPosition column
-            cursor.execute("""
-                SELECT COLUMN_NAME 
-                FROM INFORMATION_SCHEMA.COLUMNS 
-                WHERE TABLE_NAME = 'UserVideoViews' 
-                AND COLUMN_NAME = 'lastPosition'
-            """)
-            has_last_position = cursor.fetchone() is not None
+            has_last_position = has_column('UserVideoViews', 'lastPosition')
             
             # Get the course videos
             cursor.execute("""
@@ -1570,7 +1438,7 @@ def course_progress(request, course_id):
             })
             
     except Exception as e:
-        print(f"Error getting course progress: {str(e)}")
+        debug_print("Error getting course progress: %s", e)
         return Response(
             {"error": f"Failed to retrieve course progress: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1591,13 +1459,7 @@ def course_resources(request, course_id):
                 return Response({"error": "Course not found"}, status=status.HTTP_404_NOT_FOUND)
             
             # Check if CourseResources table exists
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM INFORMATION_SCHEMA.TABLES 
-                WHERE TABLE_NAME = 'CourseResources'
-            """)
-            
-            if cursor.fetchone()[0] == 0:
+            if not has_table('CourseResources'):
                 # Table doesn't exist, return empty array
                 return Response({"resources": []})
             
@@ -1615,7 +1477,7 @@ def course_resources(request, course_id):
             return Response({"resources": resources})
             
     except Exception as e:
-        print(f"Error getting course resources: {str(e)}")
+        debug_print("Error getting course resources: %s", e)
         # Return empty array instead of error to not block the UI
         return Response({"resources": []})
 
@@ -1680,7 +1542,7 @@ def get_course_categories(request):
             return Response({'categories': categories})
             
     except Exception as e:
-        print(f"Error getting course categories: {str(e)}")
+        debug_print("Error getting course categories: %s", e)
         return Response(
             {"error": f"Failed to retrieve course categories: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1751,12 +1613,3 @@ def list_videos(request):
         return Response({
             'error': f'Database error: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-def get_db_connection():
-    """Get a connection to the SQL Server database"""
-    conn = pyodbc.connect('Driver={SQL Server};'
-                      'Server=localhost;'
-                      'Database=wisentia;'
-                      'Trusted_Connection=yes;')
-    return conn
-
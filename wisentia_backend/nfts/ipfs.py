@@ -1,9 +1,10 @@
-import requests
 import json
 import os
 import logging
 from django.conf import settings
 
+from wisentia_backend import http_client
+
 logger = logging.getLogger('wisentia')
 
 class IPFSService:
@@ -52,7 +53,8 @@ class IPFSService:
             
             logger.info(f"Uploading metadata to IPFS for NFT: {metadata.get('name', 'Unknown')}")
             
-            response = requests.post(
+            response = http_client.post(
+                'pinata',
                 self.pin_json_url,
                 data=json.dumps(pinata_options),
                 headers=headers
@@ -98,30 +100,32 @@ class IPFSService:
             headers = self._get_headers()
             del headers['Content-Type']  # Remove Content-Type for multipart form
 
-            # Prepare the file
+            # Prepare the file (bytes olarak: yeniden denemede gövde tekrar gönderilebilsin)
             with open(image_path, 'rb') as file_data:
-                file_name = os.path.basename(image_path)
-                
-                # Create form data
-                files = {
-                    'file': (file_name, file_data)
-                }
-                
-                # Add metadata
-                data = {
-                    'pinataMetadata': json.dumps({
-                        'name': name or f"Wisentia-NFT-Image-{file_name}"
-                    })
-                }
-                
-                logger.info(f"Uploading image to IPFS: {file_name}")
-                
-                response = requests.post(
-                    self.pin_file_url,
-                    files=files,
-                    data=data,
-                    headers=headers
-                )
+                file_content = file_data.read()
+            file_name = os.path.basename(image_path)
+            
+            # Create form data
+            files = {
+                'file': (file_name, file_content)
+            }
+            
+            # Add metadata
+            data = {
+                'pinataMetadata': json.dumps({
+                    'name': name or f"Wisentia-NFT-Image-{file_name}"
+                })
+            }
+            
+            logger.info(f"Uploading image to IPFS: {file_name}")
+            
+            response = http_client.post(
+                'pinata',
+                self.pin_file_url,
+                files=files,
+                data=data,
+                headers=headers
+            )
             
             if response.status_code in (200, 201):
                 result = response.json()
@@ -2,7 +2,6 @@ import os
 import django
 import sys
 import logging
-import pyodbc
 from datetime import datetime, timedelta
 
 # Setup Django environment
@@ -39,22 +38,6 @@ def execute_sql_safely(cursor, sql, params=None):
             logger.error(f"Parameters: {params}")
         return False
 
-def get_connection_string():
-    """Get the SQL Server connection string from Django settings"""
-    try:
-        db_settings = settings.DATABASES['default']
-        conn_str = (
-            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-            f"SERVER={db_settings['HOST']};"
-            f"DATABASE={db_settings['NAME']};"
-            f"UID={db_settings['USER']};"
-            f"PWD={db_settings['PASSWORD']};"
-        )
-        return conn_str
-    except Exception as e:
-        logger.error(f"Failed to get connection string: {e}")
-        return None
-
 def fix_subscription_plans():
     """Fix NULL NFTID values in SubscriptionPlans table"""
     with connection.cursor() as cursor:
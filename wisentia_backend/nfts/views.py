@@ -4,6 +4,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from wisentia_backend.utils import cache_response, invalidate_tags
 from rest_framework.throttling import UserRateThrottle
 from .serializers import NFTSerializer
 from drf_yasg.utils import swagger_auto_schema
@@ -243,6 +244,7 @@ def mint_nft(request, user_nft_id):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_response(key_prefix='available_nfts', tags=['catalog:nfts'])
 def available_nfts(request):
     """Mağazada satın alınabilecek NFT'leri listeleyen API endpoint'i"""
     
@@ -498,6 +500,7 @@ def trade_nft(request):
                 target_nft_id
             ])
             
+            invalidate_tags('catalog:nfts')
             return Response({
                 'message': 'NFT trade completed successfully',
                 'tradeId': trade_id,
@@ -682,6 +685,8 @@ def create_nft(request):
                         SET RewardNFTID = %s
                         WHERE QuestID = %s
                     """, [nft_id, quest_id])
+                    # list_quests_public ödül NFT'sinin başlık/görselini de döner
+                    invalidate_tags('catalog:quests')
                     
                     # Check if the update was successful
                     cursor.execute("""
@@ -709,6 +714,7 @@ def create_nft(request):
         if redirect_url:
             response_data['redirectUrl'] = redirect_url
         
+        invalidate_tags('catalog:nfts')
         return Response(response_data, status=status.HTTP_201_CREATED)
     else:
         return Response({
@@ -1071,6 +1077,8 @@ def confirm_purchase(request):
                         INSERT INTO UserNFTs (UserID, NFTID, AcquisitionDate, ExpiryDate, TransactionHash, IsMinted, BlockchainNFTID)
                         VALUES (%s, %s, GETDATE(), %s, %s, 1, %s)
                     """, [user_id, nft_id, expiry_date, transaction_hash, blockchain_nft_id])
+                    # Mağaza listesindeki OwnersCount değişti; commit sonrası önbellek düşürülür
+                    transaction.on_commit(lambda: invalidate_tags('catalog:nfts'))
                     
                     # Sonra ayrı bir sorgu ile son eklenen kaydın ID'sini al
                     cursor.execute("SELECT SCOPE_IDENTITY()")
@@ -1417,6 +1425,7 @@ def cancel_purchase(request):
                 f"Cancelled purchase of NFT ID {nft_id}"
             ])
             
+            invalidate_tags('catalog:nfts')
             return Response({
                 'success': True,
                 'message': 'NFT purchase cancelled successfully'
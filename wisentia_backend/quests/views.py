@@ -3,6 +3,8 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from wisentia_backend.utils import cache_response, invalidate_tags
+from wisentia_backend.log_pipeline import debug_print
 import json
 
 @api_view(['GET'])
@@ -711,6 +713,7 @@ def update_quest(request, quest_id):
             params.append(quest_id)
             
             cursor.execute(update_sql, params)
+            invalidate_tags('catalog:quests')
             
             # Get the updated quest
             cursor.execute("""
@@ -747,6 +750,7 @@ def update_quest(request, quest_id):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@cache_response(key_prefix='quests_public', tags=['catalog:quests'])
 def list_quests_public(request):
     """Görev detaylarını gösteren public API endpoint'i"""
     
@@ -809,7 +813,7 @@ def list_quests_public(request):
         
         return Response(quests)
     except Exception as e:
-        print(f"Database error: {str(e)}")
+        debug_print("Database error: %s", e)
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
@@ -889,7 +893,7 @@ def quest_detail(request, quest_id):
                     } for condition in conditions
                 ]
             except Exception as e:
-                print(f"Error fetching quest conditions: {str(e)}")
+                debug_print("Error fetching quest conditions: %s", e)
                 result['conditions'] = []
             
             # Kullanıcı ilerleme bilgilerini ekle (eğer kullanıcı oturum açtıysa)
@@ -922,7 +926,7 @@ def quest_detail(request, quest_id):
                             'completionPercentage': completion_percentage
                         }
                 except Exception as e:
-                    print(f"Error fetching user progress: {str(e)}")
+                    debug_print("Error fetching user progress: %s", e)
                     result['progress'] = {
                         'currentProgress': 0,
                         'isCompleted': False,
@@ -934,7 +938,7 @@ def quest_detail(request, quest_id):
             return Response(result)
     
     except Exception as e:
-        print(f"Error in quest_detail: {str(e)}")
+        debug_print("Error in quest_detail: %s", e)
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
@@ -1187,12 +1191,12 @@ def create_quest(request):
         category_column_exists = cursor.fetchone() is not None
         
         if not category_column_exists:
-            print("Adding Category column to Quests table...")
+            debug_print("Adding Category column to Quests table...")
             cursor.execute("""
                 ALTER TABLE Quests 
                 ADD Category NVARCHAR(100) NULL
             """)
-            print("Category column added successfully")
+            debug_print("Category column added successfully")
     
     try:
         # Get request data
@@ -1241,20 +1245,20 @@ def create_quest(request):
             # Get the new quest ID using a separate query
             cursor.execute("SELECT SCOPE_IDENTITY()")
             result = cursor.fetchone()
-            print(f"Quest creation result: {result}")
+            debug_print("Quest creation result: %s", result)
             
             if not result or result[0] is None:
                 # Try alternative method to get the last inserted ID
                 cursor.execute("SELECT MAX(QuestID) FROM Quests WHERE Title = %s AND CreationDate >= DATEADD(second, -10, GETDATE())", [title])
                 result = cursor.fetchone()
-                print(f"Alternative quest ID fetch result: {result}")
+                debug_print("Alternative quest ID fetch result: %s", result)
                 
                 if not result or result[0] is None:
                     return Response({'error': 'Failed to create quest - no ID returned'}, 
                                   status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
             quest_id = int(result[0])
-            print(f"Created quest with ID: {quest_id}")
+            debug_print("Created quest with ID: %s", quest_id)
             
             # Add quest conditions if provided
             if conditions:
@@ -1321,6 +1325,7 @@ def create_quest(request):
             conditions_data = [dict(zip(columns, row)) for row in cursor.fetchall()]
             quest['conditions'] = conditions_data
             
+            invalidate_tags('catalog:quests')
             return Response({
                 'message': 'Quest created successfully',
                 'questId': quest_id,
@@ -1334,7 +1339,7 @@ def create_quest(request):
             'traceback': traceback.format_exc(),
             'request_data': request.data
         }
-        print(f"Quest creation error: {error_details}")
+        debug_print("Quest creation error: %s", error_details)
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
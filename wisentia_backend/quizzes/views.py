@@ -1,4 +1,6 @@
 from django.db import connection
+from wisentia_backend.db import execute_db_query
+from wisentia_backend.log_pipeline import debug_print
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -8,42 +10,6 @@ import logging
 # Configure logger
 logger = logging.getLogger('wisentia')
 
-# Database connection function (sadece Django connection kullan)
-def get_db_connection():
-    return connection
-
-# Helper to safely execute database operations with proper error handling
-def execute_db_query(query, params=None, fetch_one=False, fetch_all=True, error_msg="Database error"):
-    db_conn = get_db_connection()
-    cursor = None
-    try:
-        cursor = db_conn.cursor()
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        if cursor.description:
-            columns = [col[0] for col in cursor.description]
-            if fetch_one:
-                row = cursor.fetchone()
-                if row:
-                    return {'row': row, 'columns': columns}
-                return None
-            elif fetch_all:
-                rows = cursor.fetchall()
-                return {'rows': rows, 'columns': columns}
-        else:
-            return cursor.rowcount
-    except Exception as e:
-        logger.error(f"{error_msg}: {str(e)}")
-        raise Exception(f"{error_msg}: {str(e)}")
-    finally:
-        if cursor:
-            try:
-                cursor.close()
-            except:
-                pass
-
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def quiz_detail(request, quiz_id):
@@ -218,6 +184,60 @@ def quiz_detail(request, quiz_id):
         )
     return Response(quiz)
 
+def score_quiz_answers(question_types, correct_options, submitted_answers):
+    """
+    Gönderilen cevapları puanlar (DB erişimi yok).
+    question_types: {QuestionID: QuestionType}, correct_options: {QuestionID: [OptionID, ...]}
+    Returns (correct_count, answer_results, scores)
+    """
+    correct_count = 0
+    scores = []
+    answer_results = {}
+    
+    for answer in submitted_answers:
+        question_id = answer.get('questionId')
+        selected_option_id = answer.get('selectedOptionId')
+        text_answer = answer.get('textAnswer')
+
+        # Log each answer being processed
+        logger.debug(f"Processing answer for question_id {question_id}: selected_option_id={selected_option_id}, text_answer={text_answer}")
+
+        # Skip invalid answers
+        if not question_id or question_id not in question_types:
+            logger.warning(f"Skipping invalid question_id: {question_id}")
+            continue
+
+        # Check if answer is correct
+        is_correct = False
+
+        if question_types[question_id] == 'multiple_choice' or question_types[question_id] == 'true_false':
+            # For multiple choice and true/false, check if selected option is in the list of correct options
+            if question_id in correct_options and selected_option_id in correct_options[question_id]:
+                is_correct = True
+                correct_count += 1
+                logger.debug(f"Correct answer for question_id {question_id}")
+            else:
+                logger.debug(f"Incorrect answer for question_id {question_id}")
+        elif question_types[question_id] == 'short_answer':
+            # For short answer questions, we would need a more sophisticated comparison
+            # For now, just mark as incorrect
+            is_correct = False
+            logger.debug(f"Short answer for question_id {question_id} marked as incorrect by default")
+
+        # Save result for this question
+        answer_results[question_id] = {
+            'isCorrect': is_correct,
+            'selectedOptionId': selected_option_id,
+            'textAnswer': text_answer
+        }
+
+        scores.append({
+            'questionId': question_id,
+            'isCorrect': is_correct
+        })
+    
+    return correct_count, answer_results, scores
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def submit_quiz(request, quiz_id):
@@ -304,57 +324,15 @@ def submit_quiz(request, quiz_id):
         # Score the quiz
         submitted_answers = request.data.get('answers', [])
         total_questions = len(questions)
-        correct_count = 0
-        scores = []
         
         # Log submitted answers for debugging
         logger.info(f"Processing {len(submitted_answers)} submitted answers for quiz_id {quiz_id}")
-        logger.info(f"Submitted answers: {submitted_answers}")
+        logger.debug("Submitted answers: %s", submitted_answers)
         
         # Track which answers were correct
-        answer_results = {}
-        
-        for answer in submitted_answers:
-            question_id = answer.get('questionId')
-            selected_option_id = answer.get('selectedOptionId')
-            text_answer = answer.get('textAnswer')
-            
-            # Log each answer being processed
-            logger.info(f"Processing answer for question_id {question_id}: selected_option_id={selected_option_id}, text_answer={text_answer}")
-            
-            # Skip invalid answers
-            if not question_id or question_id not in question_types:
-                logger.warning(f"Skipping invalid question_id: {question_id}")
-                continue
-            
-            # Check if answer is correct
-            is_correct = False
-            
-            if question_types[question_id] == 'multiple_choice' or question_types[question_id] == 'true_false':
-                # For multiple choice and true/false, check if selected option is in the list of correct options
-                if question_id in correct_options and selected_option_id in correct_options[question_id]:
-                    is_correct = True
-                    correct_count += 1
-                    logger.info(f"Correct answer for question_id {question_id}")
-                else:
-                    logger.info(f"Incorrect answer for question_id {question_id}")
-            elif question_types[question_id] == 'short_answer':
-                # For short answer questions, we would need a more sophisticated comparison
-                # For now, just mark as incorrect
-                is_correct = False
-                logger.info(f"Short answer for question_id {question_id} marked as incorrect by default")
-            
-            # Save result for this question
-            answer_results[question_id] = {
-                'isCorrect': is_correct,
-                'selectedOptionId': selected_option_id,
-                'textAnswer': text_answer
-            }
-            
-            scores.append({
-                'questionId': question_id,
-                'isCorrect': is_correct
-            })
+        correct_count, answer_results, scores = score_quiz_answers(
+            question_types, correct_options, submitted_answers
+        )
         
         # Calculate final score
         score_percentage = (correct_count / total_questions) * 100 if total_questions > 0 else 0
@@ -602,7 +580,7 @@ def video_quizzes(request, video_id):
                 
                 quizzes.append(quiz)
         
-        print(f"Found {len(quizzes)} quizzes for video {video_id} (YouTube ID: {video['YouTubeVideoID']})")
+        debug_print("Found %s quizzes for video %s (YouTube ID: %s)", len(quizzes), video_id, video['YouTubeVideoID'])
         
         # Also get course quizzes if this video is part of a course
         course_quizzes = []
@@ -783,7 +761,7 @@ def course_quizzes(request, course_id):
                 
                 quizzes.append(quiz)
         
-        print(f"Found {len(quizzes)} total quizzes for course {course_id}")
+        debug_print("Found %s total quizzes for course %s", len(quizzes), course_id)
         
         # Get course videos to check view status
         videos_query = """
@@ -3,6 +3,20 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from wisentia_backend.rows import fetch_dicts
+
+# Sayfalanmamış arama uçları için sonuç sınırı
+SEARCH_DEFAULT_LIMIT = 50
+SEARCH_MAX_LIMIT = 200
+
+
+def get_search_limit(request):
+    """?limit= parametresini güvenli aralığa çeker"""
+    try:
+        limit = int(request.query_params.get('limit', SEARCH_DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        limit = SEARCH_DEFAULT_LIMIT
+    return max(1, min(limit, SEARCH_MAX_LIMIT))
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -37,8 +51,7 @@ def search(request):
                 ORDER BY c.CreationDate DESC
             """, [query_pattern, query_pattern, query_pattern])
             
-            columns = [col[0] for col in cursor.description]
-            results['courses'] = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            results['courses'] = fetch_dicts(cursor)
         
         # Görevleri ara
         if category in ['all', 'quests']:
@@ -52,8 +65,7 @@ def search(request):
                 ORDER BY q.CreationDate DESC
             """, [query_pattern, query_pattern])
             
-            columns = [col[0] for col in cursor.description]
-            results['quests'] = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            results['quests'] = fetch_dicts(cursor)
         
         # Topluluk gönderilerini ara
         if category in ['all', 'community']:
@@ -67,8 +79,7 @@ def search(request):
                 ORDER BY cp.CreationDate DESC
             """, [query_pattern, query_pattern, query_pattern])
             
-            columns = [col[0] for col in cursor.description]
-            results['community'] = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            results['community'] = fetch_dicts(cursor)
         
         # NFT'leri ara
         if category in ['all', 'nfts']:
@@ -82,8 +93,7 @@ def search(request):
                 ORDER BY n.NFTID DESC
             """, [query_pattern, query_pattern])
             
-            columns = [col[0] for col in cursor.description]
-            results['nfts'] = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            results['nfts'] = fetch_dicts(cursor)
     
     return Response(results)
 
@@ -116,11 +126,12 @@ def search_courses(request):
         params.append(difficulty)
     
     sql += " ORDER BY c.CreationDate DESC"
+    sql += " OFFSET 0 ROWS FETCH NEXT %s ROWS ONLY"
+    params.append(get_search_limit(request))
     
     with connection.cursor() as cursor:
         cursor.execute(sql, params)
-        columns = [col[0] for col in cursor.description]
-        courses = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        courses = fetch_dicts(cursor)
     
     return Response(courses)
 
@@ -148,11 +159,12 @@ def search_quests(request):
         params.append(difficulty)
     
     sql += " ORDER BY q.CreationDate DESC"
+    sql += " OFFSET 0 ROWS FETCH NEXT %s ROWS ONLY"
+    params.append(get_search_limit(request))
     
     with connection.cursor() as cursor:
         cursor.execute(sql, params)
-        columns = [col[0] for col in cursor.description]
-        quests = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        quests = fetch_dicts(cursor)
     
     return Response(quests)
 
@@ -180,11 +192,12 @@ def search_community(request):
         params.append(category)
     
     sql += " ORDER BY cp.CreationDate DESC"
+    sql += " OFFSET 0 ROWS FETCH NEXT %s ROWS ONLY"
+    params.append(get_search_limit(request))
     
     with connection.cursor() as cursor:
         cursor.execute(sql, params)
-        columns = [col[0] for col in cursor.description]
-        posts = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        posts = fetch_dicts(cursor)
     
     return Response(posts)
 
@@ -252,8 +265,7 @@ def advanced_search(request):
                     course_query += " ORDER BY c.CreationDate DESC"
             
             cursor.execute(course_query, course_params)
-            course_columns = [col[0] for col in cursor.description]
-            results['courses'] = [dict(zip(course_columns, row)) for row in cursor.fetchall()]
+            results['courses'] = fetch_dicts(cursor)
         
         # Görevler (Quests) için arama
         if content_type in ['all', 'quests']:
@@ -291,8 +303,7 @@ def advanced_search(request):
                     quest_query += " ORDER BY q.CreationDate DESC"
             
             cursor.execute(quest_query, quest_params)
-            quest_columns = [col[0] for col in cursor.description]
-            results['quests'] = [dict(zip(quest_columns, row)) for row in cursor.fetchall()]
+            results['quests'] = fetch_dicts(cursor)
         
         # NFT'ler için arama
         if content_type in ['all', 'nfts']:
@@ -330,8 +341,7 @@ def advanced_search(request):
                     nft_query += " ORDER BY n.NFTID DESC"
             
             cursor.execute(nft_query, nft_params)
-            nft_columns = [col[0] for col in cursor.description]
-            results['nfts'] = [dict(zip(nft_columns, row)) for row in cursor.fetchall()]
+            results['nfts'] = fetch_dicts(cursor)
         
         # Topluluk (Community) gönderileri için arama
         if content_type in ['all', 'community']:
@@ -370,7 +380,6 @@ def advanced_search(request):
                     community_query += " ORDER BY cp.CreationDate DESC"
             
             cursor.execute(community_query, community_params)
-            community_columns = [col[0] for col in cursor.description]
-            results['community'] = [dict(zip(community_columns, row)) for row in cursor.fetchall()]
+            results['community'] = fetch_dicts(cursor)
     
     return Response(results)
\ No newline at end of file
@@ -8,6 +8,8 @@ import json
 from datetime import date, datetime
 from decimal import Decimal
 
+from wisentia_backend.utils import invalidate_tags
+
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -635,6 +637,7 @@ def create_subscription_plan(request):
                     
                     created_nft_id_result = cursor.fetchone()
                     created_nft_id = created_nft_id_result[0] if created_nft_id_result else None
+                    invalidate_tags('catalog:nfts')
                     
                     if not created_nft_id:
                         print("NFT ID alınamadı")
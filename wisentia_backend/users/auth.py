@@ -8,9 +8,122 @@ import datetime
 import re
 import random
 import string
+import threading
+import time
+from collections import OrderedDict
 from django.core.cache import cache
 
 
+class AuthenticatedUser:
+    """JWT ile doğrulanmış kullanıcı (her istekte yeni sınıf oluşturmak yerine)"""
+    __slots__ = ('id', 'pk', 'username', 'email', 'role', 'is_active', 'is_email_verified')
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id, username, email, role, is_active, is_email_verified):
+        self.id = user_id
+        self.pk = user_id  # DRF için pk özelliği
+        self.username = username
+        self.email = email
+        self.role = role
+        self.is_active = bool(is_active)
+        self.is_email_verified = bool(is_email_verified)
+
+    def __str__(self):
+        return self.username or ''
+
+    def as_cache_value(self):
+        return (self.id, self.username, self.email, self.role, self.is_active, self.is_email_verified)
+
+
+class LocalTTLCache:
+    """Thread-safe, boyut sınırlı ve kısa TTL'li işlem içi LRU önbellek"""
+    def __init__(self, maxsize=2048, ttl=5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# 1. seviye: worker içi LRU (kısa TTL), 2. seviye: Redis
+_principal_local_cache = LocalTTLCache(
+    maxsize=getattr(settings, 'AUTH_PRINCIPAL_LOCAL_MAXSIZE', 2048),
+    ttl=getattr(settings, 'AUTH_PRINCIPAL_LOCAL_TTL', 5),
+)
+
+
+def _principal_cache_key(user_id):
+    return f"{settings.CACHE_KEY_PREFIX}auth_principal_{user_id}"
+
+
+def load_principal(user_id):
+    """Kullanıcıyı önce yerel önbellekten, sonra Redis'ten, en son veritabanından getirir"""
+    user = _principal_local_cache.get(user_id)
+    if user is not None:
+        return user
+
+    cache_key = _principal_cache_key(user_id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        user = AuthenticatedUser(*cached)
+        _principal_local_cache.set(user_id, user)
+        return user
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT UserID, Username, Email, UserRole, IsActive, IsEmailVerified
+            FROM Users
+            WHERE UserID = %s
+        """, [user_id])
+        user_data = cursor.fetchone()
+
+    if not user_data:
+        return None
+
+    user = AuthenticatedUser(*user_data)
+    timeout = settings.CACHE_TIMEOUT.get('auth_principal', 300)
+    cache.set(cache_key, user.as_cache_value(), timeout)
+    _principal_local_cache.set(user_id, user)
+    return user
+
+
+def invalidate_principal(user_id):
+    """
+    Rol, IsActive, e-posta vb. değiştiğinde kullanıcının önbellekteki kimliğini siler.
+    Diğer worker'lardaki yerel kopyalar en geç AUTH_PRINCIPAL_LOCAL_TTL içinde düşer.
+    """
+    _principal_local_cache.delete(user_id)
+    cache.delete(_principal_cache_key(user_id))
+
+
 class CustomJWTAuthentication(authentication.BaseAuthentication):
     def authenticate(self, request):
         auth_header = request.META.get('HTTP_AUTHORIZATION')
@@ -47,38 +160,15 @@ class CustomJWTAuthentication(authentication.BaseAuthentication):
             if datetime.datetime.now().timestamp() > exp:
                 raise exceptions.AuthenticationFailed('Token has expired')
                 
-            # Kullanıcıyı bul
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    SELECT UserID, Username, Email, UserRole, IsActive, LastLogin, IsEmailVerified
-                    FROM Users
-                    WHERE UserID = %s
-                """, [user_id])
-                
-                user_data = cursor.fetchone()
-                
-                if not user_data:
-                    raise exceptions.AuthenticationFailed('User not found')
-                
-                if not user_data[4]:  # IsActive kontrolü
-                    raise exceptions.AuthenticationFailed('User is inactive')
-                    
-                # Son giriş zamanını güncelle (isteğe bağlı)
-                # cursor.execute("UPDATE Users SET LastLogin = GETDATE() WHERE UserID = %s", [user_id])
-                    
-                # Basit bir kullanıcı nesnesi oluştur
-                user = type('User', (), {
-                    'id': user_data[0],
-                    'pk': user_data[0],  # DRF için pk özelliği ekledik
-                    'username': user_data[1],
-                    'email': user_data[2],
-                    'role': user_data[3],
-                    'is_authenticated': True,
-                    'is_email_verified': bool(user_data[6]),
-                    # Django Model benzeri özellikler ekleyelim
-                    '__str__': lambda self: self.username
-                })
-                
+            # Kullanıcıyı bul (önbellekli)
+            user = load_principal(user_id)
+
+            if user is None:
+                raise exceptions.AuthenticationFailed('User not found')
+
+            if not user.is_active:  # IsActive kontrolü
+                raise exceptions.AuthenticationFailed('User is inactive')
+
             return (user, token)
                 
         except Exception as e:
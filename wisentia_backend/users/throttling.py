@@ -1,30 +1,155 @@
 # users/throttling.py
 
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+import logging
+import time
 
-class AuthenticationThrottle(AnonRateThrottle):
-    scope = 'auth'
+from django.conf import settings
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger('wisentia')
+
+# Sliding-window counter: önceki pencerenin sayacı, pencerede geçen süre oranında
+# ağırlıklandırılarak mevcut pencereye eklenir. Kontrol + artırma tek atomik çağrı.
+#   KEYS[1] = mevcut pencere sayacı, KEYS[2] = önceki pencere sayacı
+#   ARGV    = pencerede geçen süre (sn), pencere uzunluğu (sn), limit
+# Dönüş: {izin (1/0), ağırlıklı istek sayısı, önceki pencere sayacı}
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local elapsed = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local carried = previous * (window - elapsed) / window
+
+if carried + current + 1 > limit then
+    return {0, math.ceil(carried + current), previous}
+end
+
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], window * 2)
+end
+return {1, math.ceil(carried + current), previous}
+"""
+
+
+def _redis_client():
+    """django-redis bağlantısı; Redis dışı bir cache backend'inde None"""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except (ImportError, NotImplementedError):
+        return None
+
+
+class RedisSlidingWindowThrottle(SimpleRateThrottle):
+    """
+    DRF'in zaman damgası listesi tutan SimpleRateThrottle'ı yerine Redis tarafında
+    Lua ile çalışan sliding-window sayacı: istek başına tek round-trip, pickle yok.
+    Sonuç request.throttle_status'a yazılır (RateLimitHeaderMiddleware X-RateLimit-* ekler).
+    Redis'e ulaşılamazsa istek engellenmez.
+    """
+    _script = None
 
-# Ana UserRateThrottle sınıfımızı özelleştirelim
-class CustomUserRateThrottle(UserRateThrottle):
-    scope = 'user'
-    
-    
     def get_cache_key(self, request, view):
         # Özel kullanıcı modeli kullanıyoruz, Django User modeli değil
-        if hasattr(request, 'user') and hasattr(request.user, 'id'):
+        if hasattr(request, 'user') and hasattr(request.user, 'id') and request.user.id is not None:
             ident = request.user.id
         elif hasattr(request, 'user') and hasattr(request.user, 'UserID'):
             ident = request.user.UserID
         else:
             # Kullanıcı kimliği bulunamadıysa, IP'ye göre throttle uygula
             ident = self.get_ident(request)
-            
+
         return self.cache_format % {
             'scope': self.scope,
             'ident': ident
         }
 
+    @classmethod
+    def _get_script(cls, client):
+        if cls._script is None:
+            cls._script = client.register_script(SLIDING_WINDOW_SCRIPT)
+        return cls._script
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        client = _redis_client()
+        if client is None:
+            return super().allow_request(request, view)
+
+        now = time.time()
+        window_index, elapsed = divmod(now, self.duration)
+        window_index = int(window_index)
+        # Hash tag: iki pencere anahtarı Redis Cluster'da aynı slot'a düşsün
+        base = f"{settings.CACHE_KEY_PREFIX}{{{self.key}}}"
+
+        try:
+            allowed, used, previous = self._get_script(client)(
+                keys=[f"{base}:{window_index}", f"{base}:{window_index - 1}"],
+                args=[elapsed, self.duration, self.num_requests],
+                client=client,
+            )
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable, allowing request: {e}")
+            return True
+
+        self.now = now
+        self._elapsed = elapsed
+        self._previous = int(previous)
+        self._used = int(used)
+        self._record_status(request, now - elapsed + self.duration)
+        return bool(allowed)
+
+    def _record_status(self, request, reset_at):
+        status = {
+            'limit': self.num_requests,
+            'remaining': max(0, self.num_requests - self._used),
+            'reset': int(reset_at),
+        }
+        # DRF Request'e yazılan öznitelik middleware'in gördüğü HttpRequest'e geçmez;
+        # HttpRequest'e yazılanı ise DRF Request __getattr__ ile okuyabilir
+        target = getattr(request, '_request', request)
+        if not hasattr(target, 'throttle_status'):
+            target.throttle_status = {}
+        target.throttle_status[self.scope] = status
+
+    def wait(self):
+        if not hasattr(self, '_used'):
+            return super().wait()
+
+        remaining_window = self.duration - self._elapsed
+        excess = self._used + 1 - self.num_requests
+        # Önceki pencerenin ağırlığı saniyede previous/duration azalır
+        if self._previous and excess <= self._previous:
+            return min(remaining_window, excess * self.duration / self._previous)
+        return remaining_window
+
+
+class AuthenticationThrottle(RedisSlidingWindowThrottle):
+    scope = 'auth'
+
+    def get_cache_key(self, request, view):
+        # AnonRateThrottle gibi: sadece anonim istekler IP'ye göre sınırlanır
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
+
+
+# Ana throttle sınıfımız (DEFAULT_THROTTLE_CLASSES)
+class CustomUserRateThrottle(RedisSlidingWindowThrottle):
+    scope = 'user'
+
+
 class SensitiveOperationsThrottle(CustomUserRateThrottle):
     scope = 'sensitive'
-    # CustomUserRateThrottle'dan miras aldığımız için get_cache_key metodunu tekrar tanımlamamıza gerek yok
\ No newline at end of file
+    # CustomUserRateThrottle'dan miras aldığımız için get_cache_key metodunu tekrar tanımlamamıza gerek yok
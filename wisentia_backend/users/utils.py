@@ -1,9 +1,12 @@
 from decimal import Decimal
-import json
 from django.core.serializers.json import DjangoJSONEncoder
 from rest_framework.renderers import JSONRenderer
-from decimal import Decimal
-import json
+
+try:
+    import orjson
+except ImportError:  # opsiyonel hızlı JSON backend'i
+    orjson = None
+
 
 class CustomJSONEncoder(DjangoJSONEncoder):
     """Decimal ve diğer özel türleri JSON uyumlu hale getiren özel sınıf"""
@@ -12,34 +15,44 @@ class CustomJSONEncoder(DjangoJSONEncoder):
             return float(obj)
         return super().default(obj)
 
+
+_fallback_encoder = CustomJSONEncoder()
+
+
+def _orjson_default(obj):
+    """orjson'un doğrudan desteklemediği türler (Decimal, timedelta, lazy string vb.)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return _fallback_encoder.default(obj)
+
+
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson else 0
+
+
 def custom_json_response(data, status=200):
-    """Decimal türlerini içeren veriyi düzgün şekilde JSON'a çevirir"""
+    """Decimal türlerini içeren veriyi döndürür; dönüşümü CustomJSONRenderer tek geçişte yapar"""
     from rest_framework.response import Response
-    
-    # Veriyi manuel olarak serialize ederek sorunları önle
-    json_str = json.dumps(data, cls=CustomJSONEncoder)
-    json_data = json.loads(json_str)
-    
-    return Response(json_data, status=status)
 
+    return Response(data, status=status)
 
 
 class CustomJSONRenderer(JSONRenderer):
     """
-    Decimal türlerini float'a çeviren özel JSON renderer
+    Decimal, datetime ve UUID türlerini tek encoder geçişinde serialize eden JSON renderer.
+    orjson kuruluysa onu kullanır, aksi halde CustomJSONEncoder ile stdlib json'a düşer.
     """
+    encoder_class = CustomJSONEncoder
+
     def render(self, data, accepted_media_type=None, renderer_context=None):
-        # JSON'a çevirmeden önce Decimal değerlerini float'a dönüştür
-        if data is not None:
-            data = self.process_data(data)
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        # Girintili çıktı istendiğinde (ör. ?indent=) DRF'in stdlib yolunu kullan
+        if orjson is not None and not self.get_indent(accepted_media_type, renderer_context):
+            try:
+                return orjson.dumps(data, default=_orjson_default, option=ORJSON_OPTIONS)
+            except TypeError:
+                pass
+
         return super().render(data, accepted_media_type, renderer_context)
-    
-    def process_data(self, data):
-        """Veriyi işleyerek Decimal türlerini float'a çevirir"""
-        if isinstance(data, Decimal):
-            return float(data)
-        elif isinstance(data, dict):
-            return {key: self.process_data(value) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [self.process_data(item) for item in data]
-        return data
\ No newline at end of file
@@ -11,7 +11,8 @@ from .auth import (
     store_password_reset_code, 
     verify_email_code, 
     verify_password_reset_code,
-    clear_password_reset_code
+    clear_password_reset_code,
+    invalidate_principal
 )
 import jwt
 from django.conf import settings
@@ -449,6 +450,8 @@ def update_profile(request):
             WHERE UserID = %s
         """, params)
     
+    invalidate_principal(user_id)
+    
     # Güncellenmiş kullanıcı bilgilerini döndür
     return get_user_profile(request)
 
@@ -664,6 +667,7 @@ def verify_email(request):
                 SET IsEmailVerified = 1
                 WHERE UserID = %s
             """, [user_id])
+            invalidate_principal(user_id)
             
             # Etkinlik logu ekle
             cursor.execute("""
@@ -867,6 +871,7 @@ def verify_email_with_code(request):
                 SET IsEmailVerified = 1
                 WHERE UserID = %s
             """, [user_id])
+            invalidate_principal(user_id)
             
             # Etkinlik logu ekle
             cursor.execute("""
@@ -1,10 +1,13 @@
 import json
 import os
 import logging
-from web3 import Web3
-from web3.exceptions import ContractLogicError
 from django.conf import settings
 
+from wisentia_backend.lazy import lazy_attr
+
+# web3 ilk bağlantıda import edilir (worker açılışını yavaşlatmasın)
+Web3 = lazy_attr('web3', 'Web3')
+
 logger = logging.getLogger('wisentia')
 
 # Contract address from deployment output or settings
@@ -11,6 +11,7 @@ python manage.py runscript wallet.sync_blockchain
 import logging
 import time
 from django.db import connection, transaction
+from wisentia_backend.db import db_task
 from .blockchain import BlockchainService
 
 logger = logging.getLogger('wisentia')
@@ -231,6 +232,7 @@ def sync_subscriptions():
         logger.error(f"Subscription synchronization failed: {str(e)}")
         return False
 
+@db_task
 def run():
     """Ana senkronizasyon fonksiyonu"""
     logger.info("Starting blockchain synchronization")
@@ -3,15 +3,17 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-import web3
-from web3 import Web3
-from web3.exceptions import InvalidAddress
 import logging
 
 from rest_framework.decorators import throttle_classes
 from users.throttling import SensitiveOperationsThrottle
 from .blockchain import BlockchainService
 from django.conf import settings
+from wisentia_backend.lazy import lazy_attr, lazy_import
+
+# web3 ilk kullanımda import edilir
+Web3 = lazy_attr('web3', 'Web3')
+web3_exceptions = lazy_import('web3.exceptions')
 
 logger = logging.getLogger('wisentia')
 
@@ -102,7 +104,7 @@ def connect_wallet(request):
         return Response({
             'error': f"Connection to blockchain failed: {str(e)}"
         }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-    except InvalidAddress:
+    except web3_exceptions.InvalidAddress:
         return Response({
             'error': 'Invalid wallet address format'
         }, status=status.HTTP_400_BAD_REQUEST)
@@ -5,12 +5,74 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Çalıştırma (SSE sohbet akışları worker başına yüzlerce eşzamanlı bağlantı):
+    gunicorn wisentia_backend.asgi:application -k uvicorn.workers.UvicornWorker
 """
 
+import asyncio
+import contextlib
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wisentia_backend.settings')
 
+
+class DisconnectCancellationMiddleware:
+    """
+    Django 4.2 ASGIHandler, yanıt akarken istemcinin kopmasını dinlemez; uzun SSE
+    akışları upstream LLM isteğiyle birlikte sonuna kadar çalışır. Bu sarmalayıcı
+    ASGI_DISCONNECT_WATCH_PATHS altındaki isteklerde http.disconnect mesajını
+    dinler ve gelirse uygulama görevini iptal eder (Django 5.0 davranışı).
+    """
+    def __init__(self, app, paths):
+        self.app = app
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not scope['path'].startswith(self.paths):
+            return await self.app(scope, receive, send)
+
+        # Gövdeyi önce oku (bu yollar küçük JSON gövdeleri alır), sonra Django'ya tekrar ver
+        body_messages = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body_messages.append(message)
+            if not message.get('more_body', False):
+                break
+
+        disconnected = asyncio.Event()
+
+        async def replay_receive():
+            if body_messages:
+                return body_messages.pop(0)
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def listen_for_disconnect():
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    disconnected.set()
+                    return
+
+        app_task = asyncio.ensure_future(self.app(scope, replay_receive, send))
+        listener = asyncio.ensure_future(listen_for_disconnect())
+        try:
+            await asyncio.wait({app_task, listener}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (listener, app_task):
+                if not task.done():
+                    task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await listener
+            with contextlib.suppress(asyncio.CancelledError):
+                await app_task
+
+
 application = get_asgi_application()
+application = DisconnectCancellationMiddleware(application, settings.ASGI_DISCONNECT_WATCH_PATHS)
@@ -0,0 +1,161 @@
+"""
+Ortak veritabanı bağlantı yönetimi.
+
+Tüm modüller (view'lar, arka plan thread'leri, senkronizasyon scriptleri)
+Django'nun yönettiği bağlantıyı kullanır. Bağlantılar CONN_MAX_AGE ile
+kalıcıdır, CONN_HEALTH_CHECKS ile her istekte doğrulanır ve ODBC sürücü
+yöneticisi havuzu üzerinden yeniden kullanılır.
+"""
+import logging
+import threading
+from functools import wraps
+from django.db import connection, close_old_connections
+
+from .rows import DEFAULT_BATCH_SIZE, fetch_dicts, fetch_one_dict, fetch_rows, iter_rows
+
+logger = logging.getLogger('wisentia')
+
+
+class ConnectionPoolStats:
+    """İşlem (worker) başına bağlantı havuzu metrikleri"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.connect_errors = 0
+            self.connect_time_ms = 0.0
+            self.max_connect_time_ms = 0.0
+            self.health_checks = 0
+            self.health_check_failures = 0
+            self.closed = 0
+
+    def record_connect(self, duration_ms):
+        with self._lock:
+            self.connects += 1
+            self.connect_time_ms += duration_ms
+            self.max_connect_time_ms = max(self.max_connect_time_ms, duration_ms)
+
+    def record_connect_error(self):
+        with self._lock:
+            self.connect_errors += 1
+
+    def record_health_check(self, usable):
+        with self._lock:
+            self.health_checks += 1
+            if not usable:
+                self.health_check_failures += 1
+
+    def record_close(self):
+        with self._lock:
+            self.closed += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'connects': self.connects,
+                'connectErrors': self.connect_errors,
+                'avgWaitMs': round(self.connect_time_ms / self.connects, 2) if self.connects else 0,
+                'maxWaitMs': round(self.max_connect_time_ms, 2),
+                'healthChecks': self.health_checks,
+                'healthCheckFailures': self.health_check_failures,
+                'closed': self.closed,
+                'open': self.connects - self.closed,
+            }
+
+
+pool_stats = ConnectionPoolStats()
+
+
+def get_db_connection():
+    """Django tarafından yönetilen (havuzlanmış) bağlantıyı döndürür"""
+    return connection
+
+
+def execute_db_query(query, params=None, fetch_one=False, fetch_all=True, error_msg="Database error"):
+    """
+    Sorguyu çalıştırır ve {'row'|'rows': ..., 'columns': [...]} ya da
+    (SELECT olmayan sorgular için) etkilenen satır sayısını döndürür.
+    """
+    cursor = None
+    try:
+        cursor = get_db_connection().cursor()
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+        if cursor.description:
+            columns = [col[0] for col in cursor.description]
+            if fetch_one:
+                row = cursor.fetchone()
+                if row:
+                    return {'row': row, 'columns': columns}
+                return None
+            elif fetch_all:
+                rows = cursor.fetchall()
+                return {'rows': rows, 'columns': columns}
+        else:
+            return cursor.rowcount
+    except Exception as e:
+        logger.error(f"{error_msg}: {str(e)}")
+        raise Exception(f"{error_msg}: {str(e)}")
+    finally:
+        if cursor:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+
+def query_dicts(query, params=None):
+    """Sorgu sonucunu dict listesi olarak döndürür"""
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        return fetch_dicts(cursor)
+
+
+def query_one_dict(query, params=None):
+    """Sorgunun ilk satırını dict olarak döndürür, yoksa None"""
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        return fetch_one_dict(cursor)
+
+
+def query_rows(query, params=None):
+    """Sorgu sonucunu kompakt namedtuple listesi olarak döndürür"""
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        return fetch_rows(cursor)
+
+
+def stream_query(query, params=None, batch_size=DEFAULT_BATCH_SIZE, as_dict=False):
+    """Sorgu sonucunu fetchmany ile parça parça döndüren generator"""
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        yield from iter_rows(cursor, batch_size=batch_size, as_dict=as_dict)
+
+
+def db_task(func):
+    """
+    Request döngüsü dışında çalışan fonksiyonlar (thread'ler, scriptler) için
+    bağlantı yaşam döngüsünü yönetir: eskimiş bağlantıları başta kapatır,
+    iş bitince thread'in bağlantısını havuza geri bırakır.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            connection.close()
+    return wrapper
+
+
+def start_db_thread(target, args=(), kwargs=None, daemon=True):
+    """Bağlantı yönetimi db_task ile sarılmış bir arka plan thread'i başlatır"""
+    thread = threading.Thread(target=db_task(target), args=args, kwargs=kwargs or {})
+    thread.daemon = daemon
+    thread.start()
+    return thread
@@ -0,0 +1,37 @@
+"""
+mssql-django üzerine bağlantı havuzu metrikleri ekleyen veritabanı backend'i.
+
+ENGINE = 'wisentia_backend.db_backend' olarak kullanılır.
+"""
+import time
+import pyodbc
+from django.conf import settings
+from mssql.base import DatabaseWrapper as MSSQLDatabaseWrapper
+
+from wisentia_backend.db import pool_stats
+
+# ODBC sürücü yöneticisi havuzu ilk bağlantıdan önce açılmalı
+pyodbc.pooling = getattr(settings, 'DB_ODBC_POOLING', True)
+
+
+class DatabaseWrapper(MSSQLDatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        start = time.perf_counter()
+        try:
+            conn = super().get_new_connection(conn_params)
+        except Exception:
+            pool_stats.record_connect_error()
+            raise
+        pool_stats.record_connect((time.perf_counter() - start) * 1000)
+        return conn
+
+    def is_usable(self):
+        # CONN_HEALTH_CHECKS açıkken yeniden kullanılan bağlantı için pre-ping
+        usable = super().is_usable()
+        pool_stats.record_health_check(usable)
+        return usable
+
+    def _close(self):
+        if self.connection is not None:
+            pool_stats.record_close()
+        return super()._close()
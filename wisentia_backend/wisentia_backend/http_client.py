@@ -0,0 +1,295 @@
+"""
+Ortak dış HTTP istemcisi (Ollama, Anthropic, Pinata, YouTube oEmbed).
+
+Her upstream için tek bir requests.Session (keep-alive, host başına urllib3 havuzu),
+async tarafta event loop başına tek httpx.AsyncClient kullanılır; her çağrıda yeni
+TCP+TLS el sıkışması yapılmaz. Zaman aşımı, yeniden deneme ve havuz boyutu
+settings.OUTBOUND_HTTP'den upstream bazında okunur ('default' ortak değerlerdir).
+
+Idempotent isteklerde (GET, PUT, DELETE...) bağlantı / zaman aşımı hataları ve 429/5xx
+(502, 503, 504, 529) yanıtları jitter'lı exponential backoff ile yeniden denenir
+(Retry-After başlığı varsa ona uyulur). POST/PATCH upstream'de işlenmiş olabileceğinden
+(LLM üretimi tekrar faturalanır, Pinata'ya dosya iki kez yüklenir) yalnızca bağlantı
+kurulamadıysa ya da Retry-After'lı 429/503 ile reddedildiyse yeniden gönderilir; okuma
+zaman aşımı yeniden denenmez.
+Upstream başına istek, hata, retry ve gecikme metrikleri upstream_stats'tadır.
+
+    response = http_client.post('ollama', f"{OLLAMA_API_URL}/chat", json=data, timeout=600)
+    response = await http_client.arequest('anthropic', 'POST', url, json=data)
+    async with http_client.astream('ollama', 'POST', url, json=data) as response: ...
+"""
+import asyncio
+import contextlib
+import logging
+import random
+import threading
+import time
+import weakref
+from collections import defaultdict
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger('wisentia')
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504, 529})
+# İstek gövdesi işlenmeden reddedildiğini bildiren durumlar (yalnızca Retry-After ile)
+UNSAFE_RETRY_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+LATENCY_BUCKETS_MS = (100, 500, 1000, 5000, 30000)
+
+DEFAULTS = {
+    'connect_timeout': 5,
+    'read_timeout': 30,
+    'retries': 2,
+    'backoff': 0.5,       # ilk bekleme üst sınırı (sn), her denemede iki katına çıkar
+    'backoff_max': 30,
+    'pool_maxsize': 20,   # host başına keep-alive bağlantı sayısı
+    'max_connections': 100,
+}
+
+
+def upstream_config(upstream):
+    overrides = getattr(settings, 'OUTBOUND_HTTP', {})
+    config = dict(DEFAULTS)
+    config.update(overrides.get('default', {}))
+    config.update(overrides.get(upstream, {}))
+    return config
+
+
+class UpstreamStats:
+    """İşlem (worker) başına upstream metrikleri: istek/hata/retry sayıları ve gecikme dağılımı"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stats = defaultdict(lambda: {
+                'requests': 0,
+                'errors': defaultdict(int),
+                'retries': 0,
+                'latency_ms': 0.0,
+                'max_latency_ms': 0.0,
+                'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            })
+
+    def record(self, upstream, duration_ms, error=None):
+        """error: None, 'timeout', 'connection' ya da HTTP durum kodu"""
+        bucket = next((i for i, limit in enumerate(LATENCY_BUCKETS_MS) if duration_ms < limit), len(LATENCY_BUCKETS_MS))
+        with self._lock:
+            stats = self._stats[upstream]
+            stats['requests'] += 1
+            stats['latency_ms'] += duration_ms
+            stats['max_latency_ms'] = max(stats['max_latency_ms'], duration_ms)
+            stats['buckets'][bucket] += 1
+            if error is not None:
+                stats['errors'][str(error)] += 1
+
+    def record_retry(self, upstream):
+        with self._lock:
+            self._stats[upstream]['retries'] += 1
+
+    def snapshot(self):
+        labels = [f"<{limit}ms" for limit in LATENCY_BUCKETS_MS] + [f">={LATENCY_BUCKETS_MS[-1]}ms"]
+        with self._lock:
+            return {
+                upstream: {
+                    'requests': stats['requests'],
+                    'errors': dict(stats['errors']),
+                    'errorCount': sum(stats['errors'].values()),
+                    'retries': stats['retries'],
+                    'avgLatencyMs': round(stats['latency_ms'] / stats['requests'], 2) if stats['requests'] else 0,
+                    'maxLatencyMs': round(stats['max_latency_ms'], 2),
+                    'latencyBuckets': dict(zip(labels, stats['buckets'])),
+                }
+                for upstream, stats in sorted(self._stats.items())
+            }
+
+
+upstream_stats = UpstreamStats()
+
+
+def _backoff_delay(config, attempt):
+    # Full jitter: eşzamanlı başarısız olan worker'lar aynı anda tekrar denemesin
+    return random.uniform(0, min(config['backoff_max'], config['backoff'] * 2 ** attempt))
+
+
+def _retry_after(headers, config):
+    try:
+        return min(float(headers.get('Retry-After')), config['backoff_max'])
+    except (TypeError, ValueError):
+        return None
+
+
+def _elapsed_ms(started):
+    return (time.perf_counter() - started) * 1000
+
+
+def _retryable_status(method, status_code, headers):
+    if method.upper() in IDEMPOTENT_METHODS:
+        return status_code in RETRY_STATUSES
+    return status_code in UNSAFE_RETRY_STATUSES and headers.get('Retry-After') is not None
+
+
+def _sync_connect_error(e):
+    """İstek gönderilmeden (bağlantı kurulurken) oluşan requests hatası mı"""
+    if isinstance(e, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(e, requests.exceptions.ConnectionError) and not isinstance(e, requests.exceptions.Timeout):
+        reason = e.args[0] if e.args else None
+        return isinstance(getattr(reason, 'reason', reason), NewConnectionError)
+    return False
+
+
+# --- Senkron istemci ---
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(upstream):
+    """Upstream için paylaşılan requests.Session (thread'ler arası güvenli kullanılır)"""
+    with _sessions_lock:
+        session = _sessions.get(upstream)
+        if session is None:
+            config = upstream_config(upstream)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=config['pool_maxsize'])
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[upstream] = session
+    return session
+
+
+def _sync_timeout(config, timeout):
+    # Sayı verilirse okuma zaman aşımıdır; bağlantı zaman aşımı upstream ayarından gelir
+    if timeout is None:
+        return (config['connect_timeout'], config['read_timeout'])
+    if isinstance(timeout, tuple):
+        return timeout
+    return (config['connect_timeout'], timeout)
+
+
+def request(upstream, method, url, *, timeout=None, retries=None, **kwargs):
+    """
+    requests.Response döndürür. Bağlantı/zaman aşımı hataları son denemeden sonra (ya da
+    yeniden denenmeyecekse hemen) requests.exceptions olarak yükselir; yeniden denenebilir
+    durum kodları son denemede yanıt olarak döner. Gövde tekrar gönderilebilir olmalıdır (dosya yerine bytes).
+    """
+    config = upstream_config(upstream)
+    retries = config['retries'] if retries is None else retries
+    session = get_session(upstream)
+    timeout = _sync_timeout(config, timeout)
+
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            error = 'timeout' if isinstance(e, requests.exceptions.Timeout) else 'connection'
+            upstream_stats.record(upstream, _elapsed_ms(started), error)
+            if attempt >= retries or not (method.upper() in IDEMPOTENT_METHODS or _sync_connect_error(e)):
+                raise
+            delay = _backoff_delay(config, attempt)
+            logger.warning(f"{upstream} request attempt {attempt + 1} failed ({error}: {e}), retrying in {delay:.1f}s")
+        else:
+            status_code = response.status_code
+            upstream_stats.record(upstream, _elapsed_ms(started), status_code if status_code >= 400 else None)
+            if attempt >= retries or not _retryable_status(method, status_code, response.headers):
+                return response
+            delay = _retry_after(response.headers, config) or _backoff_delay(config, attempt)
+            response.close()
+            logger.warning(f"{upstream} returned {status_code} on attempt {attempt + 1}, retrying in {delay:.1f}s")
+
+        upstream_stats.record_retry(upstream)
+        attempt += 1
+        time.sleep(delay)
+
+
+def get(upstream, url, **kwargs):
+    return request(upstream, 'GET', url, **kwargs)
+
+
+def post(upstream, url, **kwargs):
+    return request(upstream, 'POST', url, **kwargs)
+
+
+# --- Async istemci ---
+
+# AsyncClient kendi event loop'una bağlıdır; ASGI'de worker başına tek loop, WSGI'de
+# (async_to_sync) istek başına loop olduğundan client'lar loop bazında tutulur
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client(upstream):
+    """Çalışan event loop ve upstream için paylaşılan httpx.AsyncClient"""
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(upstream)
+    if client is None or client.is_closed:
+        config = upstream_config(upstream)
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(config['read_timeout'], connect=config['connect_timeout']),
+            limits=httpx.Limits(
+                max_connections=config['max_connections'],
+                max_keepalive_connections=config['pool_maxsize'],
+            ),
+        )
+        clients[upstream] = client
+    return client
+
+
+async def _send(upstream, method, url, retries, stream, kwargs):
+    config = upstream_config(upstream)
+    retries = config['retries'] if retries is None else retries
+    client = get_async_client(upstream)
+
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        try:
+            response = await client.send(client.build_request(method, url, **kwargs), stream=stream)
+        except (httpx.TimeoutException, httpx.TransportError) as e:
+            error = 'timeout' if isinstance(e, httpx.TimeoutException) else 'connection'
+            upstream_stats.record(upstream, _elapsed_ms(started), error)
+            connect_error = isinstance(e, (httpx.ConnectTimeout, httpx.ConnectError))
+            if attempt >= retries or not (method.upper() in IDEMPOTENT_METHODS or connect_error):
+                raise
+            delay = _backoff_delay(config, attempt)
+            logger.warning(f"{upstream} request attempt {attempt + 1} failed ({error}: {e}), retrying in {delay:.1f}s")
+        else:
+            status_code = response.status_code
+            upstream_stats.record(upstream, _elapsed_ms(started), status_code if status_code >= 400 else None)
+            if attempt >= retries or not _retryable_status(method, status_code, response.headers):
+                return response
+            delay = _retry_after(response.headers, config) or _backoff_delay(config, attempt)
+            await response.aclose()
+            logger.warning(f"{upstream} returned {status_code} on attempt {attempt + 1}, retrying in {delay:.1f}s")
+
+        upstream_stats.record_retry(upstream)
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+async def arequest(upstream, method, url, *, retries=None, **kwargs):
+    """Gövdesi okunmuş httpx.Response döndürür (request() ile aynı retry kuralları)"""
+    return await _send(upstream, method, url, retries, False, kwargs)
+
+
+@contextlib.asynccontextmanager
+async def astream(upstream, method, url, *, retries=None, **kwargs):
+    """
+    Akış yanıtı. Yanıt başlıkları gelene kadar yeniden denenir; gövde okunmaya
+    başladıktan sonra deneme yapılmaz. Çıkışta (iptal dahil) bağlantı kapatılır.
+    Gecikme metriği başlıkların gelme süresidir.
+    """
+    response = await _send(upstream, method, url, retries, True, kwargs)
+    try:
+        yield response
+    finally:
+        await response.aclose()
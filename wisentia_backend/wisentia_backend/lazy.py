@@ -0,0 +1,86 @@
+"""
+Ağır opsiyonel modüller (whisper/torch, yt_dlp, web3) için tembel import.
+
+URLconf yüklenirken her worker bu kütüphaneleri import etmesin diye modül,
+ilk öznitelik erişiminde yüklenir. Yükleme süresi `lazy_import_stats()` ile
+okunabilir (bkz. `manage.py profile_imports`).
+
+    whisper = lazy_import('whisper')         # whisper.load_model(...) ilk çağrıda import eder
+    Web3 = lazy_attr('web3', 'Web3')         # Web3(...), Web3.HTTPProvider(...)
+    web3_exceptions = lazy_import('web3.exceptions')
+    ...
+    except web3_exceptions.InvalidAddress:   # except ifadesi yalnızca eşleştirmede değerlendirilir
+"""
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger('wisentia')
+
+_registry = {}  # modül adı -> LazyModule
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """İlk öznitelik erişiminde gerçek modülü import eden vekil"""
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self.load_seconds = None
+
+    def _load(self):
+        if self._module is None:
+            with _lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    self.load_seconds = time.perf_counter() - started
+                    logger.info(f"Lazy import {self._name}: {self.load_seconds * 1000:.0f} ms")
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+class _LazyAttribute:
+    """Tembel modüldeki bir nesneye (ör. sınıf) çağrı ve öznitelik erişimini yönlendirir"""
+    def __init__(self, module, attr):
+        self._lazy_module = module
+        self._attr = attr
+
+    def _resolve(self):
+        return getattr(self._lazy_module, self._attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+
+def lazy_import(name):
+    """Aynı ad için tek LazyModule döndürür"""
+    with _lock:
+        module = _registry.get(name)
+        if module is None:
+            module = _registry[name] = LazyModule(name)
+    return module
+
+
+def lazy_attr(module_name, attr):
+    return _LazyAttribute(lazy_import(module_name), attr)
+
+
+def lazy_import_stats():
+    """{modül adı: yükleme süresi (sn) ya da None}"""
+    return {name: module.load_seconds for name, module in sorted(_registry.items())}
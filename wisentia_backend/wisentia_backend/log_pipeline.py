@@ -0,0 +1,199 @@
+"""
+Bloklamayan loglama hattı.
+
+Django LOGGING'i her zamanki gibi dictConfig ile kurar (settings.LOGGING_CONFIG),
+ardından LOGGING_ASYNC_LOGGERS'daki logger'ların handler'larını tek bir
+QueueHandler ile değiştirir. Biçimlendirme (traceback dahil) ve disk I/O
+arka plandaki QueueListener thread'inde yapılır; istek thread'i yalnızca
+kaydı kuyruğa koyar. Kuyruk doluysa kayıt bekletilmeden düşürülür.
+
+Kuyruğa girmeden önce (istek thread'inde, ucuz) iki filtre çalışır:
+- SamplingFilter: logger bazında DEBUG/INFO örnekleme oranı (LOGGING_SAMPLING)
+- RateLimitFilter: aynı satırdan gelen tekrar eden mesajları aralık başına sınırlar
+"""
+import atexit
+import json
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+_listeners = []
+
+# Kayıt üzerinde standart olan alanlar; geri kalanlar `extra` olarak JSON'a yazılır
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON olarak yazar (extra alanlar dahil)"""
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'line': record.lineno,
+            'process': record.process,
+            'thread': record.thread,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exc'] = record.exc_text
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    DEBUG/INFO kayıtlarını logger adına göre örnekler. rates: {'wisentia.print': 0.1, ...}
+    En uzun eşleşen önek kullanılır; WARNING ve üstü her zaman geçer.
+    """
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+
+    def _rate(self, name):
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + '.'):
+                return rate
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Aynı çağrı noktasından (logger, dosya, satır) gelen kayıtları `interval`
+    saniyede `burst` adetle sınırlar. Bastırılan sayısı, bir sonraki geçen
+    kayda `suppressed` alanı olarak eklenir. ERROR ve üstü sınırlanmaz.
+    """
+    def __init__(self, burst=20, interval=10.0):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._windows = {}  # key -> [pencere başlangıcı, geçen, bastırılan]
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if len(self._windows) > 10000:
+                    self._windows = {key: self._windows[key]}
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Kuyruk doluysa istek thread'ini bekletmek yerine kaydı düşürür"""
+    def __init__(self, queue_):
+        super().__init__(queue_)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Mesaj argümanlarını burada birleştir (sonradan değişebilecek nesnelere referans
+        # tutulmasın); traceback biçimlendirmesi listener thread'ine kalır
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _start_listener(handlers):
+    log_queue = queue.Queue(maxsize=getattr(settings, 'LOGGING_QUEUE_SIZE', 10000))
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(getattr(settings, 'LOGGING_SAMPLING', {})))
+    burst, interval = getattr(settings, 'LOGGING_RATE_LIMIT', (20, 10.0))
+    queue_handler.addFilter(RateLimitFilter(burst, interval))
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    return queue_handler
+
+
+def _stop_listeners():
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def _restart_listeners_after_fork():
+    # Fork'tan sonra listener thread'i çocuk süreçte yoktur (ör. gunicorn --preload)
+    for listener in _listeners:
+        listener._thread = None
+        listener.start()
+
+
+def configure_logging(logging_settings):
+    """settings.LOGGING_CONFIG: dictConfig + seçili logger'ları kuyruk hattına taşıma"""
+    logging.config.dictConfig(logging_settings)
+
+    # Aynı handler kümesini paylaşan logger'lar tek kuyruk/listener kullanır
+    groups = {}
+    for name in getattr(settings, 'LOGGING_ASYNC_LOGGERS', []):
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            continue
+        key = tuple(sorted(id(handler) for handler in logger.handlers))
+        groups.setdefault(key, (list(logger.handlers), []))[1].append(logger)
+
+    for handlers, loggers in groups.values():
+        queue_handler = _start_listener(handlers)
+        for logger in loggers:
+            logger.handlers = [queue_handler]
+
+    if groups and not getattr(configure_logging, '_hooks_installed', False):
+        atexit.register(_stop_listeners)
+        os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+        configure_logging._hooks_installed = True
+
+
+_print_logger = logging.getLogger('wisentia.print')
+_PRINT_WARNING_MARKERS = ('error', 'hata', 'failed', 'exception', '❌', '⚠️')
+
+
+def debug_print(msg, *args):
+    """
+    print() yerine: çıktıyı 'wisentia.print' logger'ına gönderir. Hata içerikli
+    mesajlar WARNING, diğerleri DEBUG seviyesindedir (PRINT_LOG_LEVEL ile açılır).
+    Değerler %-stili argüman olarak verilir; mesaj yalnızca seviye açıksa biçimlenir:
+
+        debug_print("Found %s quizzes for course %s", len(quizzes), course_id)
+    """
+    # Seviye format şablonundan belirlenir; argümanlar biçimlenmeden önce kontrol edilir
+    level = logging.WARNING if any(marker in msg.lower() for marker in _PRINT_WARNING_MARKERS) else logging.DEBUG
+    if _print_logger.isEnabledFor(level):
+        _print_logger.log(level, msg, *args, stacklevel=2)
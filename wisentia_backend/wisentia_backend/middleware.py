@@ -1,8 +1,96 @@
+import hashlib
 import json
+import logging
+import re
+import time
 import traceback
+from collections import Counter
+from django.conf import settings
+from django.db import connection
 from django.http import JsonResponse
 from rest_framework import status
 
+slow_query_logger = logging.getLogger('wisentia.slow_queries')
+
+# SQL parmak izi için normalizasyon desenleri
+_SQL_STRING_RE = re.compile(r"N?'(?:[^']|'')*'")
+_SQL_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SQL_PLACEHOLDER_RE = re.compile(r"%s|\?")
+_SQL_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SQL_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Literal ve parametreleri '?' ile değiştirerek SQL'i normalize eder"""
+    sql = _SQL_STRING_RE.sub('?', sql)
+    sql = _SQL_NUMBER_RE.sub('?', sql)
+    sql = _SQL_PLACEHOLDER_RE.sub('?', sql)
+    sql = _SQL_IN_LIST_RE.sub('(?)', sql)
+    return _SQL_WHITESPACE_RE.sub(' ', sql).strip()
+
+
+def sql_fingerprint(sql):
+    """Normalize edilmiş SQL'in kısa parmak izini döndürür"""
+    return hashlib.md5(normalize_sql(sql).encode()).hexdigest()[:12]
+
+
+class QueryProfiler:
+    """
+    connection.execute_wrapper ile kullanılan cursor sarmalayıcısı.
+    Sorgu sayısını, toplam DB süresini ve tekrar eden sorguları toplar.
+    """
+    def __init__(self, path='', slow_threshold_ms=None):
+        self.path = path
+        if slow_threshold_ms is None:
+            slow_threshold_ms = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 500)
+        self.slow_threshold_ms = slow_threshold_ms
+        self.query_count = 0
+        self.total_time_ms = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            self.query_count += 1
+            self.total_time_ms += duration_ms
+            self.statements[sql] += 1
+
+            if duration_ms >= self.slow_threshold_ms:
+                slow_query_logger.warning(
+                    "Slow query %.1fms fingerprint=%s path=%s sql=%s",
+                    duration_ms, sql_fingerprint(sql), self.path, normalize_sql(sql)
+                )
+
+    @property
+    def duplicate_count(self):
+        """Aynı SQL metninin ilkinden sonraki tekrar sayısı (N+1 göstergesi)"""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+
+class QueryProfilerMiddleware:
+    """
+    Ham connection.cursor() kullanımları dahil her isteğin SQL maliyetini ölçer
+    ve X-DB-Queries / X-DB-Time-Ms / X-DB-Duplicates header'larını ekler.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_threshold_ms = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 500)
+
+    def __call__(self, request):
+        profiler = QueryProfiler(request.path, self.slow_threshold_ms)
+        with connection.execute_wrapper(profiler):
+            response = self.get_response(request)
+
+        response['X-DB-Queries'] = str(profiler.query_count)
+        response['X-DB-Time-Ms'] = f"{profiler.total_time_ms:.1f}"
+        response['X-DB-Duplicates'] = str(profiler.duplicate_count)
+
+        return response
+
+
 class APIExceptionMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -15,7 +103,9 @@ class APIExceptionMiddleware:
         # API isteklerini kontrol et
         if request.path.startswith('/api/'):
             error_message = str(exception)
-            error_detail = traceback.format_exc() if hasattr(exception, '__traceback__') else None
+            # Traceback yalnızca yanıta eklenecekse istek thread'inde biçimlendirilir;
+            # log kaydındaki exc_info'yu log kuyruğunun listener thread'i biçimlendirir
+            error_detail = traceback.format_exc() if settings.DEBUG else None
             
             # JSON yanıtı oluştur
             response_data = {
@@ -24,7 +114,6 @@ class APIExceptionMiddleware:
             }
             
             # Debug modunda daha fazla detay ekle
-            from django.conf import settings
             if settings.DEBUG and error_detail:
                 response_data['traceback'] = error_detail
             
@@ -32,11 +121,8 @@ class APIExceptionMiddleware:
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
             
             # Log the error
-            import logging
             logger = logging.getLogger('django')
-            logger.error(f"API Error: {error_message}")
-            if error_detail:
-                logger.error(error_detail)
+            logger.error(f"API Error: {error_message}", exc_info=exception)
             
             return JsonResponse(response_data, status=status_code)
         
@@ -50,13 +136,13 @@ class RateLimitHeaderMiddleware:
     def __call__(self, request):
         response = self.get_response(request)
         
-        # X-RateLimit bilgilerini ekle
-        if hasattr(request, 'throttle_status'):
-            for scope, status in request.throttle_status.items():
-                if status:
-                    response['X-RateLimit-Scope'] = scope
-                    response['X-RateLimit-Remaining'] = status['remaining']
-                    response['X-RateLimit-Reset'] = status['reset']
+        # X-RateLimit bilgilerini ekle (birden çok scope varsa en kısıtlayıcı olanı)
+        if getattr(request, 'throttle_status', None):
+            scope, status = min(request.throttle_status.items(), key=lambda item: item[1]['remaining'])
+            response['X-RateLimit-Scope'] = scope
+            response['X-RateLimit-Limit'] = status['limit']
+            response['X-RateLimit-Remaining'] = status['remaining']
+            response['X-RateLimit-Reset'] = status['reset']
         
         return response
 
@@ -0,0 +1,62 @@
+"""
+Ham cursor sonuçları için satır eşleme yardımcıları.
+
+`columns = [col[0] for col in cursor.description]` +
+`[dict(zip(columns, row)) for row in cursor.fetchall()]` kalıbının ortak hali.
+Kolon listesi başına üretilen namedtuple sınıfları önbelleğe alınır; büyük
+sonuçlar fetchmany ile parça parça okunabilir.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def get_columns(cursor):
+    """cursor.description'dan kolon adlarını döndürür"""
+    return tuple(col[0] for col in cursor.description)
+
+
+@lru_cache(maxsize=512)
+def row_class(columns):
+    """Kolon listesi için (önbellekli) namedtuple sınıfı; __slots__ ile kompakt satır nesnesi"""
+    return namedtuple('Row', columns, rename=True)
+
+
+def fetch_dicts(cursor):
+    """Tüm sonucu dict listesi olarak döndürür (JSON yanıtları için)"""
+    columns = get_columns(cursor)
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def fetch_one_dict(cursor):
+    """Tek satırı dict olarak döndürür, satır yoksa None"""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip(get_columns(cursor), row))
+
+
+def fetch_rows(cursor):
+    """Tüm sonucu namedtuple listesi olarak döndürür (dict'e göre çok daha az bellek)"""
+    make_row = row_class(get_columns(cursor))._make
+    return [make_row(row) for row in cursor.fetchall()]
+
+
+def iter_rows(cursor, batch_size=DEFAULT_BATCH_SIZE, as_dict=False):
+    """
+    Sonucu fetchmany ile parça parça okuyan generator.
+    Tüm sonuç kümesini belleğe almadan export / toplu işlem yapmak için.
+    """
+    columns = get_columns(cursor)
+    make_row = row_class(columns)._make
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        if as_dict:
+            for row in batch:
+                yield dict(zip(columns, row))
+        else:
+            for row in batch:
+                yield make_row(row)
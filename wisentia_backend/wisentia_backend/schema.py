@@ -0,0 +1,81 @@
+"""
+Veritabanı şema kayıt defteri.
+
+Tablo/kolon varlığı, her istekte INFORMATION_SCHEMA sorgulamak yerine ilk
+has_table()/has_column() çağrısında bir kez okunur ve bellekte tutulur (açılışta
+veritabanına gidilmez; migrate/collectstatic gibi komutlar bağlantı açmaz). Şema değiştiğinde
+`python manage.py inspect_schema --bootstrap` ile eksik tablolar oluşturulur;
+çalışan worker'lar yeni şemayı yeniden başlatıldığında görür.
+"""
+import logging
+import threading
+from django.db import connection
+
+logger = logging.getLogger('wisentia')
+
+
+class SchemaRegistry:
+    def __init__(self):
+        self._tables = None  # {tablo_adı (küçük harf): {kolon_adı (küçük harf), ...}}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # eşzamanlı ilk çağrılar tek sorgu çalıştırsın
+
+    def load(self):
+        """INFORMATION_SCHEMA'dan tüm tablo ve kolonları tek sorguda okur"""
+        tables = {}
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT t.TABLE_NAME, c.COLUMN_NAME
+                FROM INFORMATION_SCHEMA.TABLES t
+                LEFT JOIN INFORMATION_SCHEMA.COLUMNS c
+                    ON c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME
+            """)
+            for table_name, column_name in cursor.fetchall():
+                columns = tables.setdefault(table_name.lower(), set())
+                if column_name:
+                    columns.add(column_name.lower())
+
+        with self._lock:
+            self._tables = tables
+        logger.info(f"Schema registry loaded: {len(tables)} tables")
+        return tables
+
+    refresh = load
+
+    def _get_tables(self):
+        tables = self._tables
+        if tables is None:
+            with self._load_lock:
+                if self._tables is None:
+                    self.load()
+                tables = self._tables
+        return tables
+
+    def has_table(self, table_name):
+        return table_name.lower() in self._get_tables()
+
+    def has_column(self, table_name, column_name):
+        return column_name.lower() in self._get_tables().get(table_name.lower(), ())
+
+    def columns(self, table_name):
+        return sorted(self._get_tables().get(table_name.lower(), ()))
+
+    def table_names(self):
+        return sorted(self._get_tables())
+
+    @property
+    def loaded(self):
+        return self._tables is not None
+
+
+schema_registry = SchemaRegistry()
+
+
+def has_table(table_name):
+    """Tablonun veritabanında olup olmadığını (bellekten) döndürür"""
+    return schema_registry.has_table(table_name)
+
+
+def has_column(table_name, column_name):
+    """Kolonun tabloda olup olmadığını (bellekten) döndürür"""
+    return schema_registry.has_column(table_name, column_name)
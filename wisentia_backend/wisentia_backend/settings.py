@@ -54,6 +54,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'wisentia_backend.middleware.APIExceptionMiddleware',
+    'wisentia_backend.middleware.QueryProfilerMiddleware',
     'wisentia_backend.middleware.RateLimitHeaderMiddleware',
 ]
 
@@ -77,6 +78,9 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'wisentia_backend.wsgi.application'
+ASGI_APPLICATION = 'wisentia_backend.asgi.application'
+# İstemci koptuğunda uygulama görevinin iptal edileceği (SSE) yollar, bkz. asgi.py
+ASGI_DISCONNECT_WATCH_PATHS = ['/api/ai/chat/message/stream/']
 # Cache ayarları
 CACHES = {
     "default": {
@@ -98,13 +102,35 @@ CACHE_TIMEOUT = {
     'courses': 60 * 60,  # 1 saat
     'user_profile': 60 * 10,  # 10 dakika
     'popular_content': 60 * 60 * 24,  # 1 gün
+    'auth_principal': 60 * 5,  # 5 dakika (JWT ile çözülen kullanıcı, Redis)
+    'courses_list': 60 * 15,  # 15 dakika
+    'available_nfts': 60 * 5,  # 5 dakika
+    'quests_public': 60 * 5,  # 5 dakika
 }
+
+# cache_response: süresi dolan veri yenilenirken en fazla bu kadar süre (saniye) eski haliyle sunulur
+CACHE_STALE_TIMEOUT = 60 * 5
+# TTL'lere eklenen rastgele sapma oranı (±%10)
+CACHE_TTL_JITTER = 0.1
+# Yeniden hesaplama kilidinin süresi ve kilit beklenirken en fazla bekleme (saniye)
+CACHE_LOCK_TIMEOUT = 30
+CACHE_LOCK_WAIT = 5
+# Etiket hit/invalidation sayaçlarının worker'dan Redis'e yazılma aralığı (saniye)
+CACHE_TAG_STATS_FLUSH_INTERVAL = 10
+
+# JWT kullanıcı önbelleğinin worker içi (LRU) katmanı
+AUTH_PRINCIPAL_LOCAL_TTL = 5  # saniye
+AUTH_PRINCIPAL_LOCAL_MAXSIZE = 2048
 # Database
 DATABASES = {
     'default': {
-        'ENGINE': 'mssql',
+        'ENGINE': 'wisentia_backend.db_backend',  # mssql + bağlantı havuzu metrikleri
         'NAME': 'WisentiaDB',
         'HOST': 'BILALKAYA\\SQLEXPRESS',  # SQL Server adınıza göre değiştirin
+        # Kalıcı bağlantılar: worker başına bu süre (saniye) sonunda bağlantı yenilenir
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=300, cast=int),
+        # Yeniden kullanılan bağlantıyı her istek başında doğrula (pre-ping)
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
         'OPTIONS': {
             'driver': 'ODBC Driver 17 for SQL Server',
             'trusted_connection': 'yes',
@@ -112,6 +138,9 @@ DATABASES = {
     }
 }
 
+# ODBC sürücü yöneticisi seviyesinde bağlantı havuzu (thread'ler arası yeniden kullanım)
+DB_ODBC_POOLING = config('DB_ODBC_POOLING', default=True, cast=bool)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -209,6 +238,8 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 # Loglama ayarları
+# dictConfig sonrası LOGGING_ASYNC_LOGGERS'ı QueueHandler/QueueListener hattına taşır
+LOGGING_CONFIG = 'wisentia_backend.log_pipeline.configure_logging'
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -221,6 +252,9 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'wisentia_backend.log_pipeline.JSONFormatter',
+        },
     },
     'handlers': {
         'console': {
@@ -232,6 +266,12 @@ LOGGING = {
             'level': 'DEBUG',
             'class': 'logging.FileHandler',
             'filename': os.path.join(BASE_DIR, 'logs/wisentia.log'),
+            'formatter': 'json',
+        },
+        'slow_queries_file': {
+            'level': 'WARNING',
+            'class': 'logging.FileHandler',
+            'filename': os.path.join(BASE_DIR, 'logs/slow_queries.log'),
             'formatter': 'verbose',
         },
     },
@@ -246,9 +286,31 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': True,
         },
+        'wisentia.slow_queries': {
+            'handlers': ['slow_queries_file'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        # print() yerine kullanılan debug_print; DEBUG çıktıları için PRINT_LOG_LEVEL=DEBUG
+        'wisentia.print': {
+            'level': config('PRINT_LOG_LEVEL', default='INFO'),
+        },
     },
 }
 
+# Handler'ları kuyruk üzerinden (ayrı thread'de) çalışacak logger'lar
+LOGGING_ASYNC_LOGGERS = ['django', 'wisentia', 'wisentia.slow_queries']
+LOGGING_QUEUE_SIZE = 10000
+# DEBUG/INFO örnekleme oranları (logger öneki -> oran); WARNING ve üstü örneklenmez
+LOGGING_SAMPLING = {
+    'wisentia.print': 0.1,
+}
+# Aynı log satırından interval saniyede en fazla burst kayıt (ERROR ve üstü hariç)
+LOGGING_RATE_LIMIT = (20, 10.0)
+
+# SQL profiler: bu eşiği aşan sorgular logs/slow_queries.log dosyasına yazılır (milisaniye)
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=500, cast=int)
+
 # logs dizini oluşturulduğundan emin olalım
 if not os.path.exists(os.path.join(BASE_DIR, 'logs')):
     os.makedirs(os.path.join(BASE_DIR, 'logs'))
@@ -258,6 +320,100 @@ OLLAMA_API_URL = config('OLLAMA_API_URL', default='http://localhost:11434/api')
 LLAMA_MODEL = config('LLAMA_MODEL', default='llama3:8b')
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
+# Async LLM akışları (ai/streaming.py): okuma zaman aşımı parçalar arası bekleme süresidir
+LLM_STREAM_CONNECT_TIMEOUT = config('LLM_STREAM_CONNECT_TIMEOUT', default=10, cast=float)
+LLM_STREAM_READ_TIMEOUT = config('LLM_STREAM_READ_TIMEOUT', default=120, cast=float)
+LLM_STREAM_MAX_CONNECTIONS = config('LLM_STREAM_MAX_CONNECTIONS', default=500, cast=int)
+
+# Dış HTTP istemcisi (wisentia_backend/http_client.py): upstream başına keep-alive havuzu,
+# zaman aşımları (sn) ve jitter'lı backoff ile yeniden deneme. POST'lar (LLM üretimi, Pinata
+# yüklemesi) yalnızca bağlantı hatasında ya da Retry-After'lı 429/503'te yeniden gönderilir
+OUTBOUND_HTTP = {
+    'default': {'connect_timeout': 5, 'read_timeout': 30, 'retries': 2, 'backoff': 0.5, 'pool_maxsize': 20},
+    'ollama': {'connect_timeout': 10, 'read_timeout': 1800, 'backoff': 5, 'max_connections': LLM_STREAM_MAX_CONNECTIONS},
+    'anthropic': {'connect_timeout': 10, 'read_timeout': 1800, 'backoff': 5, 'max_connections': LLM_STREAM_MAX_CONNECTIONS},
+    'pinata': {'read_timeout': 120},
+    'youtube': {'connect_timeout': 3, 'read_timeout': 5, 'retries': 1},
+}
+
+# LLM yanıt önbelleği (ai/llm_cache.py): birebir aynı istek için kayıtlı yanıt döner.
+# temperature bu eşiğin üzerindeyse önbellek atlanır; TTL kullanım alanına göre (sn)
+LLM_CACHE_ENABLED = config('LLM_CACHE_ENABLED', default=True, cast=bool)
+LLM_CACHE_MAX_TEMPERATURE = config('LLM_CACHE_MAX_TEMPERATURE', default=0.7, cast=float)
+LLM_CACHE_TTL = {
+    'default': 60 * 60,  # 1 saat
+    'chat': 60 * 60 * 6,  # 6 saat (SSS tarzı sorular)
+    'quest': 60 * 60 * 24,  # 1 gün
+    'quiz': 60 * 60 * 24 * 7,  # 1 hafta (aynı video içeriği)
+}
+# Ollama sohbet isteklerine açıkça gönderilen temperature (Ollama'nın kendi varsayılanı 0.8);
+# LLM_CACHE_MAX_TEMPERATURE'ın üzerindeki bir değer sohbet önbelleğini devre dışı bırakır
+CHAT_TEMPERATURE = config('CHAT_TEMPERATURE', default=0.7, cast=float)
+
+# Sohbet bağlamı (ai/chat_context.py): önceki mesajlar token bütçesi içinde gönderilir,
+# eski kısım her CHAT_SUMMARY_EVERY_TURNS turda bir arka planda kayan özete katlanır.
+# CHAT_CONTEXT_MAX_MESSAGES, RECENT_MESSAGES + 2 * EVERY_TURNS'ten büyük olmalıdır
+CHAT_CONTEXT_TOKEN_BUDGET = config('CHAT_CONTEXT_TOKEN_BUDGET', default=3000, cast=int)
+CHAT_CONTEXT_MAX_MESSAGES = config('CHAT_CONTEXT_MAX_MESSAGES', default=40, cast=int)
+CHAT_CONTEXT_RECENT_MESSAGES = config('CHAT_CONTEXT_RECENT_MESSAGES', default=6, cast=int)
+CHAT_SUMMARY_EVERY_TURNS = config('CHAT_SUMMARY_EVERY_TURNS', default=6, cast=int)
+CHAT_SUMMARY_MAX_TOKENS = config('CHAT_SUMMARY_MAX_TOKENS', default=400, cast=int)
+CHAT_SUMMARY_TIMEOUT = config('CHAT_SUMMARY_TIMEOUT', default=120, cast=int)
+CHAT_SUMMARY_TTL = 60 * 60 * 24 * 30  # 30 gün
+CHAT_CHARS_PER_TOKEN = 4
+
+# Akışla üretilen AI mesajları (ai/stream_checkpoint.py) bu aralıklarla kısmen kaydedilir;
+# yeniden bağlanan istemci mesajı kaldığı yerden okur
+CHAT_STREAM_CHECKPOINT_CHARS = config('CHAT_STREAM_CHECKPOINT_CHARS', default=1000, cast=int)
+CHAT_STREAM_CHECKPOINT_SECONDS = config('CHAT_STREAM_CHECKPOINT_SECONDS', default=2, cast=float)
+CHAT_STREAM_RESUME_POLL_INTERVAL = 0.5
+# Bu kadar süre ilerlemeyen 'streaming' mesaj kesilmiş sayılır
+CHAT_STREAM_STALE_SECONDS = LLM_STREAM_READ_TIMEOUT + 30
+
+# AI üretim iş kuyruğu (ai/jobs.py, `manage.py run_ai_workers`): kira (görünürlük zaman aşımı)
+# heartbeat ile uzatılır; başarısız iş jitter'lı exponential backoff ile yeniden denenir (sn)
+AI_WORKER_CONCURRENCY = config('AI_WORKER_CONCURRENCY', default=2, cast=int)
+AI_JOB_LEASE_SECONDS = config('AI_JOB_LEASE_SECONDS', default=300, cast=int)
+AI_JOB_HEARTBEAT_SECONDS = 60
+AI_JOB_MAX_ATTEMPTS = config('AI_JOB_MAX_ATTEMPTS', default=3, cast=int)
+AI_JOB_RETRY_BACKOFF = 30
+AI_JOB_RETRY_BACKOFF_MAX = 60 * 30
+AI_JOB_POLL_INTERVAL = config('AI_JOB_POLL_INTERVAL', default=2, cast=float)
+
+# Quest kuyruğu toplu işleme (ai.views.process_quest_queue): istek başına en fazla
+# QUEST_BATCH_MAX_SIZE kayıt alınır; AIJobs tablosu yoksa web sürecinde QUEST_BATCH_CONCURRENCY
+# paralellikle üretilir. LLM_MAX_CONCURRENCY süreç başına eşzamanlı Ollama/Anthropic HTTP isteği
+# sınırıdır (ai/llm_limits.py; önbellek isabetleri beklemez).
+QUEST_BATCH_MAX_SIZE = config('QUEST_BATCH_MAX_SIZE', default=10, cast=int)
+QUEST_BATCH_CONCURRENCY = config('QUEST_BATCH_CONCURRENCY', default=3, cast=int)
+QUEST_BATCH_TTL = 60 * 60 * 24  # batch ilerleme kaydı: 1 gün
+LLM_MAX_CONCURRENCY = config('LLM_MAX_CONCURRENCY', default=4, cast=int)
+
+# Whisper transkripsiyon pool'u (ai/transcriber.py): model her süreçte bir kez yüklenir,
+# worker'lar MAX_TASKS_PER_CHILD işten sonra ya da RSS sınırını aşınca yenilenir (0 = sınırsız).
+# WHISPER_POOL_SIZE=0: otomatik (çekirdeklerin yarısı, RAM'in yarısına WORKER_MAX_RSS_MB'lık kaç worker
+# sığıyorsa; bkz. transcriber.default_pool_size). Pool boyutu x WORKER_MAX_RSS_MB bellek ayrılabilmelidir
+WHISPER_MODEL = config('WHISPER_MODEL', default='base')
+WHISPER_DEVICE = config('WHISPER_DEVICE', default='cpu')
+WHISPER_POOL_SIZE = config('WHISPER_POOL_SIZE', default=0, cast=int)
+WHISPER_MAX_TASKS_PER_CHILD = config('WHISPER_MAX_TASKS_PER_CHILD', default=50, cast=int)
+WHISPER_WORKER_MAX_RSS_MB = config('WHISPER_WORKER_MAX_RSS_MB', default=3072, cast=int)
+WHISPER_TASK_TIMEOUT = config('WHISPER_TASK_TIMEOUT', default=1800, cast=int)
+# Aynı video için eşzamanlı transkripsiyonları birleştiren kilidin süresi (ai/transcripts.py)
+TRANSCRIPT_LOCK_TIMEOUT = config('TRANSCRIPT_LOCK_TIMEOUT', default=2400, cast=int)
+# Çok videolu quiz üretimi: aynı anda işlenen video ve eşzamanlı indirme sayısı
+TRANSCRIBE_PIPELINE_MAX_VIDEOS = config('TRANSCRIBE_PIPELINE_MAX_VIDEOS', default=16, cast=int)
+TRANSCRIBE_DOWNLOAD_CONCURRENCY = config('TRANSCRIBE_DOWNLOAD_CONCURRENCY', default=4, cast=int)
+# Metin bütçeli transcript'ler: karakter bütçesi bu hızla süreye çevrilir ve videoya yayılan bölümlerden indirilir
+TRANSCRIPT_CHARS_PER_SECOND = config('TRANSCRIPT_CHARS_PER_SECOND', default=12, cast=float)
+TRANSCRIPT_SAMPLE_WINDOWS = config('TRANSCRIPT_SAMPLE_WINDOWS', default=3, cast=int)
+# Ses akış modu: yt-dlp + ffmpeg ile bellekte PCM; sığmayan ses dosyaya indirilir.
+# AUDIO_DIR'deki AUDIO_ORPHAN_MAX_AGE saniyeden eski dosyalar temizlenir (manage.py clean_audio_files)
+AUDIO_STREAMING = config('AUDIO_STREAMING', default=True, cast=bool)
+AUDIO_STREAM_MAX_MB = config('AUDIO_STREAM_MAX_MB', default=256, cast=int)
+AUDIO_ORPHAN_MAX_AGE = config('AUDIO_ORPHAN_MAX_AGE', default=6 * 3600, cast=int)
+FFMPEG_BINARY = config('FFMPEG_BINARY', default='ffmpeg')
+
 
 # settings.py dosyasına eklenecek ayarlar
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
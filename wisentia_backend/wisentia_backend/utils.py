@@ -2,6 +2,10 @@ from django.core.cache import cache
 from django.conf import settings
 import hashlib
 import json
+import random
+import threading
+import time
+from collections import Counter
 from functools import wraps
 from rest_framework.response import Response
 
@@ -33,17 +37,167 @@ def get_cached_data(key):
     return cache.get(key)
 
 def invalidate_cache(key_or_pattern):
-    """Belirli bir anahtarı veya deseni önbellekten siler"""
+    """
+    Belirli bir anahtarı veya deseni önbellekten siler.
+    Desenler Redis KEYS yerine artımlı SCAN (iter_keys) ile taranır; yeni kod
+    desen yerine invalidate_tags kullanmalıdır.
+    """
     if '*' in key_or_pattern:
-        keys = cache.keys(key_or_pattern)
-        if keys:
-            cache.delete_many(keys)
+        if hasattr(cache, 'iter_keys'):
+            batch = []
+            for key in cache.iter_keys(key_or_pattern):
+                batch.append(key)
+                if len(batch) >= 500:
+                    cache.delete_many(batch)
+                    batch = []
+            if batch:
+                cache.delete_many(batch)
     else:
         cache.delete(key_or_pattern)
 
 
-def cache_response(timeout=None, key_prefix=None):
-    """API yanıtlarını önbellekleyen bir dekoratör"""
+def _tag_version_key(tag):
+    return f"{settings.CACHE_KEY_PREFIX}tagver_{tag}"
+
+
+def _tag_stats_key(event, tag):
+    return f"{settings.CACHE_KEY_PREFIX}tagstats_{event}_{tag}"
+
+
+TAG_STATS_REGISTRY_KEY = 'tagstats_registry'
+TAG_STATS_EVENTS = ('hits', 'misses', 'invalidations')
+
+
+def _incr_counter(key, amount=1):
+    """Süresiz sayacı atomik olarak artırır, yoksa oluşturur"""
+    if cache.add(key, amount, None):
+        return
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.set(key, amount, None)
+
+
+class CacheTagStats:
+    """
+    Etiket bazlı hit / miss / invalidation sayaçları.
+    Her hit'te Redis'e gitmemek için sayaçlar worker içinde biriktirilip
+    CACHE_TAG_STATS_FLUSH_INTERVAL saniyede bir Redis'e yazılır.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+
+    def record(self, event, tags):
+        interval = getattr(settings, 'CACHE_TAG_STATS_FLUSH_INTERVAL', 10)
+        with self._lock:
+            for tag in tags:
+                self._pending[(event, tag)] += 1
+            due = time.monotonic() - self._last_flush >= interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+
+        for (event, tag), count in pending.items():
+            _incr_counter(_tag_stats_key(event, tag), count)
+
+        registry_key = f"{settings.CACHE_KEY_PREFIX}{TAG_STATS_REGISTRY_KEY}"
+        known = cache.get(registry_key) or set()
+        tags = known | {tag for _, tag in pending}
+        if tags != known:
+            cache.set(registry_key, tags, None)
+
+    def snapshot(self):
+        """Tüm etiketler için {tag: {'hits', 'misses', 'invalidations', 'version'}} döndürür"""
+        self.flush()
+        tags = sorted(cache.get(f"{settings.CACHE_KEY_PREFIX}{TAG_STATS_REGISTRY_KEY}") or ())
+        keys = {(event, tag): _tag_stats_key(event, tag) for tag in tags for event in TAG_STATS_EVENTS}
+        values = cache.get_many(list(keys.values()))
+        versions = get_tag_versions(tags)
+        return {
+            tag: {
+                **{event: values.get(keys[(event, tag)], 0) for event in TAG_STATS_EVENTS},
+                'version': versions.get(tag, 0),
+            }
+            for tag in tags
+        }
+
+
+tag_stats = CacheTagStats()
+
+
+def get_tag_versions(tags):
+    """Etiketlerin güncel versiyonlarını tek round-trip ile döndürür (hiç artırılmamışsa 0)"""
+    if not tags:
+        return {}
+    keys = {tag: _tag_version_key(tag) for tag in tags}
+    found = cache.get_many(list(keys.values()))
+    return {tag: found.get(key, 0) for tag, key in keys.items()}
+
+
+def invalidate_tags(*tags):
+    """
+    Etiket(ler)e bağlı tüm önbellek kayıtlarını O(1) ile geçersiz kılar:
+    etiketin versiyon sayacı artırılır, eski versiyonla yazılmış kayıtlar okunurken atlanır.
+    Örnek: invalidate_tags('catalog:courses', 'catalog:quests')
+    """
+    for tag in tags:
+        _incr_counter(_tag_version_key(tag))
+    tag_stats.record('invalidations', tags)
+
+
+def _jittered_timeout(timeout):
+    """Aynı anda dolan anahtarları dağıtmak için TTL'e ±%jitter ekler"""
+    jitter = getattr(settings, 'CACHE_TTL_JITTER', 0.1)
+    if not jitter:
+        return timeout
+    return max(1, int(timeout * random.uniform(1 - jitter, 1 + jitter)))
+
+
+def _store_entry(cache_key, data, timeout, stale_timeout, tag_versions=None):
+    """
+    Veriyi 'taze kalma' zamanı ve bağlı olduğu etiket versiyonlarıyla saklar;
+    fiziksel TTL stale penceresini de kapsar
+    """
+    timeout = _jittered_timeout(timeout)
+    entry = {'data': data, 'fresh_until': time.time() + timeout, 'tags': tag_versions or {}}
+    cache.set(cache_key, entry, timeout + stale_timeout)
+
+
+def _read_entry(cache_key):
+    """
+    _store_entry ile yazılmış kaydı döndürür. Eski formattaki ya da bağlı olduğu
+    etiketlerden biri geçersiz kılınmış kayıtlar için None döner (stale olarak da sunulmaz).
+    """
+    entry = get_cached_data(cache_key)
+    if not (isinstance(entry, dict) and 'fresh_until' in entry):
+        return None
+
+    tag_versions = entry.get('tags')
+    if tag_versions and get_tag_versions(list(tag_versions)) != tag_versions:
+        tag_stats.record('misses', tag_versions)
+        return None
+    return entry
+
+
+def cache_response(timeout=None, key_prefix=None, vary_on_user=False, stale_timeout=None, tags=None):
+    """
+    API yanıtlarını önbellekleyen bir dekoratör.
+
+    - tags: kaydın bağlı olduğu etiketler (liste ya da (request, *args, **kwargs) alan
+      fonksiyon). invalidate_tags ile ilgili tüm kayıtlar tek seferde geçersiz kılınır.
+
+    - Single-flight: süresi dolan anahtarı sadece kilidi (cache.add) alan worker yeniden hesaplar.
+    - Stale-while-revalidate: kilidi alamayanlar, yenileme sürerken eski veriyi döndürür.
+    - TTL'ler jitter'lıdır; vary_on_user=True ise anahtar kullanıcıya göre ayrılır.
+    """
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
@@ -52,6 +206,11 @@ def cache_response(timeout=None, key_prefix=None):
             for k, v in kwargs.items():
                 identifier = f"{identifier}_{k}_{v}"
             
+            if vary_on_user:
+                user = getattr(request, 'user', None)
+                user_id = user.id if user is not None and user.is_authenticated else 'anon'
+                identifier = f"{identifier}_user_{user_id}"
+            
             if not identifier:
                 identifier = 'default'
             
@@ -63,20 +222,47 @@ def cache_response(timeout=None, key_prefix=None):
                 params = dict(request.query_params)
             
             cache_key = get_cache_key(prefix, identifier, params)
+            lock_key = f"{cache_key}_lock"
+            cache_timeout = timeout or settings.CACHE_TIMEOUT.get(prefix, settings.CACHE_TIMEOUT.get('default', 900))
+            stale = stale_timeout if stale_timeout is not None else getattr(settings, 'CACHE_STALE_TIMEOUT', 300)
+            lock_timeout = getattr(settings, 'CACHE_LOCK_TIMEOUT', 30)
             
             # Önbellekten veri al
-            cached_data = get_cached_data(cache_key)
-            if cached_data is not None:
-                return Response(cached_data)
+            entry = _read_entry(cache_key)
+            if entry is not None and entry['fresh_until'] > time.time():
+                if entry.get('tags'):
+                    tag_stats.record('hits', entry['tags'])
+                return Response(entry['data'])
             
-            # Veri önbellekte yoksa fonksiyonu çalıştır
-            response = view_func(request, *args, **kwargs)
+            # Yenileme kilidini almaya çalış (atomik SET NX)
+            lock_acquired = cache.add(lock_key, 1, lock_timeout)
+            if not lock_acquired:
+                if entry is not None:
+                    # Başka bir worker yeniliyor: eski veriyi sun
+                    return Response(entry['data'])
+                
+                # Hiç veri yok: kısa süre diğer worker'ın sonucunu bekle
+                deadline = time.time() + getattr(settings, 'CACHE_LOCK_WAIT', 5)
+                while time.time() < deadline:
+                    time.sleep(0.05)
+                    entry = _read_entry(cache_key)
+                    if entry is not None:
+                        return Response(entry['data'])
             
-            # Sadece başarılı yanıtları önbelleğe al
-            if response.status_code == 200:
-                cache_timeout = timeout or settings.CACHE_TIMEOUT.get(prefix, None)
-                cache_data(cache_key, response.data, cache_timeout)
+            try:
+                # Versiyonları hesaplamadan önce oku: hesaplama sırasında gelen invalidation kaybolmasın
+                entry_tags = tags(request, *args, **kwargs) if callable(tags) else (tags or [])
+                tag_versions = get_tag_versions(entry_tags)
+                
+                response = view_func(request, *args, **kwargs)
+                
+                # Sadece başarılı yanıtları önbelleğe al
+                if response.status_code == 200:
+                    _store_entry(cache_key, response.data, cache_timeout, stale, tag_versions)
+            finally:
+                if lock_acquired:
+                    cache.delete(lock_key)
             
             return response
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
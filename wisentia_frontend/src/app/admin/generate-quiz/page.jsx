@@ -112,6 +112,42 @@ const ADMIN_CONTENT_API_ENDPOINT = '/api/admin/content';
 // Quiz queue storage key
 const QUIZ_QUEUE_STORAGE_KEY = 'wisentia_quiz_queue';
 
+// Kuyruğa alınan (202) quiz üretimleri için durum yoklama ayarları
+const QUIZ_STATUS_POLL_INTERVAL = 5000;
+const QUIZ_STATUS_POLL_TIMEOUT = 3600000; // 60 dakika, senkron istek timeout'u ile aynı
+
+// Backend quiz üretimini AI worker'a bıraktığında kayıt 'pending' veya 'failed' olana kadar bekler
+const waitForQueuedQuiz = async (contentId, onStatus) => {
+  const deadline = Date.now() + QUIZ_STATUS_POLL_TIMEOUT;
+  while (Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, QUIZ_STATUS_POLL_INTERVAL));
+    
+    let data;
+    try {
+      const response = await fetch(`/api/admin/pending-content/quiz/${contentId}`, { cache: 'no-store' });
+      if (!response.ok) {
+        console.warn(`Quiz ${contentId} status check failed: ${response.status}`);
+        continue;
+      }
+      data = await response.json();
+    } catch (error) {
+      // Geçici ağ hataları yoklamayı durdurmaz
+      console.warn(`Quiz ${contentId} status check error:`, error);
+      continue;
+    }
+    
+    if (data.approval_status === 'failed') {
+      throw new Error(data.error || 'Quiz oluşturma başarısız oldu');
+    }
+    if (data.approval_status === 'queued' || data.approval_status === 'processing') {
+      onStatus(data);
+      continue;
+    }
+    return data;
+  }
+  throw new Error('Quiz oluşturma işlemi zaman aşımına uğradı (60 dakika).');
+};
+
 // Stat Card bileşeni
 const StatCard = ({ value, label, color, gradient }) => (
   <Box
@@ -1240,6 +1276,33 @@ export default function GenerateQuizPage() {
             throw new Error(errorMessage);
           }
           
+          // AI worker açıksa backend 202 + contentId döner; quiz hazır olana kadar kaydı yokla
+          if (quizData.status === 'queued' && quizData.contentId) {
+            setQuizQueue(prev => prev.map((item, idx) => 
+              idx === i ? { 
+                ...item, 
+                contentId: quizData.contentId,
+                progress: { ...item.progress, current_step: `Quiz sıraya alındı, AI worker bekleniyor... ${timeEstimate}` }
+              } : item
+            ));
+            
+            const quizDetail = await waitForQueuedQuiz(quizData.contentId, (state) => {
+              const running = state.approval_status === 'processing' && state.job?.status !== 'queued';
+              setQuizQueue(prev => prev.map((item, idx) => 
+                idx === i ? { 
+                  ...item, 
+                  progress: { 
+                    ...item.progress,
+                    current_step: running
+                      ? `Quiz oluşturuluyor... ${timeEstimate}`
+                      : `Quiz sırada bekliyor... ${timeEstimate}`
+                  } 
+                } : item
+              ));
+            });
+            quizData = { ...quizData, status: 'completed', quiz: quizDetail };
+          }
+          
           // Success - Update UI with more detailed completion animation
           setQuizQueue(prev => prev.map((item, idx) => 
             idx === i ? { 
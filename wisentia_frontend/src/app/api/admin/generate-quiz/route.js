@@ -118,7 +118,8 @@ export async function POST(request) {
       const data = await response.json();
       console.log('Backend API response successfully received');
       
-      return NextResponse.json(data);
+      // 202 (kuyruğa alındı) durumunu sayfaya aynen ilet
+      return NextResponse.json(data, { status: response.status });
     } catch (fetchError) {
       // Clear timeout if it's still active
       clearTimeout(timeoutId);